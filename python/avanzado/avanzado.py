@@ -5,72 +5,81 @@
 #   2. ¿PARA QUÉ sirve?
 #   3. CÓMO funciona (con prints in-line)
 #   4. CÓDIGO EJECUTABLE paso a paso
+#
+# Importar este módulo NO ejecuta nada: solo define clases y funciones.
+# Las demos se lanzan desde la línea de comandos:
+#   python avanzado.py              # todas las secciones
+#   python avanzado.py 24 31 35     # solo esas
+#   python avanzado.py --listar
+# Los módulos pesados (asyncio, multiprocessing, subprocess, pickle…)
+# se importan dentro de la función que los usa.
 # ================================================================
 from __future__ import annotations   # ❶ Postponed evaluation (PEP-563)
-import asyncio
-import concurrent.futures as cf
-import functools
-import itertools
 import json
-import logging
-import multiprocessing as mp
-import operator
-import os
-import pathlib
-import pickle
-import re
-import sqlite3
-import subprocess
 import sys
-import threading
 import time
 import typing
-from collections import Counter, defaultdict, deque, namedtuple
 from contextlib import asynccontextmanager, contextmanager
-from dataclasses import dataclass
-from functools import lru_cache, partial, singledispatch, wraps
+from functools import singledispatch, wraps
 from pathlib import Path
 from typing import (
     Any,
-    Awaitable,
     Callable,
     Dict,
-    Generic,
-    Iterable,
     List,
     Optional,
     Protocol,
+    Tuple,
     TypeVar,
     runtime_checkable,
 )
 
+from cache_acotada import cache
+from registro_clases import RegistroClases
+from singleton import SingletonMeta
+
+# número → (título, demo)
+SECCIONES: Dict[int, Tuple[str, Callable[[], None]]] = {}
+
+
+def seccion(numero: int, titulo: str) -> Callable[[Callable[[], None]], Callable[[], None]]:
+    """Registra la demo de una sección para la CLI."""
+    def registrar(demo: Callable[[], None]) -> Callable[[], None]:
+        SECCIONES[numero] = (titulo, demo)
+        return demo
+    return registrar
+
+
 # ----------------------------------------------------------
 # 21. METACLASES – Crear clases “a la carta”
 # ----------------------------------------------------------
-print("\n=== 21. METACLASES ===")
 # ¿QUÉ?  Clase cuya instancia es una clase (control total en la creación).
 # ¿PARA QUÉ?  Registro automático, validación, ORM, singletons…
 
 class AutoRegistro(type):
-    registro: Dict[str, type] = {}
+    # nombre → clase, más índices por alias, base y campo (registro_clases.py)
+    registro = RegistroClases()
 
-    def __new__(mcls, name, bases, ns):
+    def __new__(mcls, name, bases, ns, alias=()):
         cls = super().__new__(mcls, name, bases, ns)
-        mcls.registro[name.lower()] = cls
-        return cls
+        return mcls.registro.registrar(cls, alias)
 
 class BaseModel(metaclass=AutoRegistro):
     pass
 
-class Usuario(BaseModel):
-    pass
+class Usuario(BaseModel, alias=("user",)):
+    nombre: str
 
-print("  Registro de clases:", AutoRegistro.registro)
+@seccion(21, "METACLASES")
+def demo_metaclases():
+    print("  Registro de clases:", AutoRegistro.registro)
+    print("  Alias 'user':", AutoRegistro.registro["user"].__name__,
+          "| subclases de BaseModel:", [c.__name__ for c in AutoRegistro.registro.subclases(BaseModel)],
+          "| con campo 'nombre':", [c.__name__ for c in AutoRegistro.registro.con_campo("nombre")])
 
 # ----------------------------------------------------------
 # 22. DESCRIPTORS – Atributos con lógica
 # ----------------------------------------------------------
-print("\n=== 22. DESCRIPTORS ===")
 # ¿QUÉ?  Clase con __get__, __set__, __delete__ que gestiona un atributo.
 # ¿PARA QUÉ?  Validaciones, caché, lazy-load, ORM fields.
 
@@ -91,18 +100,29 @@ class Positivo:
 class Producto:
     precio = Positivo("precio")
 
-p = Producto()
-p.precio = 10
-print("  Precio:", p.precio)
-try:
-    p.precio = -5
-except ValueError as e:
-    print("  Error descriptor:", e)
+@seccion(22, "DESCRIPTORS")
+def demo_descriptores():
+    p = Producto()
+    p.precio = 10
+    print("  Precio:", p.precio)
+    try:
+        p.precio = -5
+    except ValueError as e:
+        print("  Error descriptor:", e)
+
+    # Millones de objetos: validación fundida en un __init__ generado y
+    # validación por columnas (campos.py)
+    from campos import Modelo, Positivo as PositivoFundido
+
+    class ProductoRapido(Modelo):
+        precio = PositivoFundido()
+
+    print("  Campos fundidos:", ProductoRapido(10),
+          ProductoRapido.validar_muchos({"precio": [10, -5, 3]}))
 
 # ----------------------------------------------------------
 # 23. DECORADORES AVANZADOS (clases, parámetros, stacking)
 # ----------------------------------------------------------
-print("\n=== 23. DECORADORES AVANZADOS ===")
 # Decorador con argumentos: necesita 3 niveles de anidación.
 
 def repetir(n: int):
@@ -119,13 +139,16 @@ def repetir(n: int):
 def hola():
     print("¡Hola!")
 
-hola()
+@seccion(23, "DECORADORES AVANZADOS")
+def demo_decoradores():
+    hola()
 
 # ----------------------------------------------------------
 # 24. SINGLE DISPATCH – Polimorfismo ad-hoc
 # ----------------------------------------------------------
-print("\n=== 24. SINGLE DISPATCH ===")
 # ¿QUÉ?  Función genérica que cambia de comportamiento según tipo.
+# Versión de producción (encoder reutilizado, caché por tipo, binario
+# msgpack, flujo y lotes): serializadores.Serializador, misma API.
 
 @singledispatch
 def serializar(obj):
@@ -139,14 +162,15 @@ def _(obj: dict):
 def _(obj: set):
     return json.dumps(list(obj))
 
-print("  str:", serializar("abc"))
-print("  dict:", serializar({"z": 1, "a": 2}))
-print("  set:", serializar({3, 1, 2}))
+@seccion(24, "SINGLE DISPATCH")
+def demo_single_dispatch():
+    print("  str:", serializar("abc"))
+    print("  dict:", serializar({"z": 1, "a": 2}))
+    print("  set:", serializar({3, 1, 2}))
 
 # ----------------------------------------------------------
 # 25. TYPING AVANZADO – Protocols, generics, bounded types
 # ----------------------------------------------------------
-print("\n=== 25. TYPING AVANZADO ===")
 T = TypeVar("T", bound=float | int)
 
 class Sumable(Protocol):
@@ -155,64 +179,70 @@ class Sumable(Protocol):
 def suma_generica(a: T, b: T) -> T:
     return a + b  # type: ignore
 
-print("  1.2 + 2.3 (float) =", suma_generica(1.2, 2.3))
+@seccion(25, "TYPING AVANZADO")
+def demo_typing():
+    print("  1.2 + 2.3 (float) =", suma_generica(1.2, 2.3))
 
 # ----------------------------------------------------------
 # 26. ASYNC / AWAIT – Concurrencia cooperativa
 # ----------------------------------------------------------
-print("\n=== 26. ASYNC/AWAIT ===")
-
 async def tarea(n: int) -> str:
+    import asyncio
     await asyncio.sleep(n)
     return f"Tarea {n}s finalizada"
 
 async def main_async():
+    import asyncio
     resultados = await asyncio.gather(tarea(1), tarea(2))
     print("  Async resultados:", resultados)
 
-asyncio.run(main_async())
+@seccion(26, "ASYNC/AWAIT")
+def demo_async():
+    import asyncio
+    asyncio.run(main_async())
 
 # ----------------------------------------------------------
 # 27. THREADING vs MULTIPROCESSING
 # ----------------------------------------------------------
-print("\n=== 27. PARALELISMO REAL vs CONCURRENCIA ===")
-
 def cpu_bound(n):
     return sum(i * i for i in range(n))
 
-# 27a. Multiprocessing (aprovecha múltiples núcleos)
-if __name__ == "__main__":
-    with mp.Pool() as pool:
-        print("  Multiprocessing:", pool.map(cpu_bound, [10_000, 20_000]))
-
 # 27b. Threading (I/O bound)
 def io_bound():
     time.sleep(0.2)
     return "I/O ok"
 
-with cf.ThreadPoolExecutor() as ex:
-    futuros = [ex.submit(io_bound) for _ in range(3)]
-    print("  Threading:", [f.result() for f in futuros])
+@seccion(27, "PARALELISMO REAL vs CONCURRENCIA")
+def demo_paralelismo():
+    import concurrent.futures as cf
+    import multiprocessing as mp
+
+    # 27a. Multiprocessing (aprovecha múltiples núcleos). Los workers
+    # re-importan este módulo: es seguro porque importarlo no ejecuta demos.
+    with mp.Pool() as pool:
+        print("  Multiprocessing:", pool.map(cpu_bound, [10_000, 20_000]))
+
+    with cf.ThreadPoolExecutor() as ex:
+        futuros = [ex.submit(io_bound) for _ in range(3)]
+        print("  Threading:", [f.result() for f in futuros])
 
 # ----------------------------------------------------------
 # 28. CONTEXT MANAGERS PERSONALIZADOS
 # ----------------------------------------------------------
-print("\n=== 28. CONTEXT MANAGERS ===")
-
 @contextmanager
 def cronometro():
     t0 = time.perf_counter()
     yield
     print(f"  Tiempo: {time.perf_counter() - t0:.4f}s")
 
-with cronometro():
-    time.sleep(0.1)
+@seccion(28, "CONTEXT MANAGERS")
+def demo_context_managers():
+    with cronometro():
+        time.sleep(0.1)
 
 # ----------------------------------------------------------
 # 29. CONTEXTOS ASÍNCRONOS
 # ----------------------------------------------------------
-print("\n=== 29. ASYNC CONTEXT MANAGER ===")
-
 @asynccontextmanager
 async def db_con():
     print("  Conectando DB...")
@@ -223,16 +253,18 @@ async def usar_db():
     async with db_con() as conn:
         print("  Usando", conn)
 
-asyncio.run(usar_db())
+@seccion(29, "ASYNC CONTEXT MANAGER")
+def demo_async_context():
+    import asyncio
+    asyncio.run(usar_db())
 
 # ----------------------------------------------------------
 # 30. C EXTENSIONS – Cython, ctypes, cffi (demo conceptual)
 # ----------------------------------------------------------
-print("\n=== 30. C EXTENSIONS (simulado) ===")
 # En la práctica usarías Cython o escribirías un .c/.cpp y lo compilas.
 # Aquí usamos subprocess para compilar y ejecutar un módulo C toy.
 
-c_code = """
+C_CODE = """
 #include <Python.h>
 static PyObject* suma_c(PyObject* self, PyObject* args){
     long a, b;
@@ -249,36 +281,42 @@ static struct PyModuleDef module = {
 PyMODINIT_FUNC PyInit_ext(void){ return PyModule_Create(&module); }
 """
 
-with open("ext.c", "w") as f:
-    f.write(c_code)
+@seccion(30, "C EXTENSIONS (simulado)")
+def demo_extensiones_c():
+    import subprocess
+
+    with open("ext.c", "w") as f:
+        f.write(C_CODE)
 
-# Compilar (requiere compilador y python-dev)
-try:
-    subprocess.run(
-        [sys.executable, "-m", "pip", "install", ".", "--quiet"],
-        cwd=Path.cwd(),
-        check=True,
-        capture_output=True,
-    )
-except Exception:
-    print("  Compilación C omitida (necesitas setuptools y compilador).")
+    # Compilar (requiere compilador y python-dev)
+    try:
+        subprocess.run(
+            [sys.executable, "-m", "pip", "install", ".", "--quiet"],
+            cwd=Path.cwd(),
+            check=True,
+            capture_output=True,
+        )
+    except Exception:
+        print("  Compilación C omitida (necesitas setuptools y compilador).")
 
 # ----------------------------------------------------------
 # 31. OPTIMIZACIONES – LRU CACHE & JIT
 # ----------------------------------------------------------
-print("\n=== 31. LRU CACHE & NUMBA (simulado) ===")
+# @lru_cache(maxsize=None) crece sin límite; cache_acotada.cache pone
+# techo de entradas/bytes, TTL y política LRU/LFU (ver cache_acotada.py).
 
-@lru_cache(maxsize=None)
+@cache(maxsize=1024)
 def fib(n: int) -> int:
     return n if n < 2 else fib(n - 1) + fib(n - 2)
 
-print("  Fib 30 cached:", fib(30))
+@seccion(31, "LRU CACHE & NUMBA (simulado)")
+def demo_cache():
+    print("  Fib 30 cached:", fib(30))
+    print("  Estadísticas:", fib.cache_info())
 
 # ----------------------------------------------------------
 # 32. SERIALIZACIÓN AVANZADA – Pickle, JSON, ORJSON
 # ----------------------------------------------------------
-print("\n=== 32. SERIALIZACIÓN ===")
-
 class Punto:
     def __init__(self, x, y):
         self.x, self.y = x, y
@@ -286,66 +324,76 @@ class Punto:
     def __reduce__(self):
         return (self.__class__, (self.x, self.y))
 
-p = Punto(3, 4)
-data = pickle.dumps(p)
-p2 = pickle.loads(data)
-print("  Pickle Punto:", p2.x, p2.y)
+@seccion(32, "SERIALIZACIÓN")
+def demo_serializacion():
+    import pickle
+
+    p = Punto(3, 4)
+    data = pickle.dumps(p)
+    p2 = pickle.loads(data)
+    print("  Pickle Punto:", p2.x, p2.y)
+
+    # Muchos puntos: columnas contiguas en vez de un pickle por objeto (codec_columnar.py)
+    from codec_columnar import codificar, decodificar
+
+    puntos = [Punto(i, i * 2) for i in range(1000)]
+    datos = codificar(puntos)
+    print(f"  Columnar: {len(datos)} bytes vs pickle {len(pickle.dumps(puntos, protocol=5))};",
+          "x[999] =", decodificar(datos, Punto).columna("x")[999])
 
 # ----------------------------------------------------------
 # 33. PATRONES DE DISEÑO – Lazy Singleton, Factory, Observer
 # ----------------------------------------------------------
-print("\n=== 33. PATRONES ===")
-
-class SingletonMeta(type):
-    _instancias: dict[type, Any] = {}
-    def __call__(cls, *args, **kwargs):
-        if cls not in cls._instancias:
-            cls._instancias[cls] = super().__call__(*args, **kwargs)
-        return cls._instancias[cls]
+# SingletonMeta vive en singleton.py: bloqueo doble comprobado (el
+# `if cls not in _instancias` sin lock creaba duplicados con hilos),
+# reinicio tras fork y arranque async.
 
 class Config(metaclass=SingletonMeta):
     def __init__(self):
         self.debug = True
 
-c1 = Config()
-c2 = Config()
-print("  Misma instancia:", c1 is c2, c1.debug)
+# Configuración desde archivo, con instantáneas inmutables y recarga en
+# caliente sin bloquear a los lectores: configuracion.py
+
+@seccion(33, "PATRONES")
+def demo_patrones():
+    c1 = Config()
+    c2 = Config()
+    print("  Misma instancia:", c1 is c2, c1.debug)
 
 # ----------------------------------------------------------
 # 34. TESTING – unittest & pytest estilo
 # ----------------------------------------------------------
-print("\n=== 34. TESTING ===")
-
 def add(a: int, b: int) -> int:
     return a + b
 
-# Test simple sin frameworks
-assert add(2, 3) == 5
-print("  ✓ Test unitario básico pasó")
+@seccion(34, "TESTING")
+def demo_testing():
+    # Test simple sin frameworks
+    assert add(2, 3) == 5
+    print("  ✓ Test unitario básico pasó")
 
 # ----------------------------------------------------------
-# 35. PROFILE & OPTIMIZACIÓN – cProfile & line_profiler
+# 35. PROFILE & OPTIMIZACIÓN – perfilador por muestreo
 # ----------------------------------------------------------
-print("\n=== 35. PROFILING ===")
+@seccion(35, "PROFILING")
+def demo_profiling():
+    # cProfile instrumenta CADA llamada; el muestreo mira la pila cada 5 ms
+    # (coste ~1 %) y produce el formato colapsado de los flame graphs.
+    from perfilador_muestreo import PerfiladorMuestreo
 
-import cProfile
-import pstats
-from io import StringIO
-
-pr = cProfile.Profile()
-pr.enable()
-_ = [cpu_bound(5000) for _ in range(100)]
-pr.disable()
-s = StringIO()
-pstats.Stats(pr, stream=s).strip_dirs().sort_stats("cumulative").print_stats(3)
-print("  Top funciones CPU:", s.getvalue().splitlines()[4:7])
+    with PerfiladorMuestreo(intervalo=0.005) as perfil:
+        _ = [cpu_bound(5000) for _ in range(100)]
+    print("  Top funciones CPU:", perfil.top(3))
+    print("  Pila más frecuente:", perfil.colapsado().splitlines()[:1])
 
 # ----------------------------------------------------------
 # 36. PAQUETES & PUBLICACIÓN – pyproject.toml
 # ----------------------------------------------------------
-print("\n=== 36. EMPAQUETADO ===")
-# pyproject.toml (mínimo)
-toml = """
+@seccion(36, "EMPAQUETADO")
+def demo_empaquetado():
+    # pyproject.toml (mínimo)
+    toml = """
 [build-system]
 requires = ["setuptools>=61", "wheel"]
 build-backend = "setuptools.build_meta"
@@ -355,40 +403,38 @@ name = "mipkg"
 version = "0.1.0"
 description = "Demo avanzada"
 """
-Path("pyproject.toml").write_text(toml)
-print("  pyproject.toml creado ✓")
+    Path("pyproject.toml").write_text(toml)
+    print("  pyproject.toml creado ✓")
 
 # ----------------------------------------------------------
 # 37. PLUGINS DINÁMICOS – importlib.metadata & entry points
 # ----------------------------------------------------------
-print("\n=== 37. PLUGINS ===")
-
 # Simula descubrimiento de plugins
 def descubrir_plugins():
     # En la práctica se usa importlib.metadata.entry_points()
     return ["plugin_csv", "plugin_json"]
 
-print("  Plugins encontrados:", descubrir_plugins())
+@seccion(37, "PLUGINS")
+def demo_plugins():
+    print("  Plugins encontrados:", descubrir_plugins())
 
 # ----------------------------------------------------------
 # 38. METAPROGRAMACIÓN – ast & inspect
 # ----------------------------------------------------------
-print("\n=== 38. AST & INSPECT ===")
-
-import ast, inspect
+@seccion(38, "AST & INSPECT")
+def demo_ast():
+    import ast
 
-cod = """
+    cod = """
 def foo(x):
     return x + 1
 """
-tree = ast.parse(cod)
-print("  Nombres AST:", [node.name for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)])
+    tree = ast.parse(cod)
+    print("  Nombres AST:", [node.name for node in ast.walk(tree) if isinstance(node, ast.FunctionDef)])
 
 # ----------------------------------------------------------
 # 39. TYPING RUNTIME – runtime_checkable & get_type_hints
 # ----------------------------------------------------------
-print("\n=== 39. TYPING EN TIEMPO DE EJECUCIÓN ===")
-
 @runtime_checkable
 class Ejecutable(Protocol):
     def run(self) -> None: ...
@@ -397,11 +443,38 @@ class TareaEjecutable:
     def run(self):
         print("  Tarea ejecutándose ✓")
 
-obj = TareaEjecutable()
-print("  Cumple protocolo:", isinstance(obj, Ejecutable))
+@seccion(39, "TYPING EN TIEMPO DE EJECUCIÓN")
+def demo_typing_runtime():
+    obj = TareaEjecutable()
+    print("  Cumple protocolo:", isinstance(obj, Ejecutable))
 
 # ----------------------------------------------------------
 # 40. CIERRE & LLAMADA FINAL
 # ----------------------------------------------------------
+def main(argv: Optional[List[str]] = None) -> int:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Demos de Python avanzado (secciones 21-39)")
+    parser.add_argument("secciones", nargs="*", type=int, help="números de sección (por defecto, todas)")
+    parser.add_argument("--listar", action="store_true", help="muestra las secciones disponibles")
+    args = parser.parse_args(argv)
+
+    if args.listar:
+        for numero, (titulo, _) in sorted(SECCIONES.items()):
+            print(f"  {numero}. {titulo}")
+        return 0
+    desconocidas = set(args.secciones) - SECCIONES.keys()
+    if desconocidas:
+        parser.error(f"secciones desconocidas: {sorted(desconocidas)}")
+
+    for numero in args.secciones or sorted(SECCIONES):
+        titulo, demo = SECCIONES[numero]
+        print(f"\n=== {numero}. {titulo} ===")
+        demo()
+    if not args.secciones:
+        print("\n🎉 Script avanzado ejecutado. Explora cada bloque y profundiza!")
+    return 0
+
+
 if __name__ == "__main__":
-    print("\n🎉 Script avanzado ejecutado. Explora cada bloque y profundiza!")
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,307 @@
+# ================================================================
+# CACHÉ ACOTADA – reemplazo de @lru_cache(maxsize=None)
+# ¿QUÉ?  Decorador de memoización con límite de entradas y de bytes,
+#        TTL por entrada, política LRU o LFU, seguro entre hilos y con
+#        variante para funciones async. Incluye propiedad_cacheada
+#        (cached_property con TTL).
+# ¿PARA QUÉ?  lru_cache(maxsize=None) crece sin límite en procesos
+#        que viven semanas; aquí la memoria tiene techo y se puede medir.
+# ================================================================
+from __future__ import annotations
+
+import inspect
+import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Mismos campos que functools.lru_cache(...).cache_info() + desalojos y bytes
+InfoCache = namedtuple("InfoCache", "hits misses maxsize currsize evictions bytes")
+
+_MARCA_KW = object()     # separa args de kwargs en la clave
+_SIN_VALOR = object()
+
+
+def _clave(args: tuple, kwargs: dict, typed: bool) -> Hashable:
+    clave = args
+    if kwargs:
+        clave += (_MARCA_KW,) + tuple(kwargs.items())
+    if typed:
+        clave += tuple(type(a) for a in args) + tuple(type(v) for v in kwargs.values())
+    return clave
+
+
+class _Entrada:
+    __slots__ = ("valor", "expira", "bytes", "frecuencia")
+
+    def __init__(self, valor: Any, expira: float, nbytes: int):
+        self.valor = valor
+        self.expira = expira
+        self.bytes = nbytes
+        self.frecuencia = 1
+
+
+class _Almacen:
+    """Estructura interna: LRU (OrderedDict) o LFU (cubos por frecuencia, O(1))."""
+
+    def __init__(self, maxsize: Optional[int], max_bytes: Optional[int], ttl: Optional[float],
+                 politica: str, tamano: Callable[[Any], int]):
+        if politica not in ("lru", "lfu"):
+            raise ValueError("politica debe ser 'lru' o 'lfu'")
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.lfu = politica == "lfu"
+        self.tamano = tamano
+        self.lock = threading.Lock()
+        self.datos: Dict[Hashable, _Entrada] = {}
+        self.orden: "OrderedDict[Hashable, None]" = OrderedDict()            # LRU
+        self.cubos: Dict[int, "OrderedDict[Hashable, None]"] = {}            # LFU
+        self.min_frec = 0
+        self.hits = self.misses = self.evictions = self.bytes = 0
+
+    # --- contabilidad de uso ------------------------------------
+    def _tocar(self, clave: Hashable, entrada: _Entrada) -> None:
+        if not self.lfu:
+            self.orden.move_to_end(clave)
+            return
+        cubo = self.cubos[entrada.frecuencia]
+        del cubo[clave]
+        if not cubo:
+            del self.cubos[entrada.frecuencia]
+            if self.min_frec == entrada.frecuencia:
+                self.min_frec += 1
+        entrada.frecuencia += 1
+        self.cubos.setdefault(entrada.frecuencia, OrderedDict())[clave] = None
+
+    def _quitar(self, clave: Hashable) -> None:
+        entrada = self.datos.pop(clave)
+        self.bytes -= entrada.bytes
+        if not self.lfu:
+            del self.orden[clave]
+            return
+        cubo = self.cubos[entrada.frecuencia]
+        del cubo[clave]
+        if not cubo:
+            del self.cubos[entrada.frecuencia]
+
+    def _victima(self) -> Hashable:
+        if not self.lfu:
+            return next(iter(self.orden))
+        if self.min_frec not in self.cubos:
+            self.min_frec = min(self.cubos)
+        return next(iter(self.cubos[self.min_frec]))   # menos frecuente y más antigua
+
+    # --- API (llamar con self.lock tomado) ----------------------
+    def leer(self, clave: Hashable) -> Any:
+        entrada = self.datos.get(clave)
+        if entrada is not None:
+            if entrada.expira and time.monotonic() > entrada.expira:
+                self._quitar(clave)
+            else:
+                self.hits += 1
+                self._tocar(clave, entrada)
+                return entrada.valor
+        self.misses += 1
+        return _SIN_VALOR
+
+    def escribir(self, clave: Hashable, valor: Any) -> None:
+        nbytes = self.tamano(valor) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            return                                   # nunca cabría
+        if clave in self.datos:
+            self._quitar(clave)
+        if self.maxsize == 0:
+            return
+        # Desalojar ANTES de insertar: en LFU la entrada nueva (frecuencia 1)
+        # no debe ser su propia víctima.
+        while self.datos and (
+            (self.maxsize is not None and len(self.datos) >= self.maxsize)
+            or (self.max_bytes is not None and self.bytes + nbytes > self.max_bytes)
+        ):
+            self._quitar(self._victima())
+            self.evictions += 1
+        expira = time.monotonic() + self.ttl if self.ttl else 0.0
+        self.datos[clave] = _Entrada(valor, expira, nbytes)
+        self.bytes += nbytes
+        if self.lfu:
+            self.cubos.setdefault(1, OrderedDict())[clave] = None
+            self.min_frec = 1
+        else:
+            self.orden[clave] = None
+
+    def info(self) -> InfoCache:
+        return InfoCache(self.hits, self.misses, self.maxsize, len(self.datos), self.evictions, self.bytes)
+
+    def limpiar(self) -> None:
+        self.datos.clear()
+        self.orden.clear()
+        self.cubos.clear()
+        self.min_frec = 0
+        self.hits = self.misses = self.evictions = self.bytes = 0
+
+
+def cache(
+    maxsize: Optional[int] = 128,
+    *,
+    max_bytes: Optional[int] = None,
+    ttl: Optional[float] = None,
+    politica: str = "lru",
+    typed: bool = False,
+    tamano: Callable[[Any], int] = sys.getsizeof,
+):
+    """Como @lru_cache, pero con techo de bytes, TTL y política LRU/LFU.
+
+    Se usa igual: @cache, @cache(256), @cache(maxsize=None, ttl=60, politica="lfu").
+    `tamano(valor)` estima los bytes de cada resultado (por defecto sys.getsizeof).
+    Las funciones async cachean el RESULTADO y fusionan llamadas simultáneas.
+    """
+    if callable(maxsize):                 # @cache sin paréntesis
+        return cache()(maxsize)
+
+    def decorador(func: Callable[..., Any]) -> Callable[..., Any]:
+        almacen = _Almacen(maxsize, max_bytes, ttl, politica, tamano)
+
+        if inspect.iscoroutinefunction(func):
+            import asyncio              # solo aquí: importarlo es caro y casi nunca hace falta
+            pendientes: Dict[Hashable, asyncio.Future] = {}
+
+            def _terminar(clave: Hashable, futuro: asyncio.Future) -> None:
+                pendientes.pop(clave, None)
+                if not futuro.cancelled() and futuro.exception() is None:
+                    with almacen.lock:
+                        almacen.escribir(clave, futuro.result())
+
+            @wraps(func)
+            async def envoltura_async(*args, **kwargs):
+                clave = _clave(args, kwargs, typed)
+                with almacen.lock:
+                    valor = almacen.leer(clave)
+                if valor is not _SIN_VALOR:
+                    return valor
+                futuro = pendientes.get(clave)
+                if futuro is None:
+                    futuro = pendientes[clave] = asyncio.ensure_future(func(*args, **kwargs))
+                    futuro.add_done_callback(lambda f, clave=clave: _terminar(clave, f))
+                # shield: cancelar a un llamador no cancela el cálculo compartido
+                return await asyncio.shield(futuro)
+
+            envoltura = envoltura_async
+        else:
+            @wraps(func)
+            def envoltura(*args, **kwargs):
+                clave = _clave(args, kwargs, typed)
+                with almacen.lock:
+                    valor = almacen.leer(clave)
+                if valor is not _SIN_VALOR:
+                    return valor
+                valor = func(*args, **kwargs)     # sin lock: permite recursión (fib)
+                with almacen.lock:
+                    almacen.escribir(clave, valor)
+                return valor
+
+        def cache_info() -> InfoCache:
+            with almacen.lock:
+                return almacen.info()
+
+        def cache_clear() -> None:
+            with almacen.lock:
+                almacen.limpiar()
+
+        envoltura.cache_info = cache_info
+        envoltura.cache_clear = cache_clear
+        envoltura.cache_parameters = lambda: {
+            "maxsize": maxsize, "max_bytes": max_bytes, "ttl": ttl,
+            "politica": politica, "typed": typed,
+        }
+        return envoltura
+
+    return decorador
+
+
+class propiedad_cacheada:
+    """Como functools.cached_property, pero con `ttl` opcional (segundos).
+
+        @propiedad_cacheada(ttl=30)
+        def area(self): ...
+    `del obj.area` invalida el valor, igual que con cached_property.
+    """
+
+    def __init__(self, func: Optional[Callable[[Any], Any]] = None, *, ttl: Optional[float] = None):
+        self.ttl = ttl
+        self.func = None
+        self.nombre = None
+        if func is not None:
+            self(func)
+
+    def __call__(self, func: Callable[[Any], Any]) -> "propiedad_cacheada":
+        self.func = func
+        self.__doc__ = func.__doc__
+        return self
+
+    def __set_name__(self, owner: type, nombre: str) -> None:
+        self.nombre = nombre
+
+    def __get__(self, obj: Any, owner: type = None) -> Any:
+        if obj is None:
+            return self
+        guardado: Optional[Tuple[Any, float]] = obj.__dict__.get(self.nombre)
+        ahora = time.monotonic() if self.ttl else 0.0
+        if guardado is not None and (not self.ttl or ahora < guardado[1]):
+            return guardado[0]
+        valor = self.func(obj)
+        obj.__dict__[self.nombre] = (valor, ahora + (self.ttl or 0.0))
+        return valor
+
+    def __set__(self, obj: Any, valor: Any) -> None:
+        obj.__dict__[self.nombre] = (valor, float("inf"))
+
+    def __delete__(self, obj: Any) -> None:
+        obj.__dict__.pop(self.nombre, None)
+
+
+if __name__ == "__main__":
+    import asyncio
+
+    @cache(maxsize=3, politica="lfu")
+    def cuadrado(n):
+        return n * n
+
+    for n in [1, 1, 1, 2, 3, 4, 5]:
+        cuadrado(n)
+    print("  LFU:", cuadrado.cache_info())
+
+    @cache(maxsize=None, max_bytes=10_000, ttl=0.05)
+    def texto(n):
+        return "x" * n
+
+    for n in range(100, 200):
+        texto(n)
+    print("  Bytes acotados:", texto.cache_info())
+    time.sleep(0.06)
+    texto(199)
+    print("  Tras TTL:", texto.cache_info())
+
+    @cache
+    async def remoto(n):
+        await asyncio.sleep(0.01)
+        return n * 10
+
+    async def demo():
+        print("  Async:", await asyncio.gather(*(remoto(1) for _ in range(5))), remoto.cache_info())
+
+    asyncio.run(demo())
+
+    class Circulo:
+        def __init__(self, r):
+            self.r = r
+
+        @propiedad_cacheada(ttl=60)
+        def area(self):
+            print("  (Calculando área...)")
+            return 3.1416 * self.r ** 2
+
+    c = Circulo(10)
+    print("  Área:", c.area, c.area)
@@ -0,0 +1,442 @@
+# ================================================================
+# CAMPOS DECLARATIVOS – validación fundida en __init__/__setattr__
+# ¿QUÉ?  Descriptores declarativos (Positivo, Rango, Patron, Tipo) para
+#        subclases de Modelo. Al crear la clase, __init_subclass__ genera
+#        con exec un __init__ y un __setattr__ específicos: todas las
+#        comprobaciones en línea, en una sola función, y el valor va
+#        directo al __dict__. Los descriptores no tienen __set__, así que
+#        leer p.precio es un acceso normal al __dict__.
+#        validar_muchos() comprueba columnas enteras (listas o arrays
+#        NumPy) sin crear objetos y devuelve TODOS los errores.
+# ¿PARA QUÉ?  El Positivo de la sección 22 (avanzado.py) llama a un
+#        __set__ de Python por asignación; con millones de Producto pesa.
+#        Ojo: con UN campo no se gana (×1.0, domina la llamada al tipo);
+#        la ventaja crece con el número de campos (×1.4–1.8 con tres).
+#
+# Benchmark:  python campos.py [--n 1000000]
+# ================================================================
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:          # validar_muchos recorre los arrays en Python
+    np = None
+
+_SIN_DEFECTO = object()
+
+
+class Campo:
+    """Base de los descriptores. Subclases: `condicion(v)` devuelve una
+    expresión Python (texto) que es verdadera si el valor `v` es válido."""
+
+    excepcion: type = ValueError
+
+    def __init__(self, defecto: Any = _SIN_DEFECTO):
+        self.defecto = defecto
+        self.nombre = ""
+
+    def __set_name__(self, owner: type, nombre: str) -> None:
+        self.nombre = nombre
+
+    def __get__(self, obj: Any, owner: type) -> Any:
+        if obj is None:
+            return self
+        # solo se llega aquí si el __dict__ de la instancia no tiene el valor
+        raise AttributeError(f"{owner.__name__}.{self.nombre} no tiene valor")
+
+    def condicion(self, v: str) -> str:
+        raise NotImplementedError
+
+    def globales(self) -> Dict[str, Any]:
+        """Nombres que la condición necesita en el código generado."""
+        return {}
+
+    def mensaje(self) -> str:
+        raise NotImplementedError
+
+    def mascara_np(self, columna: Any) -> Any:
+        """Máscara booleana de válidos para un ndarray, o None si no aplica."""
+        return None
+
+    def _prefijo(self) -> str:
+        return f"_{self.nombre}"
+
+
+class Positivo(Campo):
+    def condicion(self, v: str) -> str:
+        return f"{v} > 0"
+
+    def mensaje(self) -> str:
+        return "debe ser > 0"
+
+    def mascara_np(self, columna):
+        return columna > 0
+
+
+class Rango(Campo):
+    def __init__(self, minimo: Any = None, maximo: Any = None, defecto: Any = _SIN_DEFECTO):
+        super().__init__(defecto)
+        if minimo is None and maximo is None:
+            raise ValueError("Rango necesita mínimo, máximo o ambos")
+        self.minimo, self.maximo = minimo, maximo
+
+    def condicion(self, v: str) -> str:
+        p = self._prefijo()
+        if self.maximo is None:
+            return f"{p}_min <= {v}"
+        if self.minimo is None:
+            return f"{v} <= {p}_max"
+        return f"{p}_min <= {v} <= {p}_max"
+
+    def globales(self):
+        p = self._prefijo()
+        return {f"{p}_min": self.minimo, f"{p}_max": self.maximo}
+
+    def mensaje(self) -> str:
+        if self.maximo is None:
+            return f"debe ser >= {self.minimo}"
+        if self.minimo is None:
+            return f"debe ser <= {self.maximo}"
+        return f"debe estar en [{self.minimo}, {self.maximo}]"
+
+    def mascara_np(self, columna):
+        mascara = np.ones(columna.shape, dtype=bool)
+        if self.minimo is not None:
+            mascara &= columna >= self.minimo
+        if self.maximo is not None:
+            mascara &= columna <= self.maximo
+        return mascara
+
+
+class Patron(Campo):
+    def __init__(self, regex: str, defecto: Any = _SIN_DEFECTO):
+        super().__init__(defecto)
+        self.regex = regex
+        self._coincide = re.compile(regex).fullmatch
+
+    def condicion(self, v: str) -> str:
+        return f"isinstance({v}, str) and {self._prefijo()}_re({v}) is not None"   # np.str_ incluido
+
+    def globales(self):
+        return {f"{self._prefijo()}_re": self._coincide}
+
+    def mensaje(self) -> str:
+        return f"no coincide con {self.regex!r}"
+
+
+class Tipo(Campo):
+    excepcion = TypeError
+
+    def __init__(self, tipo: type | Tuple[type, ...], defecto: Any = _SIN_DEFECTO):
+        super().__init__(defecto)
+        self.tipo = tipo
+
+    def condicion(self, v: str) -> str:
+        return f"isinstance({v}, {self._prefijo()}_tipo)"
+
+    def globales(self):
+        return {f"{self._prefijo()}_tipo": self.tipo}
+
+    def mensaje(self) -> str:
+        nombres = self.tipo if isinstance(self.tipo, tuple) else (self.tipo,)
+        return "debe ser " + " o ".join(t.__name__ for t in nombres)
+
+    def mascara_np(self, columna):
+        if columna.dtype == object:
+            return None                              # mezcla de tipos: fila a fila
+        # El dtype decide para toda la columna, según el tipo Python en que
+        # se convierte (lo que recibe construir_muchos): np.int64 → int,
+        # np.str_ → str… np.int64 no es subclase de int.
+        nativo = type(np.zeros(1, dtype=columna.dtype).tolist()[0])
+        return np.full(columna.shape, issubclass(nativo, self.tipo))
+
+
+# ------------------------------------------------------------
+# Generación de código
+# ------------------------------------------------------------
+def _compilar(fuente: str, entorno: Dict[str, Any], nombre: str, cls: type) -> Callable:
+    codigo = compile(fuente, f"<campos {cls.__qualname__}.{nombre}>", "exec")
+    exec(codigo, entorno)
+    funcion = entorno[nombre]
+    funcion.__qualname__ = f"{cls.__qualname__}.{nombre}"
+    funcion._generado = True
+    return funcion
+
+
+def _generable(cls: type, metodo: str) -> bool:
+    """True si la definición de `metodo` más cercana en el MRO es la de
+    object/Modelo o una generada: así no se pisa la que un padre escribió
+    a mano (vars(cls) solo mira la propia clase)."""
+    for base in cls.__mro__:
+        if metodo in vars(base):
+            return base is object or base is Modelo or getattr(vars(base)[metodo], "_generado", False)
+    return True
+
+
+def _comprobar(campo: Campo, v: str, sangria: str) -> List[str]:
+    return [f"{sangria}if not ({campo.condicion(v)}):",
+            f"{sangria}    raise _{campo.nombre}_exc({campo.nombre!r} + ' ' + _{campo.nombre}_msg)"]
+
+
+class Modelo:
+    """Base de las clases con campos declarativos.
+
+    class Producto(Modelo):
+        precio = Positivo()
+        stock = Rango(0, 10_000, defecto=0)
+
+    Producto(9.5)                     → valida todo en un __init__ generado
+    p.precio = -1                     → ValueError, desde el __setattr__ generado
+    Producto.validar_muchos({"precio": [...], "stock": [...]})
+                                      → [(fila, campo, mensaje), …]
+    """
+
+    _campos: Tuple[Campo, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        vistos: Dict[str, Campo] = {}
+        for base in reversed(cls.__mro__):          # heredados primero, en orden de declaración
+            for nombre, valor in vars(base).items():
+                if isinstance(valor, Campo):
+                    vistos.pop(nombre, None)
+                    vistos[nombre] = valor
+        cls._campos = tuple(vistos.values())
+
+        entorno: Dict[str, Any] = {"_object_setattr": object.__setattr__}
+        for campo in cls._campos:
+            entorno.update(campo.globales())
+            entorno[f"_{campo.nombre}_exc"] = campo.excepcion
+            entorno[f"_{campo.nombre}_msg"] = campo.mensaje()
+            if campo.defecto is not _SIN_DEFECTO:
+                entorno[f"_{campo.nombre}_defecto"] = campo.defecto
+
+        # Con defecto al final, como en una firma normal
+        orden = sorted(cls._campos, key=lambda c: c.defecto is not _SIN_DEFECTO)
+        params = ", ".join(c.nombre if c.defecto is _SIN_DEFECTO else f"{c.nombre}=_{c.nombre}_defecto"
+                           for c in orden)
+        cls._firma = tuple(c.nombre for c in orden)
+
+        if _generable(cls, "__init__"):
+            lineas = [f"def __init__(self{', ' if params else ''}{params}):"]
+            for campo in orden:
+                lineas += _comprobar(campo, campo.nombre, "    ")
+            lineas.append("    d = self.__dict__")
+            lineas += [f"    d[{c.nombre!r}] = {c.nombre}" for c in orden]
+            cls.__init__ = _compilar("\n".join(lineas), entorno, "__init__", cls)
+
+        if _generable(cls, "__setattr__"):
+            lineas = ["def __setattr__(self, nombre, valor):"]
+            for i, campo in enumerate(cls._campos):
+                lineas.append(f"    {'if' if i == 0 else 'elif'} nombre == {campo.nombre!r}:")
+                lineas += _comprobar(campo, "valor", "        ")
+            lineas.append("    _object_setattr(self, nombre, valor)")
+            cls.__setattr__ = _compilar("\n".join(lineas), entorno, "__setattr__", cls)
+
+        # Un recorrido por columna: list comprehension con la condición en línea
+        cls._malos: Dict[str, Callable[[Sequence[Any]], List[int]]] = {}
+        for campo in cls._campos:
+            fuente = (f"def _malos(columna):\n"
+                      f"    return [i for i, v in enumerate(columna) if not ({campo.condicion('v')})]")
+            cls._malos[campo.nombre] = _compilar(fuente, dict(entorno), "_malos", cls)
+
+    def __repr__(self) -> str:
+        valores = ", ".join(f"{c.nombre}={self.__dict__.get(c.nombre)!r}" for c in self._campos)
+        return f"{type(self).__name__}({valores})"
+
+    # --- en bloque -------------------------------------------------
+    @classmethod
+    def _filas(cls, columnas: Mapping[str, Sequence[Any]]) -> int:
+        """Número de filas; exige las columnas sin defecto y la misma longitud."""
+        faltan = [c.nombre for c in cls._campos if c.nombre not in columnas and c.defecto is _SIN_DEFECTO]
+        if faltan:
+            raise KeyError(f"faltan columnas: {faltan}")
+        largos = {len(columnas[c.nombre]) for c in cls._campos if c.nombre in columnas}
+        if len(largos) > 1:
+            raise ValueError("todas las columnas deben tener la misma longitud")
+        return largos.pop() if largos else 0
+
+    @classmethod
+    def validar_muchos(cls, columnas: Mapping[str, Sequence[Any]]) -> List[Tuple[int, str, str]]:
+        """Errores de todas las filas, sin crear objetos: [(fila, campo, mensaje)]."""
+        cls._filas(columnas)
+        errores: List[Tuple[int, str, str]] = []
+        for campo in cls._campos:
+            if campo.nombre not in columnas:
+                continue
+            columna = columnas[campo.nombre]
+            malos: Optional[List[int]] = None
+            try:
+                if np is not None and isinstance(columna, np.ndarray):
+                    mascara = campo.mascara_np(columna)
+                    if mascara is not None:
+                        malos = np.flatnonzero(~mascara).tolist()
+                if malos is None:
+                    malos = cls._malos[campo.nombre](columna)
+            except TypeError:                       # p. ej. None > 0: fila a fila
+                malos = cls._malos_lento(campo, columna)
+            mensaje = f"{campo.nombre} {campo.mensaje()}"
+            errores += [(i, campo.nombre, mensaje) for i in malos]
+        errores.sort(key=lambda e: e[0])
+        return errores
+
+    @classmethod
+    def _malos_lento(cls, campo: Campo, columna: Sequence[Any]) -> List[int]:
+        comprobar = cls._malos[campo.nombre]
+        malos = []
+        for i, v in enumerate(columna):
+            try:
+                if comprobar((v,)):
+                    malos.append(i)
+            except TypeError:
+                malos.append(i)
+        return malos
+
+    @classmethod
+    def construir_muchos(cls, columnas: Mapping[str, Sequence[Any]]) -> List[Any]:
+        """Objetos a partir de columnas. El __init__ generado ya valida (y
+        crear por el tipo es más rápido que object.__new__ + __dict__ a mano);
+        si falla, validar_muchos localiza la fila."""
+        n = cls._filas(columnas)              # map() pararía en la columna más corta
+        datos = []
+        for nombre in cls._firma:
+            columna = columnas.get(nombre)
+            if columna is None:
+                columna = [next(c.defecto for c in cls._campos if c.nombre == nombre)] * n
+            elif np is not None and isinstance(columna, np.ndarray):
+                columna = columna.tolist()               # floats de Python, no np.float64
+            datos.append(columna)
+        try:
+            return list(map(cls, *datos))
+        except (ValueError, TypeError) as e:
+            errores = cls.validar_muchos(columnas)
+            if not errores:
+                raise
+            fila, _, mensaje = errores[0]
+            raise type(e)(f"fila {fila}: {mensaje} ({len(errores)} errores en total)") from None
+
+
+# ------------------------------------------------------------
+# Benchmark frente al descriptor de la sección 22
+# ------------------------------------------------------------
+def benchmark(n: int) -> None:
+    import gc
+    import time
+
+    from avanzado import Positivo as PositivoSeccion22, Producto
+
+    class ProductoCampos(Modelo):
+        precio = Positivo()
+
+    # Tres campos: descriptores de la sección 22 frente a campos fundidos
+    class Producto3:
+        precio = PositivoSeccion22("precio")
+        stock = PositivoSeccion22("stock")
+        peso = PositivoSeccion22("peso")
+
+        def __init__(self, precio, stock, peso):
+            self.precio, self.stock, self.peso = precio, stock, peso
+
+    class Producto3Campos(Modelo):
+        precio = Positivo()
+        stock = Rango(0, 1_000_000)
+        peso = Positivo()
+
+    precios = [1.0 + i % 1000 for i in range(n)]
+    stocks = [i % 500 + 1 for i in range(n)]
+    pesos = [0.5 + i % 7 for i in range(n)]
+
+    def medir(funcion) -> float:
+        mejores = []
+        gc.disable()                    # como timeit: sin pasadas del GC cíclico a mitad
+        try:
+            for _ in range(3):
+                t0 = time.perf_counter()
+                funcion()
+                mejores.append(time.perf_counter() - t0)
+                gc.collect()
+        finally:
+            gc.enable()
+        return min(mejores)
+
+    def seccion22():
+        for v in precios:
+            p = Producto()
+            p.precio = v
+
+    def fundido():
+        for v in precios:
+            ProductoCampos(v)
+
+    columnas3 = {"precio": precios, "stock": stocks, "peso": pesos}
+    filas = [
+        ("1 campo: sección 22 (Producto() + __set__)", seccion22),
+        ("1 campo: __init__ fundido", fundido),
+        ("3 campos: descriptores sección 22", lambda: list(map(Producto3, precios, stocks, pesos))),
+        ("3 campos: __init__ fundido", lambda: list(map(Producto3Campos, precios, stocks, pesos))),
+        ("3 campos: validar_muchos (listas)", lambda: Producto3Campos.validar_muchos(columnas3)),
+        ("3 campos: construir_muchos", lambda: Producto3Campos.construir_muchos(columnas3)),
+    ]
+    if np is not None:
+        arrays = {k: np.asarray(v) for k, v in columnas3.items()}
+        filas.append(("3 campos: validar_muchos (NumPy)", lambda: Producto3Campos.validar_muchos(arrays)))
+    print(f"  {n:,} objetos (× frente a la primera fila de cada grupo)")
+    base: Dict[str, float] = {}
+    for etiqueta, funcion in filas:
+        t = medir(funcion)
+        grupo = etiqueta.split(":")[0]
+        base.setdefault(grupo, t)
+        print(f"  {etiqueta:<42} {t:7.3f}s  {t / n * 1e9:7.0f} ns/obj  (×{base[grupo] / t:.1f})")
+
+    # Mismas reglas, mismos errores
+    p = Producto3Campos(10, 5, 1.5)
+    assert (p.precio, p.stock, p.peso) == (10, 5, 1.5) and "precio" in p.__dict__
+    for mal in ((-1, 5, 1.0), (1, -5, 1.0), (1, 5, 0)):
+        try:
+            Producto3Campos(*mal)
+            raise AssertionError(mal)
+        except ValueError:
+            pass
+    try:
+        p.stock = 2_000_000
+        raise AssertionError("stock fuera de rango aceptado")
+    except ValueError:
+        pass
+    malas = {"precio": [1, -2, 3, None], "stock": [1, 2, 3, 4], "peso": [1, 1, 0, 1]}
+    assert Producto3Campos.validar_muchos(malas) == [
+        (1, "precio", "precio debe ser > 0"), (2, "peso", "peso debe ser > 0"), (3, "precio", "precio debe ser > 0")]
+    if np is not None:
+        assert Producto3Campos.validar_muchos({k: np.asarray(v, dtype=float) for k, v in malas.items()
+                                               if k != "precio"} | {"precio": np.array([1.0, -2, 3, 4])}) == [
+            (1, "precio", "precio debe ser > 0"), (2, "peso", "peso debe ser > 0")]
+    try:
+        Producto3Campos.construir_muchos({"precio": [1, 2, 3], "stock": [1], "peso": [1, 1, 1]})
+        raise AssertionError("columnas de distinta longitud aceptadas")
+    except ValueError:
+        pass
+
+    class Etiqueta(Modelo):
+        codigo = Patron(r"[A-Z]{3}")
+        unidades = Tipo(int)
+
+    if np is not None:
+        assert Producto3Campos.validar_muchos({"precio": np.array([1, None, 3], dtype=object),
+                                               "stock": np.arange(1, 4), "peso": np.ones(3)}) == [
+            (1, "precio", "precio debe ser > 0")]
+        assert Etiqueta.validar_muchos({"codigo": np.array(["ABC", "abc"]),
+                                        "unidades": np.array([1, 2], dtype=np.int64)}) == [
+            (1, "codigo", "codigo no coincide con '[A-Z]{3}'")]
+        assert Etiqueta.validar_muchos({"codigo": np.array(["ABC"]), "unidades": np.array([1.5])}) == [
+            (0, "unidades", "unidades debe ser int")]
+    print("  ✓ Mismas validaciones fila a fila y en bloque")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Campos declarativos frente al descriptor Positivo")
+    parser.add_argument("--n", type=int, default=1_000_000)
+    benchmark(parser.parse_args().n)
@@ -0,0 +1,271 @@
+# ================================================================
+# CODEC COLUMNAR – millones de Punto sin pickle
+# ¿QUÉ?  Una lista homogénea de objetos valor (Punto, Punto3D, Coord…)
+#        se guarda POR COLUMNAS: todos los x, luego todos los y… cada
+#        columna es un array.array contiguo: enteros en el tipo más
+#        estrecho que cabe ('b', 'h', 'i' o 'q'), floats en 'd'.
+#        Solo columnas homogéneas: int con int, float con float (mezclar
+#        cambiaría 4 por 4.0 al leer) y enteros dentro de int64.
+#          cabecera | nombres y tipos | columna x | columna y | …
+#        Decodificar no copia: cada columna es un memoryview.cast()
+#        sobre el buffer recibido; los objetos se crean al pedirlos.
+# ¿PARA QUÉ?  pickle (avanzado.py, 32) guarda clase + tupla por objeto:
+#        lento, ~3× más grande y ejecuta código al cargar (inseguro con
+#        datos ajenos). Aquí solo viajan números; la clase la pone quien lee.
+#
+# Benchmark:  python codec_columnar.py [--n 1000000]
+# ================================================================
+from __future__ import annotations
+
+import inspect
+import struct
+import sys
+from array import array
+from dataclasses import dataclass, fields, is_dataclass
+from operator import attrgetter
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple, Union
+
+MAGIA = b"PCOL"
+_CABECERA = struct.Struct("<4sBBI")          # magia, orden de bytes, nº campos, nº filas
+_ALINEACION = 8
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class ErrorCodec(ValueError):
+    pass
+
+
+# ------------------------------------------------------------
+# Esquema: qué campos tiene la clase y cómo reconstruirla
+# ------------------------------------------------------------
+@dataclass(frozen=True)
+class Esquema:
+    clase: Optional[type]
+    campos: Tuple[str, ...]
+
+    def construir(self, *valores: Any) -> Any:
+        return self.clase(*valores)
+
+
+def esquema_de(clase: type) -> Esquema:
+    """NamedTuple → _fields; dataclass → campos de __init__ (norma de Punto3D se
+    recalcula); si no, los parámetros de __init__ (Punto)."""
+    if hasattr(clase, "_fields"):
+        campos = tuple(clase._fields)
+    elif is_dataclass(clase):
+        campos = tuple(f.name for f in fields(clase) if f.init)
+    else:
+        parametros = list(inspect.signature(clase.__init__).parameters.values())[1:]
+        campos = tuple(p.name for p in parametros
+                       if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD))
+    if not campos:
+        raise ErrorCodec(f"no se pueden deducir los campos de {clase.__name__}")
+    return Esquema(clase, campos)
+
+
+def _relleno(n: int) -> int:
+    return -n % _ALINEACION
+
+
+_ENTEROS = tuple((codigo, -(1 << (8 * array(codigo).itemsize - 1))) for codigo in "bhiq")
+
+
+def _columna(nombre: str, valores: Sequence[Any]) -> array:
+    """Enteros en el typecode más estrecho que los contiene; floats en 'd'.
+
+    Cualquier otra cosa (mezcla int/float, bool, None, str, enteros fuera
+    de int64) es ErrorCodec: mejor fallar que devolver otros valores.
+    """
+    tipos = set(map(type, valores))
+    if tipos == {float}:
+        return array("d", valores)
+    if tipos != {int}:
+        nombres = ", ".join(sorted(t.__name__ for t in tipos))
+        raise ErrorCodec(f"columna {nombre!r}: tipos {{{nombres}}}; solo se admiten columnas "
+                         "homogéneas de int o de float (usa pickle para lo demás)")
+    menor, mayor = min(valores), max(valores)
+    for codigo, minimo in _ENTEROS:
+        if minimo <= menor and mayor < -minimo:
+            return array(codigo, valores)
+    raise ErrorCodec(f"columna {nombre!r}: enteros fuera de int64 ({menor}…{mayor})")
+
+
+# ------------------------------------------------------------
+# Codificar
+# ------------------------------------------------------------
+def columnas_de(objetos: Sequence[Any], esquema: Optional[Esquema] = None) -> Tuple[Esquema, List[array]]:
+    if not objetos:
+        raise ErrorCodec("lista vacía: no hay de dónde deducir el esquema")
+    esquema = esquema or esquema_de(type(objetos[0]))
+    leer = attrgetter(*esquema.campos)
+    if len(esquema.campos) == 1:
+        return esquema, [_columna(esquema.campos[0], [leer(o) for o in objetos])]
+    return esquema, [_columna(nombre, col) for nombre, col in zip(esquema.campos, zip(*map(leer, objetos)))]
+
+
+def codificar_partes(columnas: Sequence[Tuple[str, array]]) -> List[memoryview]:
+    """Trozos listos para escribir (os.writev, socket.sendmsg, b"".join):
+    las columnas se entregan como memoryview de los array, sin copiarlas."""
+    filas = len(columnas[0][1]) if columnas else 0
+    if any(len(col) != filas for _, col in columnas):
+        raise ErrorCodec("todas las columnas deben tener la misma longitud")
+    meta = bytearray(_CABECERA.pack(MAGIA, sys.byteorder == "little", len(columnas), filas))
+    for nombre, col in columnas:
+        crudo = nombre.encode("utf-8")
+        meta += struct.pack("<cB", col.typecode.encode(), len(crudo)) + crudo
+    meta += bytes(_relleno(len(meta)))
+    partes = [memoryview(meta)]
+    for _, col in columnas:
+        vista = memoryview(col).cast("B")
+        partes.append(vista)
+        if _relleno(len(vista)):
+            partes.append(memoryview(bytes(_relleno(len(vista)))))
+    return partes
+
+
+def codificar(objetos: Sequence[Any], esquema: Optional[Esquema] = None) -> bytes:
+    esquema, columnas = columnas_de(objetos, esquema)
+    return b"".join(codificar_partes(list(zip(esquema.campos, columnas))))
+
+
+# ------------------------------------------------------------
+# Decodificar (sin copias)
+# ------------------------------------------------------------
+class Columnas(Sequence):
+    """Vista de solo lectura sobre un buffer codificado.
+
+    tabla.columna("x")   → memoryview 'd'/'b'/'h'/'i'/'q' (np.frombuffer lo envuelve sin copiar)
+    tabla[i]             → objeto i (se construye en ese momento)
+    list(tabla)          → todos los objetos
+    """
+
+    def __init__(self, datos: Buffer, clase: Optional[type] = None):
+        vista = memoryview(datos).cast("B")
+        if len(vista) < _CABECERA.size:
+            raise ErrorCodec("buffer demasiado corto")
+        magia, little, n_campos, filas = _CABECERA.unpack_from(vista, 0)
+        if magia != MAGIA:
+            raise ErrorCodec("no es un buffer columnar (magia incorrecta)")
+        pos = _CABECERA.size
+        declarados = []
+        for _ in range(n_campos):
+            tipo, largo = struct.unpack_from("<cB", vista, pos)
+            pos += 2
+            declarados.append((bytes(vista[pos:pos + largo]).decode("utf-8"), tipo.decode()))
+            pos += largo
+        pos += _relleno(pos)
+        self.filas = filas
+        self.campos = tuple(nombre for nombre, _ in declarados)
+        self._columnas: List[Any] = []
+        for nombre, tipo in declarados:
+            ancho = array(tipo).itemsize * filas
+            if pos + ancho > len(vista):
+                raise ErrorCodec(f"buffer truncado en la columna {nombre!r}")
+            if bool(little) == (sys.byteorder == "little"):
+                col: Any = vista[pos:pos + ancho].cast(tipo)        # cero copias
+            else:
+                col = array(tipo, vista[pos:pos + ancho].tobytes())
+                col.byteswap()                                      # otro orden: una copia
+            self._columnas.append(col)
+            pos += ancho + _relleno(ancho)
+        self.esquema = Esquema(clase, self.campos) if clase is not None else None
+        if clase is not None and esquema_de(clase).campos != self.campos:
+            raise ErrorCodec(f"{clase.__name__} espera {esquema_de(clase).campos}, el buffer trae {self.campos}")
+
+    def columna(self, nombre: str):
+        return self._columnas[self.campos.index(nombre)]
+
+    def __len__(self) -> int:
+        return self.filas
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.filas))]
+        fila = tuple(col[i] for col in self._columnas)
+        return self.esquema.construir(*fila) if self.esquema else fila
+
+    def __iter__(self) -> Iterator[Any]:
+        if self.esquema is None:
+            return zip(*self._columnas)
+        return map(self.esquema.clase, *self._columnas)
+
+
+def decodificar(datos: Buffer, clase: Optional[type] = None) -> Columnas:
+    """`clase` decide qué se construye; sin clase, cada fila es una tupla."""
+    return Columnas(datos, clase)
+
+
+# ------------------------------------------------------------
+# Benchmark frente a pickle protocolo 5
+# ------------------------------------------------------------
+def benchmark(n: int) -> None:
+    import pickle
+    import time
+    from pathlib import Path
+
+    sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "extra"))
+    from avanzado import Punto
+    from extra import Coord, Punto3D
+
+    def medir(funcion: Callable[[], Any]) -> Tuple[float, Any]:
+        t0 = time.perf_counter()
+        resultado = funcion()
+        return time.perf_counter() - t0, resultado
+
+    conjuntos = {
+        "Punto": [Punto(i, i * 2) for i in range(n)],
+        "Punto3D": [Punto3D(i * 0.5, i * 0.25, 1.0) for i in range(n)],
+        "Coord": [Coord(40.0 + i * 1e-6, -3.7 - i * 1e-6) for i in range(n)],
+    }
+    print(f"  {n:,} objetos por clase")
+    print(f"  {'':<10} {'método':<26} {'MB':>7} {'codificar':>10} {'decodificar':>12}")
+    for nombre, objetos in conjuntos.items():
+        clase = type(objetos[0])
+
+        t_cod, datos = medir(lambda: pickle.dumps(objetos, protocol=5))
+        t_dec, _ = medir(lambda: pickle.loads(datos))
+        print(f"  {nombre:<10} {'pickle 5 (lista)':<26} {len(datos) / 1e6:7.2f} {t_cod:9.3f}s {t_dec:11.3f}s")
+
+        # pickle 5 con buffers fuera de banda: lo mejor que ofrece pickle para
+        # arrays. Mismos pasos que el columnar: extraer columnas + serializar;
+        # cargar columnas; crear objetos.
+        fuera: List[pickle.PickleBuffer] = []
+
+        def pickle_columnas():
+            esquema, columnas = columnas_de(objetos)
+            return esquema, pickle.dumps([pickle.PickleBuffer(c) for c in columnas], protocol=5,
+                                         buffer_callback=fuera.append)
+
+        t_cod, (esquema, datos) = medir(pickle_columnas)
+        tamano = len(datos) + sum(b.raw().nbytes for b in fuera)
+        t_dec, cargadas = medir(lambda: pickle.loads(datos, buffers=fuera))
+        t_obj, _ = medir(lambda: list(map(clase, *map(memoryview, cargadas))))
+        print(f"  {'':<10} {'pickle 5 fuera de banda':<26} {tamano / 1e6:7.2f} {t_cod:9.3f}s {t_dec:11.6f}s"
+              f"  (+{t_obj:.3f}s creando objetos)")
+
+        t_cod, datos = medir(lambda: codificar(objetos))
+        t_dec, tabla = medir(lambda: decodificar(datos, clase))
+        t_obj, reconstruidos = medir(lambda: list(tabla))
+        print(f"  {'':<10} {'columnar':<26} {len(datos) / 1e6:7.2f} {t_cod:9.3f}s {t_dec:11.6f}s"
+              f"  (+{t_obj:.3f}s creando objetos)")
+        primero, ultimo = reconstruidos[0], reconstruidos[-1]
+        for campo in esquema.campos:
+            assert getattr(primero, campo) == getattr(objetos[0], campo)
+            assert getattr(ultimo, campo) == getattr(objetos[-1], campo)
+            assert type(getattr(ultimo, campo)) is type(getattr(objetos[-1], campo))
+
+    # Lo que no se puede guardar sin cambiar valores: error claro, no coerción
+    for malos in ([Punto(3, 4), Punto(1.5, 2)], [Punto(2**63, 0)], [Punto(None, 0)]):
+        try:
+            codificar(malos)
+            raise AssertionError(f"aceptado: {malos}")
+        except ErrorCodec as e:
+            print(f"  ✓ rechazado: {e}")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Codec columnar frente a pickle")
+    parser.add_argument("--n", type=int, default=1_000_000)
+    benchmark(parser.parse_args().n)
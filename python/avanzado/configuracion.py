@@ -0,0 +1,338 @@
+# ================================================================
+# CONFIGURACIÓN RECARGABLE – instantáneas inmutables sin locks
+# ¿QUÉ?  Configuracion(ruta) lee un .json o .toml y publica una
+#        Instantanea inmutable en `config.actual`. Los lectores solo
+#        leen ese atributo (reasignar un atributo es atómico): nunca
+#        esperan a nadie. Recargar = parsear en otro hilo, construir la
+#        instantánea nueva completa y reasignar `actual` de golpe.
+#        El cambio del archivo se detecta con os.stat (mtime_ns, tamaño,
+#        inode: también los guardados atómicos por rename). Un archivo a
+#        medio escribir, inválido o borrado (guardar = borrar + escribir en
+#        algunos editores) no se publica: sigue la versión anterior.
+#        Opcional: `esquema=` un TypedDict (como ConfigDict de extra.py)
+#        para comprobar claves obligatorias y tipos.
+# ¿PARA QUÉ?  Config (avanzado.py, 33) solo llevaba debug=True y no
+#        había forma de cambiar nada sin reiniciar el proceso.
+#
+# Uso:        config = Configuracion("app.json").vigilar(intervalo=1.0)
+#             if config.actual.debug: ...
+# Benchmark:  python configuracion.py [--lecturas 1000000]
+# ================================================================
+from __future__ import annotations
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple, Union
+
+Ruta = Union[str, Path]
+Oyente = Callable[["Instantanea", "Instantanea"], None]
+
+
+class Instantanea:
+    """Valores de una versión de la configuración, de solo lectura.
+
+    snap.debug / snap.db.host   → acceso normal a atributo (__dict__)
+    snap["clave-rara"]          → para claves que no son identificadores
+    Los dict anidados son Instantanea y las listas, tuplas. Las claves
+    `get`, `a_dict` y __dunder__ se rechazan: taparían los métodos.
+    """
+
+    def __init__(self, datos: Mapping[str, Any]):
+        reservadas = [k for k in datos if k in _RESERVADAS or (k.startswith("__") and k.endswith("__"))]
+        if reservadas:
+            raise ValueError(f"claves reservadas en la configuración: {reservadas}")
+        object.__setattr__(self, "__dict__", {k: _congelar(v) for k, v in datos.items()})
+
+    def __setattr__(self, nombre: str, valor: Any) -> None:
+        raise AttributeError("la configuración es inmutable: edita el archivo")
+
+    __delattr__ = __setattr__
+
+    def __getitem__(self, clave: str) -> Any:
+        return self.__dict__[clave]
+
+    def __contains__(self, clave: str) -> bool:
+        return clave in self.__dict__
+
+    def get(self, clave: str, defecto: Any = None) -> Any:
+        return self.__dict__.get(clave, defecto)
+
+    def a_dict(self) -> Dict[str, Any]:
+        return {k: v.a_dict() if isinstance(v, Instantanea) else v for k, v in self.__dict__.items()}
+
+    def __eq__(self, otra: object) -> bool:
+        return isinstance(otra, Instantanea) and self.__dict__ == otra.__dict__
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"Instantanea({self.a_dict()!r})"
+
+
+_RESERVADAS = frozenset(nombre for nombre in vars(Instantanea) if not nombre.startswith("__"))
+
+
+def _congelar(valor: Any) -> Any:
+    if isinstance(valor, Mapping):
+        return Instantanea(valor)
+    if isinstance(valor, list):
+        return tuple(_congelar(v) for v in valor)
+    return valor
+
+
+def _leer(ruta: Path) -> Dict[str, Any]:
+    if ruta.suffix == ".toml":
+        import tomllib
+        with open(ruta, "rb") as f:
+            return tomllib.load(f)
+    with open(ruta, "rb") as f:
+        datos = json.loads(f.read())
+    if not isinstance(datos, dict):
+        raise ValueError(f"{ruta}: se esperaba un objeto en la raíz")
+    return datos
+
+
+def _validar(datos: Mapping[str, Any], esquema: type) -> None:
+    """Claves obligatorias y tipos simples de un TypedDict."""
+    import typing
+
+    faltan = set(getattr(esquema, "__required_keys__", ())) - datos.keys()
+    if faltan:
+        raise ValueError(f"faltan claves: {sorted(faltan)}")
+    for clave, tipo in typing.get_type_hints(esquema).items():
+        if clave not in datos:
+            continue
+        tipo, valor = typing.get_origin(tipo) or tipo, datos[clave]
+        if not isinstance(tipo, type):
+            continue
+        if tipo is float:                 # JSON/TOML escriben 1, no 1.0: int vale como float
+            valido = isinstance(valor, (int, float)) and not isinstance(valor, bool)
+        else:                             # bool es subclase de int, pero "port": true no es un puerto
+            valido = isinstance(valor, tipo) and (tipo is bool or not isinstance(valor, bool))
+        if not valido:
+            raise ValueError(f"{clave}: se esperaba {tipo.__name__}, no {type(valor).__name__}")
+
+
+class Configuracion:
+    """config.actual → Instantanea vigente (leer sin lock, siempre coherente).
+    config.comprobar() → recarga si el archivo cambió; True si publicó otra.
+    config.vigilar(intervalo) → hilo demonio que llama a comprobar().
+    config.al_cambiar(f) → f(vieja, nueva) tras cada publicación.
+    """
+
+    def __init__(self, ruta: Ruta, defectos: Optional[Mapping[str, Any]] = None,
+                 esquema: Optional[type] = None):
+        self.ruta = Path(ruta)
+        self.defectos = dict(defectos or {})
+        self.esquema = esquema
+        self.version = 0
+        self.ultimo_error: Optional[Exception] = None
+        self._firma: Optional[Tuple[int, int, int]] = None
+        self._oyentes: List[Oyente] = []
+        self._recargando = threading.Lock()          # solo entre recargadores
+        self._parar = threading.Event()
+        self._hilo: Optional[threading.Thread] = None
+        self.actual = Instantanea(self.defectos)
+        if self._firma_archivo() is None:
+            raise FileNotFoundError(f"no existe {self.ruta}")
+        if not self.comprobar() and self.ultimo_error is not None:
+            raise self.ultimo_error                   # el primer archivo debe existir y ser válido
+
+    # --- recarga ----------------------------------------------------
+    def _firma_archivo(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.ruta)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def comprobar(self) -> bool:
+        """Un os.stat si nada cambió; si cambió, parsea y publica."""
+        firma = self._firma_archivo()
+        if firma == self._firma:
+            return False
+        if firma is None:                             # borrado: como un archivo inválido
+            self.ultimo_error = FileNotFoundError(f"no existe {self.ruta}")
+            return False
+        with self._recargando:
+            if firma == self._firma:                  # otro recargador se adelantó
+                return False
+            try:
+                datos = {**self.defectos, **_leer(self.ruta)}
+                if self.esquema is not None:
+                    _validar(datos, self.esquema)
+                nueva = Instantanea(datos)
+            except (OSError, ValueError) as e:       # JSONDecodeError/TOMLDecodeError son ValueError
+                self.ultimo_error = e
+                return False                          # se reintenta: la firma no se actualiza
+            self.ultimo_error = None
+            self._firma = firma
+            vieja, self.actual = self.actual, nueva   # publicación atómica
+            self.version += 1
+        for oyente in list(self._oyentes):
+            oyente(vieja, nueva)
+        return True
+
+    def al_cambiar(self, oyente: Oyente) -> Oyente:
+        self._oyentes.append(oyente)
+        return oyente
+
+    # --- vigilancia ---------------------------------------------------
+    def vigilar(self, intervalo: float = 1.0) -> "Configuracion":
+        if self._hilo is None or not self._hilo.is_alive():
+            self._parar.clear()
+            self._hilo = threading.Thread(target=self._bucle, args=(intervalo,),
+                                          name=f"config:{self.ruta.name}", daemon=True)
+            self._hilo.start()
+        return self
+
+    def _bucle(self, intervalo: float) -> None:
+        while not self._parar.wait(intervalo):
+            try:
+                self.comprobar()
+            except Exception as e:                    # un oyente roto no detiene la vigilancia
+                self.ultimo_error = e
+
+    def detener(self) -> None:
+        self._parar.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+
+    def __enter__(self) -> "Configuracion":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.detener()
+
+    def __repr__(self) -> str:
+        return f"Configuracion({str(self.ruta)!r}, version={self.version})"
+
+
+# ------------------------------------------------------------
+# Benchmark: coste por lectura y lectores durante recargas
+# ------------------------------------------------------------
+def benchmark(lecturas: int) -> None:
+    import tempfile
+    import time
+    from typing import TypedDict
+
+    class ConfigDict(TypedDict, total=False):  # el de extra.py, sección 42
+        host: str
+        port: int
+        debug: bool
+        timeout: float
+
+    def escribir(ruta: Path, datos: Dict[str, Any]) -> None:
+        temporal = ruta.with_suffix(".tmp")
+        temporal.write_text(json.dumps(datos), encoding="utf-8")
+        os.replace(temporal, ruta)                    # guardado atómico, como un editor
+
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = Path(tmp) / "app.json"
+        escribir(ruta, {"host": "0.0.0.0", "port": 8000, "debug": True, "a": 0, "b": 0})
+        config = Configuracion(ruta, esquema=ConfigDict)
+
+        class Plano:                                  # atributo normal: el mínimo posible
+            debug = True
+        plano, dic, lock = Plano(), {"debug": True}, threading.Lock()
+
+        def con_lock():
+            with lock:
+                return dic["debug"]
+
+        casos = (
+            ("atributo de un objeto", lambda: plano.debug),
+            ("dict['debug']", lambda: dic["debug"]),
+            ("config.actual.debug", lambda: config.actual.debug),
+            ("lock + dict", con_lock),
+        )
+        print(f"  {lecturas:,} lecturas (incluye la llamada a la lambda, igual para todos):")
+        for etiqueta, leer in casos:
+            t0 = time.perf_counter()
+            for _ in range(lecturas):
+                leer()
+            t = time.perf_counter() - t0
+            print(f"    {etiqueta:<24} {t / lecturas * 1e9:6.0f} ns")
+
+        t0 = time.perf_counter()
+        for _ in range(10_000):
+            config.comprobar()
+        print(f"  comprobar() sin cambios: {(time.perf_counter() - t0) / 10_000 * 1e6:.1f} µs (un os.stat)")
+
+        # 8 lectores sin pausa mientras este hilo reescribe el archivo y recarga
+        parar = threading.Event()
+        leidas = [0] * 8
+        incoherentes = [0]
+
+        def lector(i: int) -> None:
+            while not parar.is_set():
+                snap = config.actual                  # una lectura: versión coherente
+                if snap.a != snap.b:
+                    incoherentes[0] += 1
+                leidas[i] += 1
+
+        hilos = [threading.Thread(target=lector, args=(i,)) for i in range(8)]
+        for h in hilos:
+            h.start()
+        t0 = time.perf_counter()
+        recargas = 0
+        for n in range(1, 101):
+            escribir(ruta, {"host": "0.0.0.0", "port": 8000, "debug": n % 2 == 0, "a": n, "b": n})
+            recargas += config.comprobar()
+        t = time.perf_counter() - t0
+        parar.set()
+        for h in hilos:
+            h.join()
+        assert incoherentes[0] == 0 and config.actual.a == 100
+        print(f"  {recargas} recargas en {t:.2f}s con 8 lectores: {sum(leidas):,} lecturas, 0 incoherentes")
+
+        # Archivo roto: se mantiene la última versión buena
+        ruta.write_text("{roto", encoding="utf-8")
+        assert not config.comprobar() and config.actual.a == 100 and config.ultimo_error is not None
+        escribir(ruta, {"port": "ocho mil"})
+        assert not config.comprobar() and "port" in str(config.ultimo_error)
+        escribir(ruta, {"port": True})
+        assert not config.comprobar() and "port" in str(config.ultimo_error)
+        escribir(ruta, {"port": 8000, "timeout": 1})  # 1 en JSON es un float válido
+        assert config.comprobar() and config.actual.timeout == 1 and config.ultimo_error is None
+        escribir(ruta, {"host": "0.0.0.0", "port": 8000, "debug": True, "a": 100, "b": 100})
+        assert config.comprobar()
+        escribir(ruta, {"x": {"a_dict": 2}})          # taparía Instantanea.a_dict
+        assert not config.comprobar() and "a_dict" in str(config.ultimo_error)
+
+        # Archivo borrado (o borrar + escribir de un editor): tampoco se publica
+        ruta.unlink()
+        assert not config.comprobar() and config.actual.a == 100
+        assert isinstance(config.ultimo_error, FileNotFoundError)
+        try:
+            Configuracion(ruta)
+            raise AssertionError("se aceptó una ruta inexistente")
+        except FileNotFoundError:
+            pass
+
+        # Vigilancia en segundo plano
+        cambios = []
+        config.al_cambiar(lambda vieja, nueva: cambios.append(nueva.port))
+        with config.vigilar(intervalo=0.01):
+            escribir(ruta, {"port": 9000})
+            limite = time.monotonic() + 2
+            while config.actual.port != 9000 and time.monotonic() < limite:
+                time.sleep(0.005)
+        assert config.actual.port == 9000 and cambios == [9000]
+        try:
+            config.actual.port = 1
+            raise AssertionError("la instantánea se dejó modificar")
+        except AttributeError:
+            pass
+        print("  ✓ archivos rotos o borrados no se publican; vigilar() recoge el cambio; instantáneas inmutables")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Configuración recargable con instantáneas")
+    parser.add_argument("--lecturas", type=int, default=1_000_000)
+    benchmark(parser.parse_args().lecturas)
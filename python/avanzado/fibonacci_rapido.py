@@ -0,0 +1,112 @@
+# ================================================================
+# FIBONACCI RÁPIDO – fast doubling O(log n) + generador por bloques
+# ¿QUÉ?  F(2k)   = F(k) · (2·F(k+1) − F(k))
+#        F(2k+1) = F(k)² + F(k+1)²
+#        Recorriendo los bits de n se llega a F(n) en O(log n)
+#        multiplicaciones de enteros grandes, sin recursión.
+# ¿PARA QUÉ?  fib() memoizado (avanzado.py, sección 31) revienta el
+#        límite de recursión y guarda O(n) resultados; fibonacci()
+#        (intermedio.py, sección 16) es lineal. Aquí: un término
+#        suelto en O(log n) y rangos en streaming desde cualquier índice.
+#
+# Benchmark:  python fibonacci_rapido.py [--hasta 1000000]
+# ================================================================
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Iterator, List, Optional, Tuple
+
+from cache_acotada import cache
+
+
+def fib_par(n: int) -> Tuple[int, int]:
+    """(F(n), F(n+1)) por fast doubling iterativo."""
+    if n < 0:
+        raise ValueError("n debe ser >= 0")
+    a, b = 0, 1                      # F(k), F(k+1) con k = 0
+    for bit in bin(n)[2:]:           # bits de n, del más significativo
+        c = a * (2 * b - a)          # F(2k)
+        d = a * a + b * b            # F(2k+1)
+        if bit == "1":
+            a, b = d, c + d          # k -> 2k+1
+        else:
+            a, b = c, d              # k -> 2k
+    return a, b
+
+
+def fib_rapido(n: int) -> int:
+    """F(n) en O(log n); F(0) = 0, F(1) = 1."""
+    return fib_par(n)[0]
+
+
+def fibonacci_desde(inicio: int = 0, fin: Optional[int] = None, bloque: int = 1024) -> Iterator[List[int]]:
+    """Genera F(inicio), F(inicio+1), … en listas de hasta `bloque` términos.
+
+    Arranca en cualquier índice con fast doubling (no recorre 0..inicio) y solo
+    mantiene dos enteros entre bloques. `fin` es exclusivo; None = infinito.
+    Para reanudar un flujo cortado basta llamar de nuevo con el índice siguiente.
+    """
+    if bloque < 1:
+        raise ValueError("bloque debe ser >= 1")
+    a, b = fib_par(inicio)
+    i = inicio
+    while fin is None or i < fin:
+        tope = bloque if fin is None else min(bloque, fin - i)
+        terminos = []
+        for _ in range(tope):
+            terminos.append(a)
+            a, b = b, a + b
+        i += tope
+        yield terminos
+
+
+# ------------------------------------------------------------
+# Benchmark: lineal vs memoizado recursivo vs fast doubling
+# ------------------------------------------------------------
+def _fib_lineal(n: int) -> int:
+    # Mismo bucle que fibonacci(n) de intermedio.py (sección 16)
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
+
+
+def _fib_memo(n: int) -> int:
+    # Mismo esquema que fib() de avanzado.py (sección 31), caché nueva
+    @cache(maxsize=None)
+    def fib(k: int) -> int:
+        return k if k < 2 else fib(k - 1) + fib(k - 2)
+
+    return fib(n)
+
+
+def _medir(func, n: int) -> Tuple[Optional[int], str]:
+    t0 = time.perf_counter()
+    try:
+        resultado = func(n)
+    except RecursionError:
+        return None, "RecursionError"
+    return resultado, f"{time.perf_counter() - t0:.6f}s"
+
+
+def benchmark(hasta: int = 10**6) -> None:
+    ns = [10**k for k in range(1, len(str(hasta)))]
+    print(f"  {'n':>9} | {'lineal':>14} | {'memo recursivo':>14} | {'fast doubling':>14}")
+    for n in ns:
+        (lineal, t_lin), (memo, t_memo), (rapido, t_rap) = (
+            _medir(f, n) for f in (_fib_lineal, _fib_memo, fib_rapido)
+        )
+        assert rapido == lineal and memo in (None, rapido)
+        print(f"  {n:>9,} | {t_lin:>14} | {t_memo:>14} | {t_rap:>14}")
+    print(f"  ✓ Resultados idénticos; F({ns[-1]:,}) tiene {rapido.bit_length():,} bits")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de Fibonacci")
+    parser.add_argument("--hasta", type=int, default=10**6, help="n máximo (potencia de 10)")
+    args = parser.parse_args()
+
+    print("  F(0..9):", next(fibonacci_desde(0, 10)))
+    print("  F(100..104):", next(fibonacci_desde(100, 105)))
+    benchmark(args.hasta)
@@ -0,0 +1,327 @@
+# ================================================================
+# INSTRUMENTACIÓN – medir / cronometro en modo producción
+# ¿QUÉ?  Versiones de medir (intermedio.py, 17) y cronometro
+#        (avanzado.py, 28) que NO imprimen: registran la duración en
+#        histogramas log-lineales (p50/p95/p99) con muestreo opcional,
+#        memoria vía tracemalloc, y exportan a JSON o Prometheus.
+# ¿PARA QUÉ?  Dejar la medición siempre encendida: registrar cuesta
+#        ~2 µs por llamada medida (menos con muestreo) y no hay print.
+# ================================================================
+from __future__ import annotations
+
+import inspect
+import json
+import random
+import re
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+_SUB_BITS = 6                       # 64 sub-cubos por potencia de 2 → error ≤ 1.6 %
+_SUB = 1 << _SUB_BITS
+_CUBOS = _SUB * 64                  # cubre hasta ~2^63
+
+
+def _indice(valor: int) -> int:
+    if valor < 2 * _SUB:
+        return valor
+    desplazamiento = valor.bit_length() - (_SUB_BITS + 1)
+    return (desplazamiento + 1) * _SUB + (valor >> desplazamiento) - _SUB
+
+
+def _limite_superior(indice: int) -> int:
+    if indice < 2 * _SUB:
+        return indice
+    desplazamiento = indice // _SUB - 1
+    return (((indice % _SUB) + _SUB + 1) << desplazamiento) - 1
+
+
+class Histograma:
+    """Histograma log-lineal de enteros ≥ 0 (ns, bytes…): memoria fija, O(1) por dato."""
+
+    def __init__(self, unidad: str = "ns"):
+        self.unidad = unidad
+        self.cuenta = 0
+        self.suma = 0
+        self.minimo: Optional[int] = None
+        self.maximo: Optional[int] = None
+        self.omitidas = 0                 # muestras que no se pudieron tomar
+        self._cubos: List[int] = [0] * _CUBOS
+        self._lock = threading.Lock()
+
+    def registrar(self, valor: int) -> None:
+        valor = max(int(valor), 0)
+        with self._lock:
+            self._cubos[_indice(valor)] += 1
+            self.cuenta += 1
+            self.suma += valor
+            if self.minimo is None or valor < self.minimo:
+                self.minimo = valor
+            if self.maximo is None or valor > self.maximo:
+                self.maximo = valor
+
+    def omitir(self) -> None:
+        with self._lock:
+            self.omitidas += 1
+
+    def percentil(self, p: float) -> int:
+        """Valor bajo el que cae el p % de los datos (cota superior del cubo)."""
+        with self._lock:
+            if not self.cuenta:
+                return 0
+            objetivo = max(1, -(-self.cuenta * p // 100))     # techo
+            acumulado = 0
+            for indice, n in enumerate(self._cubos):
+                acumulado += n
+                if acumulado >= objetivo:
+                    return min(_limite_superior(indice), self.maximo)
+        return self.maximo or 0
+
+    def resumen(self) -> Dict[str, Any]:
+        return {
+            "unidad": self.unidad,
+            "cuenta": self.cuenta,
+            "suma": self.suma,
+            "min": self.minimo or 0,
+            "max": self.maximo or 0,
+            "p50": self.percentil(50),
+            "p95": self.percentil(95),
+            "p99": self.percentil(99),
+            "omitidas": self.omitidas,
+        }
+
+    def reiniciar(self) -> None:
+        with self._lock:
+            self._cubos = [0] * _CUBOS
+            self.cuenta = self.suma = self.omitidas = 0
+            self.minimo = self.maximo = None
+
+
+class Registro:
+    """Conjunto de histogramas con nombre; exporta a JSON y a Prometheus."""
+
+    def __init__(self):
+        self._histogramas: Dict[str, Histograma] = {}
+        self._lock = threading.Lock()
+
+    def histograma(self, nombre: str, unidad: str = "ns") -> Histograma:
+        h = self._histogramas.get(nombre)
+        if h is None:
+            with self._lock:
+                h = self._histogramas.setdefault(nombre, Histograma(unidad))
+        return h
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(dict(self._histogramas))
+
+    def reiniciar(self) -> None:
+        with self._lock:
+            self._histogramas.clear()
+
+    def a_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {nombre: h.resumen() for nombre, h in sorted(self._histogramas.items())}
+
+    def a_json(self, **kwargs) -> str:
+        return json.dumps(self.a_dict(), **kwargs)
+
+    def a_prometheus(self, prefijo: str = "") -> str:
+        """Formato de texto de Prometheus: un `summary` por histograma.
+
+        Las duraciones se exportan en segundos y la memoria en bytes.
+        """
+        lineas: List[str] = []
+        for nombre, h in sorted(self._histogramas.items()):
+            r = h.resumen()
+            escala, sufijo = (1e-9, "seconds") if h.unidad == "ns" else (1, h.unidad)
+            metrica = re.sub(r"[^a-zA-Z0-9_:]", "_", f"{prefijo}{nombre}_{sufijo}")
+            lineas.append(f"# TYPE {metrica} summary")
+            for q, clave in (("0.5", "p50"), ("0.95", "p95"), ("0.99", "p99")):
+                lineas.append(f'{metrica}{{quantile="{q}"}} {r[clave] * escala:.9g}')
+            lineas.append(f"{metrica}_sum {r['suma'] * escala:.9g}")
+            lineas.append(f"{metrica}_count {r['cuenta']}")
+            if r["omitidas"]:
+                lineas.append(f"# TYPE {metrica}_omitidas_total counter")
+                lineas.append(f"{metrica}_omitidas_total {r['omitidas']}")
+        return "\n".join(lineas) + "\n"
+
+
+REGISTRO = Registro()      # registro global por defecto
+
+
+# ------------------------------------------------------------
+# Memoria (tracemalloc)
+# ------------------------------------------------------------
+# tracemalloc ralentiza TODO el proceso mientras está activo: se enciende
+# solo durante la medición y se apaga al terminar (si lo encendimos nosotros).
+# El pico de tracemalloc es uno solo para todo el proceso y reset_peak() lo
+# pone a cero para todos: dos mediciones a la vez (anidadas, en otro hilo o
+# en otra tarea async) se falsearían el pico entre sí. Por eso solo se mide
+# UNA a la vez: las demás ejecutan igual, registran su tiempo y cuentan la
+# muestra de memoria como omitida (Histograma.omitidas).
+_midiendo_memoria = False
+_lock_trazas = threading.Lock()
+
+
+@contextmanager
+def _pico_memoria(h: Histograma) -> Iterator[None]:
+    global _midiendo_memoria
+    with _lock_trazas:
+        ocupado = _midiendo_memoria
+        if not ocupado:
+            _midiendo_memoria = True
+            propias = not tracemalloc.is_tracing()
+            if propias:
+                tracemalloc.start()
+    if ocupado:
+        # Nunca alterar el código medido: se ejecuta igual, solo sin pico
+        h.omitir()
+        yield
+        return
+    antes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    try:
+        yield
+    finally:
+        _, pico = tracemalloc.get_traced_memory()
+        h.registrar(pico - antes)
+        with _lock_trazas:
+            if propias:
+                tracemalloc.stop()
+            _midiendo_memoria = False
+
+
+# ------------------------------------------------------------
+# API pública: cronometro (context manager) y medir (decorador)
+# ------------------------------------------------------------
+@contextmanager
+def cronometro(nombre: str, memoria: bool = False, registro: Registro = REGISTRO) -> Iterator[None]:
+    """Como cronometro() de la sección 28, pero registra en vez de imprimir.
+
+    Con `memoria=True`, si ya hay otra medición de memoria en curso (anidada
+    o concurrente) solo se omite la muestra de memoria: el pico de
+    tracemalloc es global al proceso.
+    """
+    h = registro.histograma(nombre)
+    if memoria:
+        with _pico_memoria(registro.histograma(f"{nombre}_memoria", "bytes")):
+            t0 = time.perf_counter_ns()
+            try:
+                yield
+            finally:
+                h.registrar(time.perf_counter_ns() - t0)
+    else:
+        t0 = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            h.registrar(time.perf_counter_ns() - t0)
+
+
+def medir(
+    func: Optional[Callable[..., Any]] = None,
+    *,
+    nombre: Optional[str] = None,
+    muestreo: float = 1.0,
+    memoria: bool = False,
+    registro: Registro = REGISTRO,
+):
+    """Decorador para funciones normales y async: @medir o @medir(muestreo=0.01).
+
+    `muestreo` = fracción de llamadas medidas (el resto solo paga un random()).
+    `memoria=True` registra además el pico de memoria asignada (tracemalloc);
+    si otra medición de memoria está en curso, se omite (ver cronometro).
+    """
+    if func is None:
+        return lambda f: medir(f, nombre=nombre, muestreo=muestreo, memoria=memoria, registro=registro)
+    if not 0.0 <= muestreo <= 1.0:
+        raise ValueError("muestreo debe estar entre 0 y 1")
+
+    etiqueta = nombre or func.__qualname__
+    h = registro.histograma(etiqueta)
+    h_mem = registro.histograma(f"{etiqueta}_memoria", "bytes") if memoria else None
+    aleatorio = random.random
+
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def envoltura_async(*args, **kwargs):
+            if muestreo < 1.0 and aleatorio() >= muestreo:
+                return await func(*args, **kwargs)
+            t0 = time.perf_counter_ns()
+            try:
+                if h_mem is None:
+                    return await func(*args, **kwargs)
+                with _pico_memoria(h_mem):
+                    return await func(*args, **kwargs)
+            finally:
+                h.registrar(time.perf_counter_ns() - t0)
+
+        return envoltura_async
+
+    @wraps(func)
+    def envoltura(*args, **kwargs):
+        if muestreo < 1.0 and aleatorio() >= muestreo:
+            return func(*args, **kwargs)
+        t0 = time.perf_counter_ns()
+        try:
+            if h_mem is None:
+                return func(*args, **kwargs)
+            with _pico_memoria(h_mem):
+                return func(*args, **kwargs)
+        finally:
+            h.registrar(time.perf_counter_ns() - t0)
+
+    return envoltura
+
+
+if __name__ == "__main__":
+    import asyncio
+
+    @medir
+    def cpu_bound(n):
+        return sum(i * i for i in range(n))
+
+    @medir(muestreo=0.1)
+    def rapida():
+        return 1
+
+    @medir(memoria=True)
+    def reserva(n):
+        return [0] * n
+
+    @medir
+    async def tarea(n):
+        await asyncio.sleep(n)
+
+    for n in range(1, 500):
+        cpu_bound(n * 10)
+        rapida()
+    reserva(1_000_000)
+    with cronometro("exterior", memoria=True):
+        assert reserva(10) == [0] * 10  # anidada: se ejecuta, pero sin pico propio
+    h_reserva = REGISTRO.histograma("reserva_memoria", "bytes")
+    assert (h_reserva.cuenta, h_reserva.omitidas) == (1, 1)
+    assert REGISTRO.histograma("reserva").cuenta == 2
+    reserva(10)                         # sin anidar vuelve a medir memoria
+    assert h_reserva.cuenta == 2
+    asyncio.run(tarea(0.01))
+    with cronometro("bloque"):
+        time.sleep(0.01)
+
+    # Coste por llamada medida vs sin medir
+    def nada():
+        return None
+    medida = medir(nada, nombre="sobrecarga")
+    t0 = time.perf_counter()
+    for _ in range(100_000):
+        medida()
+    t1 = time.perf_counter()
+    for _ in range(100_000):
+        nada()
+    t2 = time.perf_counter()
+    print(f"  Sobrecarga por llamada: {((t1 - t0) - (t2 - t1)) / 100_000 * 1e6:.2f} µs")
+
+    print(REGISTRO.a_json(indent=2)[:400], "...")
+    print(REGISTRO.a_prometheus())
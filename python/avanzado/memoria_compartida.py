@@ -0,0 +1,198 @@
+# ================================================================
+# MEMORIA COMPARTIDA – arrays grandes sin pickle entre procesos
+# ¿QUÉ?  El array de entrada (y el de salida) viven en un segmento de
+#        multiprocessing.shared_memory; a cada worker solo se le envía
+#        un Descriptor (nombre, forma, dtype, rango) de unos bytes. El
+#        worker se adjunta, calcula su tramo y escribe EN SITIO.
+# ¿PARA QUÉ?  pool.map / ex.map (avanzado.py 27a, extra.py 50)
+#        picklean cada argumento y cada resultado: con 80 MB de floats
+#        la copia y la serialización dominan el tiempo.
+#
+# Benchmark:  python memoria_compartida.py [--n 10000000] [--workers 4]
+# ================================================================
+from __future__ import annotations
+
+import os
+import sys
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Descriptor:
+    """Lo único que viaja al worker: se picklea en unos pocos bytes."""
+    nombre: str
+    forma: Tuple[int, ...]
+    dtype: str
+
+
+# Antes de 3.13 no hay track=False y se sustituye resource_tracker.register,
+# que es global al proceso: quien lo toque (adjuntar o crear) pasa por aquí
+# para que otro hilo no vea el no-op instalado ni pierda su registro.
+_CANDADO_TRACKER = threading.Lock()
+
+
+def _abrir_sin_rastreo(nombre: str) -> shared_memory.SharedMemory:
+    """Adjunta un segmento ajeno sin registrarlo en el resource_tracker.
+
+    Si no, el tracker del worker lo "limpia" (unlink) al salir aunque el
+    dueño sea el padre. En 3.13+ existe SharedMemory(track=False).
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=nombre, track=False)
+    with _CANDADO_TRACKER:
+        registrar = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=nombre)
+        finally:
+            resource_tracker.register = registrar
+
+
+def _crear(nbytes: int) -> shared_memory.SharedMemory:
+    """Crea un segmento propio (SÍ rastreado: el tracker lo limpia si el padre muere)."""
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(create=True, size=nbytes)
+    with _CANDADO_TRACKER:
+        return shared_memory.SharedMemory(create=True, size=nbytes)
+
+
+class ArregloCompartido:
+    """ndarray respaldado por shared_memory. El creador debe llamar a liberar()."""
+
+    def __init__(self, forma: Tuple[int, ...], dtype="float64", nombre: Optional[str] = None):
+        dtype = np.dtype(dtype)
+        nbytes = max(int(np.prod(forma)) * dtype.itemsize, 1)
+        self._propio = nombre is None
+        if self._propio:
+            self._shm = _crear(nbytes)
+        else:
+            self._shm = _abrir_sin_rastreo(nombre)
+        self.array = np.ndarray(forma, dtype=dtype, buffer=self._shm.buf)
+        self.descriptor = Descriptor(self._shm.name, tuple(forma), dtype.str)
+
+    @classmethod
+    def desde(cls, datos: np.ndarray) -> "ArregloCompartido":
+        """Copia `datos` a memoria compartida (única copia del proceso padre)."""
+        compartido = cls(datos.shape, datos.dtype)
+        compartido.array[...] = datos
+        return compartido
+
+    @classmethod
+    def adjuntar(cls, descriptor: Descriptor) -> "ArregloCompartido":
+        return cls(descriptor.forma, descriptor.dtype, nombre=descriptor.nombre)
+
+    def cerrar(self) -> None:
+        self.array = None                 # soltar la vista antes de cerrar el buffer
+        self._shm.close()
+
+    def liberar(self) -> None:
+        """Cierra y destruye el segmento (solo el proceso que lo creó)."""
+        self.cerrar()
+        if self._propio:
+            self._shm.unlink()
+
+    def __enter__(self) -> "ArregloCompartido":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.liberar()
+
+
+def _tramo(fn: Callable[[np.ndarray], np.ndarray], entrada: Descriptor, salida: Descriptor,
+           inicio: int, fin: int) -> int:
+    """Se ejecuta en el worker: lee y escribe en memoria compartida.
+
+    Adjunta y cierra en cada tarea (un mmap, microsegundos) para que los
+    workers de larga vida no retengan segmentos ya liberados por el padre.
+    """
+    origen = ArregloCompartido.adjuntar(entrada)
+    destino = ArregloCompartido.adjuntar(salida)
+    try:
+        destino.array[inicio:fin] = fn(origen.array[inicio:fin])
+    finally:
+        origen.cerrar()
+        destino.cerrar()
+    return fin - inicio
+
+
+def mapear_compartido(
+    fn: Callable[[np.ndarray], np.ndarray],
+    entrada: ArregloCompartido,
+    salida: ArregloCompartido,
+    ejecutor: Executor,
+    partes: Optional[int] = None,
+) -> ArregloCompartido:
+    """salida[i] = fn(entrada[i]) por tramos en `ejecutor`; sin pickle de datos.
+
+    `fn` debe ser vectorial (ndarray → ndarray) y de nivel de módulo.
+    """
+    n = len(entrada.array)
+    if len(salida.array) != n:
+        raise ValueError("entrada y salida deben tener la misma longitud")
+    partes = partes or (getattr(ejecutor, "_max_workers", None) or os.cpu_count() or 1) * 4
+    cortes = np.linspace(0, n, min(partes, max(n, 1)) + 1, dtype=np.int64)
+    futuros = [
+        ejecutor.submit(_tramo, fn, entrada.descriptor, salida.descriptor, int(a), int(b))
+        for a, b in zip(cortes[:-1], cortes[1:]) if b > a
+    ]
+    for f in futuros:
+        f.result()
+    return salida
+
+
+def mapear(fn: Callable[[np.ndarray], np.ndarray], datos: np.ndarray, ejecutor: Executor,
+           dtype=None, partes: Optional[int] = None) -> np.ndarray:
+    """Atajo: copia `datos` a memoria compartida, aplica `fn` y devuelve el resultado."""
+    with ArregloCompartido.desde(datos) as entrada, \
+            ArregloCompartido(datos.shape, dtype or datos.dtype) as salida:
+        mapear_compartido(fn, entrada, salida, ejecutor, partes)
+        return salida.array.copy()
+
+
+# ------------------------------------------------------------
+# Benchmark: pickle vs memoria compartida
+# ------------------------------------------------------------
+def transformar(x: np.ndarray) -> np.ndarray:
+    return np.sqrt(x) * 2.0 + 1.0
+
+
+def benchmark(n: int, workers: int) -> None:
+    import time
+
+    datos = np.random.default_rng(0).random(n)
+    esperado = transformar(datos)
+    partes = workers * 4
+    print(f"  n = {n:,} float64 ({datos.nbytes / 1e6:.0f} MB), {workers} workers, {partes} tramos")
+
+    with ProcessPoolExecutor(workers) as ex:
+        list(ex.map(int, range(workers)))          # workers ya arrancados
+
+        t0 = time.perf_counter()
+        resultado = np.concatenate(list(ex.map(transformar, np.array_split(datos, partes))))
+        t_pickle = time.perf_counter() - t0
+        assert np.array_equal(resultado, esperado)
+
+        with ArregloCompartido.desde(datos) as entrada, ArregloCompartido(datos.shape) as salida:
+            t0 = time.perf_counter()
+            mapear_compartido(transformar, entrada, salida, ex, partes)
+            t_shm = time.perf_counter() - t0
+            assert np.array_equal(salida.array, esperado)
+
+    print(f"  {'pickle (ex.map)':<24} {t_pickle:8.4f}s")
+    print(f"  {'memoria compartida':<24} {t_shm:8.4f}s  (×{t_pickle / t_shm:.1f})")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark de memoria compartida")
+    parser.add_argument("--n", type=int, default=10_000_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    benchmark(args.n, args.workers)
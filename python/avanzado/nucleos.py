@@ -0,0 +1,171 @@
+# ================================================================
+# NÚCLEOS DE CÁLCULO – Σ f(i) sin bucles Python (cpu_bound / heavy)
+# ¿QUÉ?  Un "núcleo" describe f(i) con hasta tres implementaciones:
+#          cerrada → fórmula O(1)   (Σi² = (n-1)·n·(2n-1)/6)
+#          vector  → NumPy por bloques (f sobre un ndarray)
+#          escalar → Python puro (respaldo, siempre disponible)
+#        suma() elige la mejor según lo disponible y el tamaño de n.
+# ¿PARA QUÉ?  cpu_bound (avanzado.py, 27) y heavy (extra.py, 50) suman
+#        i*i en Python puro y luego se reparten en procesos para
+#        esconder el coste; con la fórmula no hace falta ni el pool.
+#
+# Benchmark:  python nucleos.py
+# ================================================================
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Optional, Union
+
+try:
+    import numpy as np
+except ImportError:          # sin NumPy: fórmula cerrada o Python puro
+    np = None
+
+Numero = Union[int, float]
+
+UMBRAL_NUMPY = 5_000      # por debajo, crear arrays cuesta más que el bucle
+BLOQUE = 1 << 16          # elementos por bloque NumPy (memoria constante)
+LIMITE_INT64 = 2**62      # margen sobre 2**63 para el error de la sonda float64
+
+
+@dataclass(frozen=True)
+class Nucleo:
+    escalar: Callable[[int], Numero]
+    vector: Optional[Callable[[Any], Any]] = None       # recibe np.ndarray int64
+    cerrada: Optional[Callable[[int], Numero]] = None   # Σ_{i<n} f(i) directa
+    nombre: str = ""
+
+
+def _suma_python(nucleo: Nucleo, n: int) -> Numero:
+    f = nucleo.escalar
+    return sum(f(i) for i in range(n))
+
+
+def _bloque_exacto(nucleo: Nucleo, inicio: int, fin: int) -> int:
+    """Σ del bloque con enteros Python: vector sobre dtype=object o, si no vale, el escalar."""
+    try:
+        return int(np.asarray(nucleo.vector(np.arange(inicio, fin, dtype=np.int64).astype(object))).sum())
+    except (TypeError, AttributeError):        # p. ej. np.sqrt sobre objetos
+        f = nucleo.escalar
+        return sum(f(i) for i in range(inicio, fin))
+
+
+def _suma_numpy(nucleo: Nucleo, n: int, bloque: int = BLOQUE) -> Numero:
+    total: Numero = 0
+    for inicio in range(0, n, bloque):
+        fin = min(inicio + bloque, n)
+        valores = nucleo.vector(np.arange(inicio, fin, dtype=np.int64))
+        if valores.dtype.kind in "iu":
+            # En int64 cada f(i) puede desbordar en silencio (i**3 con i > 2·10⁶)
+            # y el resultado ya no lo delata: se acota |f| evaluando el bloque
+            # en float64, que no da la vuelta. Si no cabe, enteros Python.
+            try:
+                sonda = nucleo.vector(np.arange(inicio, fin, dtype=np.float64))
+                mayor = float(np.abs(sonda).max()) if len(sonda) else 0.0
+            except TypeError:                    # f con operaciones solo de enteros (&, <<…)
+                mayor = float("inf")
+            if not mayor < LIMITE_INT64:
+                total += _bloque_exacto(nucleo, inicio, fin)
+            elif mayor * len(valores) < LIMITE_INT64:
+                total += int(valores.sum())
+            else:                                # cada f(i) cabe, la Σ del bloque no
+                total += int(valores.sum(dtype=object))
+        else:
+            total += float(valores.sum())
+    return total
+
+
+def metodo_para(nucleo: Nucleo, n: int) -> str:
+    """'cerrada' si existe; 'numpy' si n es grande y hay vector; si no 'python'."""
+    if nucleo.cerrada is not None:
+        return "cerrada"
+    if np is not None and nucleo.vector is not None and n >= UMBRAL_NUMPY:
+        return "numpy"
+    return "python"
+
+
+def suma(nucleo: Nucleo, n: int, metodo: str = "auto") -> Numero:
+    """Σ_{i=0}^{n-1} f(i) con el método indicado o el elegido automáticamente."""
+    if n < 0:
+        raise ValueError("n debe ser >= 0")
+    if metodo == "auto":
+        metodo = metodo_para(nucleo, n)
+    if metodo == "cerrada":
+        if nucleo.cerrada is None:
+            raise ValueError(f"{nucleo.nombre or 'núcleo'} no tiene forma cerrada")
+        return nucleo.cerrada(n)
+    if metodo == "numpy":
+        if np is None or nucleo.vector is None:
+            raise ValueError("método 'numpy' no disponible (falta NumPy o versión vectorial)")
+        return _suma_numpy(nucleo, n)
+    if metodo == "python":
+        return _suma_python(nucleo, n)
+    raise ValueError(f"método desconocido: {metodo!r}")
+
+
+def nucleo(escalar: Callable[[int], Numero], vector: Optional[Callable[[Any], Any]] = None) -> Nucleo:
+    """Núcleo genérico para cualquier f(i); `vector` opcional para NumPy."""
+    return Nucleo(escalar=escalar, vector=vector, nombre=getattr(escalar, "__name__", ""))
+
+
+def _cuadrado(i: int) -> int:
+    return i * i
+
+
+CUADRADOS = Nucleo(
+    escalar=_cuadrado,
+    vector=lambda v: v * v,
+    cerrada=lambda n: (n - 1) * n * (2 * n - 1) // 6 if n > 0 else 0,
+    nombre="cuadrados",
+)
+
+
+def suma_cuadrados(n: int, metodo: str = "auto") -> int:
+    """Mismo resultado que cpu_bound(n) / heavy(n): Σ_{i<n} i²."""
+    return suma(CUADRADOS, n, metodo)
+
+
+# ------------------------------------------------------------
+# Benchmark frente al enfoque actual (pool de procesos)
+# ------------------------------------------------------------
+def cpu_bound(n: int) -> int:
+    # Copia de avanzado.py sección 27 (nivel de módulo: se puede picklear)
+    return sum(i * i for i in range(n))
+
+
+def benchmark() -> None:
+    import concurrent.futures as cf
+    import multiprocessing as mp
+
+    casos = {"avanzado 27a": [10_000, 20_000], "extra 50": [500_000] * 4}
+    for nombre, tareas in casos.items():
+        print(f"\n  --- {nombre}: {tareas} ---")
+        t0 = time.perf_counter()
+        with mp.Pool() as pool:
+            esperado = pool.map(cpu_bound, tareas)
+        base = time.perf_counter() - t0
+        print(f"  {'mp.Pool.map':<22} {base:10.6f}s")
+
+        t0 = time.perf_counter()
+        with cf.ProcessPoolExecutor() as ex:
+            assert list(ex.map(cpu_bound, tareas)) == esperado
+        print(f"  {'ProcessPoolExecutor':<22} {time.perf_counter() - t0:10.6f}s")
+
+        metodos = ["python", "cerrada"] + (["numpy"] if np is not None else [])
+        for metodo in metodos:
+            t0 = time.perf_counter()
+            assert [suma_cuadrados(n, metodo) for n in tareas] == esperado
+            t = time.perf_counter() - t0
+            print(f"  {'núcleo ' + metodo:<22} {t:10.6f}s  (×{base / t:,.0f} vs pool)")
+
+
+if __name__ == "__main__":
+    print("  suma_cuadrados(10) =", suma_cuadrados(10), "| método auto:", metodo_para(CUADRADOS, 10))
+    cubos = nucleo(lambda i: i ** 3, vector=lambda v: v ** 3)
+    print("  Σ i³ (n=100_000):", suma(cubos, 100_000), "| método:", metodo_para(cubos, 100_000))
+    # i³ desborda int64 para i > 2_097_151: debe seguir siendo exacto
+    exacto = (3_000_000 * (3_000_000 - 1) // 2) ** 2
+    assert suma(cubos, 3_000_000) == exacto == suma(cubos, 3_000_000, "python")
+    print(f"  Σ i³ (n=3_000_000) = {exacto:.4e} ✓ exacto aunque i³ no cabe en int64")
+    benchmark()
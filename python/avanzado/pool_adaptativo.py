@@ -0,0 +1,223 @@
+# ================================================================
+# POOL ADAPTATIVO – chunksize automático y procesos "calientes"
+# ¿QUÉ?  Envoltorio de ProcessPoolExecutor que:
+#          1. mide el coste por tarea ejecutando una muestra en local,
+#          2. estima el coste de IPC (pickle ida y vuelta) por elemento,
+#          3. elige chunksize para que cada bloque dure ~objetivo_bloque,
+#          4. ejecuta en el propio proceso si enviar no compensa,
+#          5. reutiliza los mismos workers entre llamadas.
+# ¿PARA QUÉ?  ex.map(heavy, ...) (extra.py, 50) y pool.map(cpu_bound, ...)
+#        (avanzado.py, 27a) usan el chunksize por defecto; con muchas
+#        tareas pequeñas el IPC domina el tiempo total.
+#
+# Benchmark:  python pool_adaptativo.py [--workers 4]
+# ================================================================
+from __future__ import annotations
+
+import math
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+def _nada(_: Any = None) -> None:
+    return None
+
+
+def _tramo(muestra: List[Any]) -> int:
+    """Orden de magnitud del tamaño de entrada (números: valor; colecciones:
+    len; lo demás: bytes en pickle). cpu_bound(50) y cpu_bound(500_000)
+    no pueden compartir estimación de coste."""
+    total = 0.0
+    for x in muestra:
+        if isinstance(x, (int, float)):
+            total += abs(x)
+        elif hasattr(x, "__len__"):
+            total += len(x)
+        else:
+            total += len(pickle.dumps(x))
+    return int(math.log2(total / len(muestra) + 1))
+
+
+@dataclass
+class Decision:
+    modo: str              # "local" o "procesos"
+    chunksize: int
+    coste_tarea: float     # s por tarea (EWMA por función y tramo de tamaño)
+    coste_ipc: float       # s por elemento en pickle ida+vuelta
+    tareas: int
+
+
+class PoolAdaptativo:
+    """Uso:
+        with PoolAdaptativo() as pool:
+            resultados = pool.map(cpu_bound, datos)
+            print(pool.ultima)        # Decision(modo=..., chunksize=...)
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        objetivo_bloque: float = 0.02,
+        muestra: int = 8,
+        suavizado: float = 0.5,
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        # Más procesos que CPUs disponibles no acelera trabajo de CPU: solo añade IPC
+        cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else os.cpu_count() or 1
+        self.paralelismo = min(self.max_workers, cpus)
+        self.objetivo_bloque = objetivo_bloque    # segundos de trabajo por bloque
+        self.muestra = muestra
+        self.suavizado = suavizado                # peso de la medición nueva (EWMA)
+        self.ultima: Optional[Decision] = None
+        self._costes: Dict[Any, float] = {}
+        self._ejecutor: Optional[ProcessPoolExecutor] = None
+        self._latencia = 0.0                      # ida y vuelta de un bloque vacío
+
+    # ------------------------------------------------------------
+    # Ciclo de vida
+    # ------------------------------------------------------------
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._ejecutor is None:
+            # Tantos procesos como CPUs utilizables: los mismos con que se calcula el chunksize
+            self._ejecutor = ProcessPoolExecutor(self.paralelismo)
+            # Calentar: arrancar todos los workers y medir la latencia de IPC
+            list(self._ejecutor.map(_nada, range(self.paralelismo)))
+            t0 = time.perf_counter()
+            self._ejecutor.submit(_nada).result()
+            self._latencia = time.perf_counter() - t0
+        return self._ejecutor
+
+    def cerrar(self) -> None:
+        if self._ejecutor is not None:
+            self._ejecutor.shutdown()
+            self._ejecutor = None
+
+    def __enter__(self) -> "PoolAdaptativo":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+    # ------------------------------------------------------------
+    # Medición
+    # ------------------------------------------------------------
+    def _medir(self, fn: Callable, datos: List[Any]) -> tuple[List[Any], float, float]:
+        """Ejecuta una muestra EN LOCAL (sus resultados se reutilizan) y mide.
+
+        Se detiene tras `muestra` elementos o al gastar ~1/4 de objetivo_bloque,
+        para no quedarse con todo el trabajo cuando cada tarea es pesada.
+        """
+        presupuesto = self.objetivo_bloque / 4
+        resultados: List[Any] = []
+        t0 = time.perf_counter()
+        for x in datos[: self.muestra]:
+            resultados.append(fn(x))
+            if time.perf_counter() - t0 >= presupuesto:
+                break
+        coste = (time.perf_counter() - t0) / len(resultados)
+        # Los bloques viajan como listas: medir así, no elemento a elemento
+        muestra = datos[: len(resultados)]
+        t0 = time.perf_counter()
+        pickle.loads(pickle.dumps(muestra, protocol=pickle.HIGHEST_PROTOCOL))
+        pickle.loads(pickle.dumps(resultados, protocol=pickle.HIGHEST_PROTOCOL))
+        ipc = (time.perf_counter() - t0) / len(muestra)
+        return resultados, coste, ipc
+
+    @staticmethod
+    def _enviable(fn: Callable) -> bool:
+        try:
+            pickle.dumps(fn)
+            return True
+        except (pickle.PicklingError, AttributeError, TypeError):
+            return False          # lambdas, funciones locales…
+
+    # ------------------------------------------------------------
+    # map
+    # ------------------------------------------------------------
+    def map(self, fn: Callable[[Any], Any], datos: Iterable[Any]) -> List[Any]:
+        datos = list(datos)
+        if not datos:
+            return []
+        hechos, coste, ipc = self._medir(fn, datos)
+        resto = datos[len(hechos):]
+
+        clave = (getattr(fn, "__qualname__", fn), _tramo(datos[: len(hechos)]))
+        anterior = self._costes.get(clave)
+        if anterior is not None:
+            coste = self.suavizado * coste + (1 - self.suavizado) * anterior
+        self._costes[clave] = coste
+
+        trabajo = coste * len(resto)
+        local = (
+            not resto
+            or self.paralelismo < 2
+            or coste <= ipc                                   # enviar cuesta más que calcular
+            or trabajo <= max(self._latencia, 1e-3) * self.paralelismo
+            or not self._enviable(fn)
+        )
+        if local:
+            self.ultima = Decision("local", 0, coste, ipc, len(datos))
+            return hechos + [fn(x) for x in resto]
+
+        pool = self._pool()
+        por_bloque = math.ceil(self.objetivo_bloque / max(coste + ipc, 1e-9))
+        # al menos ~4 bloques por worker para equilibrar la carga
+        tope = max(1, math.ceil(len(resto) / (self.paralelismo * 4)))
+        chunksize = max(1, min(por_bloque, tope))
+        self.ultima = Decision("procesos", chunksize, coste, ipc, len(datos))
+        return hechos + list(pool.map(fn, resto, chunksize=chunksize))
+
+
+# ------------------------------------------------------------
+# Benchmark
+# ------------------------------------------------------------
+def cpu_bound(n: int) -> int:
+    # Copia de avanzado.py sección 27 (nivel de módulo: se puede picklear)
+    return sum(i * i for i in range(n))
+
+
+def benchmark(workers: int) -> None:
+    import gc
+    import multiprocessing as mp
+
+    casos = {
+        "100k tareas diminutas": [50] * 100_000,
+        "2k tareas pequeñas": [2_000] * 2_000,
+        "8 tareas grandes": [500_000] * 8,
+    }
+    with PoolAdaptativo(workers) as adaptativo, mp.Pool(workers) as pool, \
+            ProcessPoolExecutor(workers) as ex:
+        adaptativo.map(cpu_bound, [2_000] * 64)   # calienta workers y costes
+        print(f"  {workers} workers pedidos, {adaptativo.paralelismo} CPU(s) utilizables")
+        for nombre, tareas in casos.items():
+            print(f"\n  --- {nombre} ---")
+            tiempos = {}
+            # El ejecutor sin chunksize, el último: deja 100k futures que recoger
+            for etiqueta, ejecutar in (
+                ("mp.Pool.map", lambda: pool.map(cpu_bound, tareas)),
+                ("PoolAdaptativo", lambda: adaptativo.map(cpu_bound, tareas)),
+                ("ProcessPoolExecutor", lambda: list(ex.map(cpu_bound, tareas))),
+            ):
+                repeticiones = 1 if etiqueta == "ProcessPoolExecutor" and len(tareas) > 10_000 else 3
+                mejor = float("inf")
+                for _ in range(repeticiones):       # mejor de 3 (el ejecutor sin chunksize es muy lento)
+                    gc.collect()
+                    t0 = time.perf_counter()
+                    ejecutar()
+                    mejor = min(mejor, time.perf_counter() - t0)
+                tiempos[etiqueta] = mejor
+                print(f"  {etiqueta:<22} {mejor:9.4f}s")
+            print(f"  decisión: {adaptativo.ultima}  "
+                  f"(×{tiempos['mp.Pool.map'] / tiempos['PoolAdaptativo']:.2f} vs mp.Pool)")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark del pool adaptativo")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    benchmark(parser.parse_args().workers)
@@ -0,0 +1,274 @@
+# ================================================================
+# REGISTRO DE CLASES – nombre, alias, base y campo en O(1)
+# ¿QUÉ?  Un Mapping nombre → clase (como el dict de AutoRegistro,
+#        avanzado.py 21) que además mantiene, al registrar cada clase:
+#          · alias y nombre calificado (modulo.Clase) → clase
+#          · base registrada → subclases registradas (transitivas)
+#          · clase → sus bases registradas en orden MRO (caché)
+#          · campo (anotaciones, __slots__, descriptores) → clases
+#        Consultar es leer un dict; el trabajo se hace una vez al crear
+#        la clase, bajo un lock (se pueden crear clases desde hilos).
+# ¿PARA QUÉ?  Con miles de modelos/plugins, "dame las subclases de X" o
+#        "quién tiene el campo precio" recorrían el registro entero.
+#
+# Benchmark:  python registro_clases.py [--clases 5000]
+# ================================================================
+from __future__ import annotations
+
+import threading
+from collections.abc import Mapping
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Tuple
+
+
+def campos_de(cls: type) -> FrozenSet[str]:
+    """Anotaciones, __slots__ y descriptores de datos de toda la jerarquía."""
+    campos = set()
+    for base in cls.__mro__:
+        if base is object:
+            continue
+        propio = vars(base)
+        campos.update(propio.get("__annotations__", {}))
+        slots = propio.get("__slots__", ())
+        campos.update((slots,) if isinstance(slots, str) else slots)
+        campos.update(nombre for nombre, valor in propio.items()
+                      if not nombre.startswith("__") and hasattr(type(valor), "__set__"))
+    campos.discard("__weakref__")
+    campos.discard("__dict__")
+    return frozenset(campos)
+
+
+class RegistroClases(Mapping):
+    """registro["usuario"] / registro["user"] / registro["app.modelos.Usuario"]
+    registro.subclases(BaseModel)   → (Usuario, Admin, …) en orden de registro
+    registro.mro(Admin)             → (Usuario, BaseModel): bases registradas
+    registro.con_campo("precio")    → clases que declaran ese campo
+    repr(registro)                  → igual que el dict nombre → clase
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._por_nombre: Dict[str, type] = {}        # nombre en minúsculas (lo que se itera)
+        self._alias: Dict[str, type] = {}             # alias y nombre calificado, en minúsculas
+        self._subclases: Dict[type, List[type]] = {}
+        self._mro: Dict[type, Tuple[type, ...]] = {}
+        self._campos: Dict[type, FrozenSet[str]] = {}
+        self._por_campo: Dict[str, List[type]] = {}
+        self._nombres: Dict[type, List[str]] = {}     # clase → [calificado, *alias] (para darla de baja)
+        # instantáneas inmutables de las listas; se invalidan al registrar
+        self._tuplas: Dict[object, Tuple[type, ...]] = {}
+
+    # --- alta -----------------------------------------------------
+    def registrar(self, cls: type, alias: Iterable[str] = ()) -> type:
+        """Indexa `cls`. Un nombre corto repetido apunta a la clase más reciente
+        (como el dict); la anterior sigue por su nombre calificado y en los
+        índices. Solo si coincide el nombre calificado (recarga de un plugin)
+        la sustituida sale de todos los índices. Registrar dos veces la misma
+        clase solo añade los alias nuevos."""
+        alias = [a.lower() for a in ((alias,) if isinstance(alias, str) else alias)]
+        campos = campos_de(cls)
+        calificado = f"{cls.__module__}.{cls.__qualname__}".lower()
+        with self._lock:
+            if cls in self._mro:
+                for nombre in alias:
+                    self._alias[nombre] = cls
+                self._nombres[cls].extend(alias)
+                return cls
+            anterior = self._alias.get(calificado)
+            if anterior is not None and self._nombres[anterior][0] == calificado:
+                self._quitar(anterior)
+            bases = tuple(b for b in cls.__mro__[1:] if b in self._mro)
+            self._mro[cls] = bases
+            self._campos[cls] = campos
+            self._subclases.setdefault(cls, [])
+            for base in bases:
+                self._subclases[base].append(cls)
+                self._tuplas.pop(base, None)
+            for campo in campos:
+                self._por_campo.setdefault(campo, []).append(cls)
+                self._tuplas.pop(campo, None)
+            self._nombres[cls] = [calificado, *alias]
+            for nombre in self._nombres[cls]:
+                self._alias[nombre] = cls
+            self._por_nombre[cls.__name__.lower()] = cls
+        return cls
+
+    def _quitar(self, cls: type) -> None:
+        """Saca `cls` de todos los índices (con el lock tomado)."""
+        for base in self._mro.pop(cls):
+            self._subclases[base].remove(cls)
+            self._tuplas.pop(base, None)
+        for campo in self._campos.pop(cls):
+            clases = self._por_campo[campo]
+            clases.remove(cls)
+            if not clases:
+                del self._por_campo[campo]
+            self._tuplas.pop(campo, None)
+        for sub in self._subclases.pop(cls):      # sus subclases dejan de verla como base
+            self._mro[sub] = tuple(b for b in self._mro[sub] if b is not cls)
+        self._tuplas.pop(cls, None)
+        for nombre in self._nombres.pop(cls):
+            if self._alias.get(nombre) is cls:        # un alias pudo repuntarse a otra clase
+                del self._alias[nombre]
+        if self._por_nombre.get(cls.__name__.lower()) is cls:
+            del self._por_nombre[cls.__name__.lower()]
+
+    def alias(self, nombre: str, cls: type) -> None:
+        with self._lock:
+            if cls not in self._mro:
+                raise KeyError(f"{cls.__name__} no está registrada")
+            self._alias[nombre.lower()] = cls
+            self._nombres[cls].append(nombre.lower())
+
+    # --- consultas -------------------------------------------------
+    def __getitem__(self, nombre: str) -> type:
+        clave = nombre.lower()
+        cls = self._por_nombre.get(clave)
+        if cls is None:
+            cls = self._alias.get(clave)
+        if cls is None:
+            raise KeyError(nombre)
+        return cls
+
+    def __contains__(self, nombre: object) -> bool:
+        return isinstance(nombre, str) and (nombre.lower() in self._por_nombre or nombre.lower() in self._alias)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._por_nombre)
+
+    def __len__(self) -> int:
+        return len(self._por_nombre)
+
+    def __repr__(self) -> str:
+        return repr(self._por_nombre)
+
+    def _instantanea(self, clave: object, indice: Dict) -> Tuple[type, ...]:
+        tupla = self._tuplas.get(clave)
+        if tupla is None:                             # primera lectura tras registrar
+            with self._lock:
+                clases = indice.get(clave)
+                if clases is None:                    # los fallos no se guardan: crecería sin tope
+                    return ()
+                tupla = self._tuplas[clave] = tuple(clases)
+        return tupla
+
+    def subclases(self, base: type) -> Tuple[type, ...]:
+        """Subclases registradas (directas o no) de una clase registrada."""
+        if base not in self._subclases:
+            raise KeyError(f"{base.__name__} no está registrada")
+        return self._instantanea(base, self._subclases)
+
+    def mro(self, cls: type) -> Tuple[type, ...]:
+        return self._mro[cls]
+
+    def campos(self, cls: type) -> FrozenSet[str]:
+        return self._campos[cls]
+
+    def con_campo(self, campo: str) -> Tuple[type, ...]:
+        return self._instantanea(campo, self._por_campo)
+
+    def con_campos(self, *campos: str) -> List[type]:
+        """Clases que tienen TODOS los campos (parte del índice del más raro)."""
+        if not campos:
+            return list(self._mro)
+        raro = min(campos, key=lambda c: len(self.con_campo(c)))
+        necesarios = frozenset(campos)
+        return [cls for cls in self.con_campo(raro) if necesarios <= self._campos[cls]]
+
+
+# ------------------------------------------------------------
+# Benchmark: búsquedas a mano sobre el dict frente a los índices
+# ------------------------------------------------------------
+def benchmark(n_clases: int) -> None:
+    import time
+
+    registro = RegistroClases()
+    plano: Dict[str, type] = {}           # el registro original
+
+    class Meta(type):
+        def __new__(mcls, name, bases, ns):
+            cls = super().__new__(mcls, name, bases, ns)
+            plano[name.lower()] = cls
+            return registro.registrar(cls, alias=(f"alias_{name}",))
+
+    class Base(metaclass=Meta):
+        id: int
+
+    familias = [Meta(f"Familia{f}", (Base,), {"__annotations__": {f"campo{f}": int}}) for f in range(10)]
+    t0 = time.perf_counter()
+    for i in range(n_clases):
+        Meta(f"Modelo{i}", (familias[i % 10],), {"__annotations__": {"nombre": str, f"extra{i % 100}": int}})
+    t_alta = time.perf_counter() - t0
+    print(f"  {len(registro):,} clases registradas en {t_alta:.3f}s ({t_alta / n_clases * 1e6:.1f} µs/clase)")
+
+    def medir(funcion, repeticiones: int = 200) -> float:
+        t0 = time.perf_counter()
+        for _ in range(repeticiones):
+            funcion()
+        return (time.perf_counter() - t0) / repeticiones
+
+    objetivo = familias[3]
+    consultas = (
+        ("por nombre", lambda: plano["modelo777"], lambda: registro["modelo777"]),
+        ("por alias", lambda: next(c for c in plano.values() if f"alias_{c.__name__}" == "alias_Modelo777"),
+         lambda: registro["alias_Modelo777"]),
+        ("subclases de base", lambda: [c for c in plano.values() if c is not objetivo and issubclass(c, objetivo)],
+         lambda: registro.subclases(objetivo)),
+        ("por campo", lambda: [c for c in plano.values() if "extra7" in campos_de(c)],
+         lambda: registro.con_campo("extra7")),
+    )
+    for etiqueta, a_mano, indexado in consultas:
+        esperado, obtenido = a_mano(), indexado()
+        if isinstance(obtenido, tuple):
+            assert list(esperado) == list(obtenido), etiqueta
+        else:
+            assert esperado is obtenido, etiqueta
+        t_mano, t_indice = medir(a_mano, 20), medir(indexado)
+        print(f"  {etiqueta:<18} a mano {t_mano * 1e6:10.1f} µs   índice {t_indice * 1e6:6.2f} µs"
+              f"   (×{t_mano / t_indice:,.0f})")
+
+    # Clases creadas a la vez desde 16 hilos: ninguna se pierde
+    antes = len(registro)
+
+    def crear(h: int) -> None:
+        for i in range(500):
+            Meta(f"Hilo{h}_{i}", (familias[i % 10],), {})
+
+    hilos = [threading.Thread(target=crear, args=(h,)) for h in range(16)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert len(registro) == antes + 16 * 500
+    assert len(registro.subclases(Base)) == len(registro) - 1
+    print("  ✓ 16 hilos × 500 clases: índices completos")
+
+    # Registrar otra vez la misma clase o recargar una con el mismo nombre
+    hijas = len(registro.subclases(objetivo))
+    for _ in range(3):
+        registro.registrar(familias[3])
+        registro.registrar(registro["modelo3"])
+    assert len(registro.subclases(objetivo)) == hijas
+    vieja = registro["modelo3"]
+    nueva = Meta("Modelo3", (objetivo,), {"__annotations__": {"nombre": str}})
+    assert registro["modelo3"] is nueva and "alias_modelo3" in registro
+    assert vieja not in registro.subclases(objetivo) and vieja not in registro.con_campo("extra3")
+    assert registro.subclases(objetivo).count(nueva) == 1 and len(registro.subclases(objetivo)) == hijas
+    print("  ✓ re-registrar no duplica; una clase recargada sustituye a la anterior en todos los índices")
+
+    # Mismo nombre corto en otro módulo: NO es una recarga, conviven
+    ventas = Meta("Usuario", (objetivo,), {"__module__": "app.ventas"})
+    auth = Meta("Usuario", (objetivo,), {"__module__": "app.auth"})
+    assert registro["usuario"] is auth and registro["app.ventas.usuario"] is ventas
+    assert ventas in registro.subclases(objetivo) and auth in registro.subclases(Base)
+    for campo in ("no_existe_1", "no_existe_2"):
+        assert registro.con_campo(campo) == ()
+    assert "no_existe_1" not in registro._tuplas
+    print("  ✓ app.ventas.Usuario y app.auth.Usuario conviven; consultar campos desconocidos no llena la caché")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Registro de clases indexado")
+    parser.add_argument("--clases", type=int, default=5000)
+    benchmark(parser.parse_args().clases)
@@ -0,0 +1,457 @@
+# ================================================================
+# SERIALIZADORES – registro extensible sobre singledispatch
+# ¿QUÉ?  Serializador = función genérica con la misma API que
+#        singledispatch (.register, .dispatch, .registry) que convierte
+#        tipos propios a datos nativos y delega en un FORMATO:
+#          "json"    → json.JSONEncoder reutilizado (C, sin kwargs por llamada)
+#          "msgpack" → binario compacto (msgpack si está instalado; si no,
+#                      implementación stdlib compatible byte a byte)
+#        Cachea el conversor por tipo, codifica iterables grandes en
+#        trozos (flujo/volcar) y en lote (serializar_muchos).
+# ¿PARA QUÉ?  serializar (avanzado.py, 24) llama a json.dumps en cada
+#        objeto y, para dicts, construye un encoder nuevo y ordena claves.
+#
+# Benchmark:  python serializadores.py [--n 100000]
+# ================================================================
+from __future__ import annotations
+
+import json
+import struct
+from dataclasses import dataclass, fields, is_dataclass
+from functools import singledispatch
+from typing import IO, Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+try:
+    import msgpack
+except ImportError:          # sin msgpack: empaquetador propio (más lento, mismo formato)
+    msgpack = None
+
+Codificado = Union[str, bytes]
+
+
+# ------------------------------------------------------------
+# msgpack en Python puro (subconjunto: nil, bool, int, float, str,
+# bin, array, map). Produce los mismos bytes que msgpack.packb(…,
+# use_bin_type=True) para estos tipos.
+# ------------------------------------------------------------
+_B = struct.Struct(">B").pack
+_H = struct.Struct(">H").pack
+_I = struct.Struct(">I").pack
+_D = struct.Struct(">d").pack
+
+
+def _cabecera(buf: bytearray, n: int, fijo: int, limite_fijo: int, c8: int, c16: int, c32: int) -> None:
+    if n < limite_fijo:
+        buf.append(fijo | n)
+    elif c8 and n < 0x100:
+        buf += bytes((c8, n))
+    elif n < 0x10000:
+        buf += _B(c16) + _H(n)
+    else:
+        buf += _B(c32) + _I(n)
+
+
+def _entero(buf: bytearray, n: int) -> None:
+    if 0 <= n < 0x80:
+        buf.append(n)
+    elif -0x20 <= n < 0:
+        buf.append(n & 0xFF)
+    elif n >= 0:
+        for codigo, formato in ((0xCC, ">B"), (0xCD, ">H"), (0xCE, ">I"), (0xCF, ">Q")):
+            try:
+                buf += _B(codigo) + struct.pack(formato, n)
+                return
+            except struct.error:
+                continue
+        raise OverflowError("entero demasiado grande para msgpack")
+    else:
+        for codigo, formato in ((0xD0, ">b"), (0xD1, ">h"), (0xD2, ">i"), (0xD3, ">q")):
+            try:
+                buf += _B(codigo) + struct.pack(formato, n)
+                return
+            except struct.error:
+                continue
+        raise OverflowError("entero demasiado pequeño para msgpack")
+
+
+# Bases nativas para subclases (NamedTuple, OrderedDict, IntEnum…), en el
+# orden de msgpack: bool antes que int.
+_NATIVOS = (bool, int, float, str, bytes, bytearray, memoryview, list, tuple, dict)
+
+
+class _Empaquetador:
+    """Empaquetador msgpack stdlib con tabla de codificadores por tipo exacto.
+
+    Una subclase de un tipo nativo se codifica como su base (igual que
+    msgpack y json) y queda en la tabla; `default` solo ve tipos ajenos.
+    """
+
+    def __init__(self, default: Callable[[Any], Any], ordenar_claves: bool = False):
+        self.default = default
+        self.ordenar_claves = ordenar_claves
+        self._tabla: Dict[type, Callable[[bytearray, Any], None]] = {
+            type(None): lambda buf, _: buf.append(0xC0),
+            bool: lambda buf, b: buf.append(0xC3 if b else 0xC2),
+            int: _entero,
+            float: lambda buf, x: buf.extend(b"\xcb" + _D(x)),
+            str: self._str,
+            bytes: self._bin,
+            bytearray: self._bin,
+            memoryview: self._bin,
+            list: self._lista,
+            tuple: self._lista,
+            dict: self._mapa,
+        }
+        self._ajenos: set = set()           # tipos sin base nativa: directos a default
+
+    def empaquetar(self, obj: Any) -> bytes:
+        buf = bytearray()
+        self._escribir(buf, obj)
+        return bytes(buf)
+
+    def _codificador_de(self, tipo: type) -> Optional[Callable[[bytearray, Any], None]]:
+        codificador = self._tabla.get(tipo)
+        if codificador is None and tipo not in self._ajenos:
+            base = next((b for b in _NATIVOS if issubclass(tipo, b)), None)
+            if base is None:
+                self._ajenos.add(tipo)
+            else:
+                codificador = self._tabla[tipo] = self._tabla[base]
+        return codificador
+
+    def _escribir(self, buf: bytearray, obj: Any) -> None:
+        codificador = self._tabla.get(type(obj)) or self._codificador_de(type(obj))
+        if codificador is None:
+            nativo = self.default(obj)
+            codificador = self._codificador_de(type(nativo))
+            if codificador is None:
+                raise TypeError(f"{type(obj).__name__} no es serializable en msgpack")
+            obj = nativo
+        codificador(buf, obj)
+
+    @staticmethod
+    def _str(buf: bytearray, s: str) -> None:
+        datos = s.encode("utf-8")
+        _cabecera(buf, len(datos), 0xA0, 32, 0xD9, 0xDA, 0xDB)
+        buf += datos
+
+    @staticmethod
+    def _bin(buf: bytearray, b) -> None:
+        datos = bytes(b)
+        _cabecera(buf, len(datos), 0, 0, 0xC4, 0xC5, 0xC6)
+        buf += datos
+
+    def _lista(self, buf: bytearray, xs) -> None:
+        _cabecera(buf, len(xs), 0x90, 16, 0, 0xDC, 0xDD)
+        for x in xs:
+            self._escribir(buf, x)
+
+    def _mapa(self, buf: bytearray, d: dict) -> None:
+        _cabecera(buf, len(d), 0x80, 16, 0, 0xDE, 0xDF)
+        for k, v in (sorted(d.items()) if self.ordenar_claves else d.items()):
+            self._escribir(buf, k)
+            self._escribir(buf, v)
+
+
+def _leer(datos: memoryview, i: int) -> tuple:
+    c = datos[i]
+    i += 1
+    if c < 0x80:
+        return c, i
+    if c >= 0xE0:
+        return c - 0x100, i
+    if 0xA0 <= c <= 0xBF:
+        n = c & 0x1F
+        return str(datos[i:i + n], "utf-8"), i + n
+    if 0x90 <= c <= 0x9F:
+        return _leer_lista(datos, i, c & 0x0F)
+    if 0x80 <= c <= 0x8F:
+        return _leer_mapa(datos, i, c & 0x0F)
+    if c == 0xC0:
+        return None, i
+    if c in (0xC2, 0xC3):
+        return c == 0xC3, i
+    if c == 0xCB:
+        return struct.unpack_from(">d", datos, i)[0], i + 8
+    if c == 0xCA:
+        return struct.unpack_from(">f", datos, i)[0], i + 4
+    enteros = {0xCC: ">B", 0xCD: ">H", 0xCE: ">I", 0xCF: ">Q",
+               0xD0: ">b", 0xD1: ">h", 0xD2: ">i", 0xD3: ">q"}
+    if c in enteros:
+        formato = enteros[c]
+        return struct.unpack_from(formato, datos, i)[0], i + struct.calcsize(formato)
+    longitudes = {0xD9: ">B", 0xDA: ">H", 0xDB: ">I", 0xC4: ">B", 0xC5: ">H", 0xC6: ">I",
+                  0xDC: ">H", 0xDD: ">I", 0xDE: ">H", 0xDF: ">I"}
+    if c in longitudes:
+        formato = longitudes[c]
+        n = struct.unpack_from(formato, datos, i)[0]
+        i += struct.calcsize(formato)
+        if c in (0xD9, 0xDA, 0xDB):
+            return str(datos[i:i + n], "utf-8"), i + n
+        if c in (0xC4, 0xC5, 0xC6):
+            return bytes(datos[i:i + n]), i + n
+        if c in (0xDC, 0xDD):
+            return _leer_lista(datos, i, n)
+        return _leer_mapa(datos, i, n)
+    raise ValueError(f"byte de tipo msgpack no soportado: 0x{c:02x}")
+
+
+def _leer_lista(datos: memoryview, i: int, n: int) -> tuple:
+    lista = []
+    for _ in range(n):
+        x, i = _leer(datos, i)
+        lista.append(x)
+    return lista, i
+
+
+def _leer_mapa(datos: memoryview, i: int, n: int) -> tuple:
+    mapa = {}
+    for _ in range(n):
+        k, i = _leer(datos, i)
+        mapa[k], i = _leer(datos, i)
+    return mapa, i
+
+
+def desempaquetar(datos: bytes) -> Any:
+    """Un objeto msgpack (usa msgpack.unpackb si está instalado)."""
+    if msgpack is not None:
+        return msgpack.unpackb(datos, raw=False)
+    obj, fin = _leer(memoryview(datos), 0)
+    if fin != len(datos):
+        raise ValueError("datos sobrantes tras el objeto msgpack")
+    return obj
+
+
+def desempaquetar_flujo(datos: bytes) -> Iterator[Any]:
+    """Objetos msgpack concatenados (lo que produce flujo(..., 'msgpack'))."""
+    if msgpack is not None:
+        desempaquetador = msgpack.Unpacker(raw=False)
+        desempaquetador.feed(datos)
+        yield from desempaquetador
+        return
+    vista, i = memoryview(datos), 0
+    while i < len(vista):
+        obj, i = _leer(vista, i)
+        yield obj
+
+
+# ------------------------------------------------------------
+# Formatos (registro extensible)
+# ------------------------------------------------------------
+@dataclass(frozen=True)
+class Formato:
+    """`crear(default, ordenar_claves)` → función obj → str|bytes."""
+    nombre: str
+    crear: Callable[[Callable[[Any], Any], bool], Callable[[Any], Codificado]]
+    decodificar: Callable[[Codificado], Any]
+    binario: bool
+    # Cómo unir elementos de un flujo: (inicio, separador, fin)
+    envoltura: tuple = ("", "", "")
+
+
+def _crear_json(default: Callable[[Any], Any], ordenar_claves: bool) -> Callable[[Any], str]:
+    # Un único JSONEncoder reutilizado: json.dumps con kwargs crea uno por llamada
+    return json.JSONEncoder(default=default, sort_keys=ordenar_claves).encode
+
+
+def _crear_msgpack(default: Callable[[Any], Any], ordenar_claves: bool) -> Callable[[Any], bytes]:
+    if msgpack is not None and not ordenar_claves:
+        return msgpack.Packer(default=default, use_bin_type=True).pack
+    return _Empaquetador(default, ordenar_claves).empaquetar      # msgpack no sabe ordenar
+
+
+FORMATOS: Dict[str, Formato] = {}
+
+
+def registrar_formato(formato: Formato) -> Formato:
+    FORMATOS[formato.nombre] = formato
+    return formato
+
+
+registrar_formato(Formato("json", _crear_json, json.loads, binario=False, envoltura=("[", ",", "]")))
+registrar_formato(Formato("msgpack", _crear_msgpack, desempaquetar, binario=True, envoltura=(b"", b"", b"")))
+
+
+# ------------------------------------------------------------
+# Serializador
+# ------------------------------------------------------------
+def _por_defecto(obj: Any) -> Any:
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+class Serializador:
+    """Uso (misma API que singledispatch):
+
+        serializar = Serializador("json")
+
+        @serializar.register
+        def _(obj: set):
+            return sorted(obj)          # devuelve datos NATIVOS, no texto
+
+        serializar({1, 2})                       # '[1, 2]'
+        serializar.serializar_muchos(objetos)    # lista de textos
+        for trozo in serializar.flujo(objetos):  # sin construir todo el texto
+            archivo.write(trozo)
+
+    Los conversores registrados se aplican a tipos no nativos del formato
+    (y al objeto raíz); dict/list/str/int/float/bool/None van directos.
+    """
+
+    def __init__(self, formato: str = "json", ordenar_claves: bool = False):
+        if formato not in FORMATOS:
+            raise ValueError(f"formato desconocido: {formato!r} (disponibles: {sorted(FORMATOS)})")
+        self.formato = FORMATOS[formato]
+        self.ordenar_claves = ordenar_claves
+        self._generico = singledispatch(_por_defecto)
+        self._generico.register(set, list)
+        self._generico.register(frozenset, list)
+        self._conversores: Dict[type, Callable[[Any], Any]] = {}
+        self._raiz: Dict[type, bool] = {}
+        self._codificar = self.formato.crear(self._a_nativo, ordenar_claves)
+
+    # --- API de singledispatch ---------------------------------
+    def register(self, tipo, func=None):
+        resultado = self._generico.register(tipo, func)
+        self._conversores.clear()         # invalidar la caché por tipo
+        self._raiz.clear()
+        return resultado
+
+    def dispatch(self, tipo: type) -> Callable[[Any], Any]:
+        conversor = self._conversores.get(tipo)
+        if conversor is None:
+            conversor = self._conversores[tipo] = self._generico.dispatch(tipo)
+        return conversor
+
+    @property
+    def registry(self):
+        return self._generico.registry
+
+    # --- Codificación -------------------------------------------
+    def _a_nativo(self, obj: Any) -> Any:
+        return self.dispatch(type(obj))(obj)
+
+    def _convierte_raiz(self, tipo: type) -> bool:
+        """¿Se registró un conversor para `tipo` o una de sus bases?
+
+        Los tipos nativos del formato solo llegan al hook `default` si no
+        están en la raíz, así que aquí se convierte el objeto raíz a mano.
+        """
+        propio = self._raiz.get(tipo)
+        if propio is None:
+            registro = self._generico.registry
+            propio = self._raiz[tipo] = any(base in registro for base in tipo.__mro__[:-1])
+        return propio
+
+    def __call__(self, obj: Any) -> Codificado:
+        if self._convierte_raiz(type(obj)):
+            obj = self._a_nativo(obj)
+        return self._codificar(obj)
+
+    def serializar_muchos(self, objetos: Iterable[Any]) -> List[Codificado]:
+        codificar, raiz, convertir = self._codificar, self._convierte_raiz, self._a_nativo
+        return [codificar(convertir(o) if raiz(type(o)) else o) for o in objetos]
+
+    def flujo(self, objetos: Iterable[Any], bloque: int = 1024) -> Iterator[Codificado]:
+        """Trozos de la codificación de `objetos` sin materializar el total.
+
+        JSON → un array válido ("[a,b,...]"); msgpack → objetos concatenados
+        (léelos con desempaquetar_flujo o msgpack.Unpacker).
+        """
+        inicio, separador, fin = self.formato.envoltura
+        vacio = b"" if self.formato.binario else ""
+        yield inicio
+        primero = True
+        trozo: List[Codificado] = []
+        for obj in objetos:
+            trozo.append(self(obj))
+            if len(trozo) >= bloque:
+                yield (vacio if primero else separador) + separador.join(trozo)
+                primero, trozo = False, []
+        if trozo:
+            yield (vacio if primero else separador) + separador.join(trozo)
+        yield fin
+
+    def volcar(self, objetos: Iterable[Any], destino: IO, bloque: int = 1024) -> int:
+        """Escribe flujo(objetos) en un archivo abierto; devuelve bytes/caracteres escritos."""
+        total = 0
+        for trozo in self.flujo(objetos, bloque):
+            destino.write(trozo)
+            total += len(trozo)
+        return total
+
+    def deserializar(self, datos: Codificado) -> Any:
+        return self.formato.decodificar(datos)
+
+
+# ------------------------------------------------------------
+# Benchmark frente a serializar de la sección 24
+# ------------------------------------------------------------
+def benchmark(n: int) -> None:
+    import io
+    import time
+
+    from avanzado import serializar as serializar_24
+
+    datos = [{"id": i, "nombre": f"user{i}", "tags": {"admin"} if i % 3 == 0 else None,
+              "puntos": i * 1.5, "activo": i % 2 == 0} for i in range(n)]
+    json_ = Serializador("json")
+    binario = Serializador("msgpack")
+    # Forma nativa (sin sets) para comparar codificadores en igualdad de condiciones
+    nativos = [dict(d, tags=sorted(d["tags"]) if d["tags"] else None) for d in datos]
+
+    def medir(etiqueta: str, funcion: Callable[[], Any], base: float = 0.0) -> float:
+        t = float("inf")
+        for _ in range(3):                         # mejor de 3: menos ruido del GC
+            t0 = time.perf_counter()
+            resultado = funcion()
+            t = min(t, time.perf_counter() - t0)
+        extra = f"  (×{base / t:.1f})" if base else ""
+        tamano = sum(map(len, resultado)) if isinstance(resultado, list) else resultado
+        print(f"  {etiqueta:<40} {t:8.4f}s  {tamano / 1e6:7.2f} MB{extra}")
+        return t
+
+    print(f"  {n:,} registros · msgpack {'nativo' if msgpack else 'stdlib'}")
+    base = medir("serializar (sección 24, json.dumps)", lambda: [serializar_24(d) for d in nativos])
+    medir("Serializador json, uno a uno", lambda: [json_(d) for d in datos], base)
+    medir("Serializador json, serializar_muchos", lambda: json_.serializar_muchos(datos), base)
+    medir("Serializador json, flujo → StringIO", lambda: json_.volcar(datos, io.StringIO()), base)
+    medir("Serializador msgpack, serializar_muchos", lambda: binario.serializar_muchos(datos), base)
+    medir("Serializador msgpack, flujo → BytesIO", lambda: binario.volcar(datos, io.BytesIO()), base)
+
+    # Ida y vuelta
+    assert json_.deserializar(json_(datos[3])) == nativos[3]
+    assert binario.deserializar(binario(datos[3])) == nativos[3]
+    assert json.loads("".join(json_.flujo(datos[:2500], bloque=1000))) == nativos[:2500]
+    assert list(desempaquetar_flujo(b"".join(binario.flujo(datos[:2500])))) == nativos[:2500]
+    print("  ✓ Ida y vuelta correcta en json y msgpack")
+
+    # Subclases de tipos nativos: se codifican como su base, como json y msgpack
+    from collections import OrderedDict
+    from enum import IntEnum
+    from typing import NamedTuple
+
+    class Coord(NamedTuple):                   # como Coord de extra.py, sección 42
+        lat: float
+        lon: float
+
+    class Nivel(IntEnum):
+        ALTO = 3
+
+    especiales = [Coord(40.4, -3.7), OrderedDict(b=1, a=2), Nivel.ALTO, {"nivel": Nivel.ALTO}]
+    planos = [[40.4, -3.7], {"b": 1, "a": 2}, 3, {"nivel": 3}]
+    stdlib = _Empaquetador(_por_defecto)
+    for especial, plano in zip(especiales, planos):
+        assert json_(especial) == json_(plano)
+        assert binario(especial) == binario(plano) == stdlib.empaquetar(especial) == stdlib.empaquetar(plano)
+        assert binario.deserializar(binario(especial)) == plano
+    print("  ✓ NamedTuple, OrderedDict e IntEnum: mismos bytes que su tipo nativo")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark del registro de serializadores")
+    parser.add_argument("--n", type=int, default=100_000)
+    benchmark(parser.parse_args().n)
@@ -0,0 +1,317 @@
+# ================================================================
+# SINGLETON SEGURO – bloqueo doble comprobado, fork y arranque async
+# ¿QUÉ?  SingletonMeta (avanzado.py, 33) sin carreras:
+#          · acierto sin lock: un dict.get (atómico con el GIL)
+#          · fallo: lock POR CLASE y segunda comprobación dentro, así
+#            que 32 hilos a la vez construyen UNA sola instancia
+#          · os.register_at_fork: en el hijo se recrean los locks (uno
+#            tomado por otro hilo al hacer fork quedaría cerrado para
+#            siempre) y, con `por_proceso=True`, se olvida la instancia
+#          · `await Clase.instancia_async()`: si la clase define
+#            `async def iniciar(self)`, un único arranque compartido por
+#            todas las corrutinas que lo pidan a la vez
+#        CacheInstanciasMeta hace lo mismo con una instancia por
+#        argumentos (multiton).
+# ¿PARA QUÉ?  El `if cls not in _instancias` original, con un pool de
+#        hilos, puede crear dos Config distintas.
+#
+# Benchmark:  python singleton.py [--hilos 32] [--llamadas 50000]
+# ================================================================
+from __future__ import annotations
+
+import inspect
+import os
+import threading
+from functools import partial
+from typing import Any, Dict, Hashable, Set, Tuple
+
+_FALTA = object()
+_INSTANCIAS: Dict[Hashable, Any] = {}            # global: el camino rápido no busca en la metaclase
+
+
+class CacheInstanciasMeta(type):
+    """Una instancia por (clase, argumentos); ver SingletonMeta."""
+
+    _instancias = _INSTANCIAS
+    _locks: Dict[Hashable, threading.RLock] = {}   # solo mientras se construye
+    _lock_locks = threading.Lock()                 # protege la creación de _locks
+    _creando: Set[Tuple[Hashable, int]] = set()    # (clave, hilo): detecta recursión
+    _tareas: Dict[Hashable, Any] = {}              # clave → asyncio.Task del arranque
+    _por_proceso: Set[type] = set()
+
+    def __new__(mcls, name, bases, ns, por_proceso: bool = False, **kwargs):
+        cls = super().__new__(mcls, name, bases, ns, **kwargs)
+        if por_proceso:
+            mcls._por_proceso.add(cls)
+        return cls
+
+    def _clave(cls, args: tuple, kwargs: dict) -> Hashable:
+        return (cls, args, frozenset(kwargs.items()))
+
+    def __call__(cls, *args, **kwargs):
+        clave = cls._clave(args, kwargs)
+        instancia = _INSTANCIAS.get(clave, _FALTA)              # camino rápido, sin lock
+        if instancia is not _FALTA:
+            return instancia
+        return cls._crear(clave, args, kwargs)
+
+    def _lock_de(cls, clave: Hashable) -> threading.RLock:
+        lock = cls._locks.get(clave)
+        if lock is None:
+            with cls._lock_locks:
+                lock = cls._locks.setdefault(clave, threading.RLock())
+        return lock
+
+    def _crear(cls, clave: Hashable, args: tuple, kwargs: dict) -> Any:
+        if inspect.iscoroutinefunction(getattr(cls, "iniciar", None)):
+            raise RuntimeError(f"{cls.__name__} se arranca con `await {cls.__name__}.instancia_async()`")
+        with cls._lock_de(clave):
+            instancia = cls._instancias.get(clave, _FALTA)      # segunda comprobación
+            if instancia is not _FALTA:
+                cls._locks.pop(clave, None)
+                return instancia
+            marca = (clave, threading.get_ident())
+            if marca in cls._creando:
+                raise RuntimeError(f"{cls.__name__}() se llama a sí mismo durante su construcción")
+            cls._creando.add(marca)
+            try:
+                instancia = super().__call__(*args, **kwargs)
+            finally:
+                cls._creando.discard(marca)
+            cls._instancias[clave] = instancia                 # publicar ya construida
+            cls._locks.pop(clave, None)        # quien ya lo tenga lo suelta; el resto va por el camino rápido
+            return instancia
+
+    async def instancia_async(cls, *args, **kwargs):
+        """Construye la instancia (__init__ debe ser barato) y espera
+        `iniciar()` una sola vez, aunque lo pidan muchas corrutinas a la vez.
+        Si `iniciar` falla o se cancela (p. ej. asyncio.run al terminar con
+        un wait_for vencido), la siguiente llamada lo reintenta. Un arranque
+        de otro bucle de eventos ya cerrado también se descarta."""
+        import asyncio
+
+        clave = cls._clave(args, kwargs)
+        instancia = cls._instancias.get(clave, _FALTA)
+        if instancia is not _FALTA:
+            return instancia
+
+        async def arrancar():
+            nueva = type.__call__(cls, *args, **kwargs)
+            await nueva.iniciar()
+            return nueva
+
+        bucle = asyncio.get_running_loop()
+        with cls._lock_de(clave):
+            tarea = cls._tareas.get(clave)
+            if tarea is None or tarea.get_loop() is not bucle or (
+                    tarea.done() and (tarea.cancelled() or tarea.exception() is not None)):
+                tarea = cls._tareas[clave] = bucle.create_task(arrancar())
+                tarea.add_done_callback(partial(cls._fin_arranque, clave))
+        instancia = await asyncio.shield(tarea)
+        return cls._instancias.get(clave, instancia)
+
+    def _fin_arranque(cls, clave: Hashable, tarea) -> None:
+        """Al terminar el arranque, lo espere alguien o no: publicar o descartar."""
+        with cls._lock_de(clave):
+            if cls._tareas.get(clave) is tarea:
+                del cls._tareas[clave]
+            if not tarea.cancelled() and tarea.exception() is None:
+                cls._instancias.setdefault(clave, tarea.result())
+                cls._locks.pop(clave, None)
+
+    def olvidar(cls) -> None:
+        """Descarta las instancias de esta clase (tests, recarga)."""
+        for clave in [c for c in cls._instancias if c is cls or (isinstance(c, tuple) and c[0] is cls)]:
+            cls._instancias.pop(clave, None)
+
+    @classmethod
+    def _despues_de_fork(mcls) -> None:
+        # Solo sobrevive el hilo que hizo fork: los locks que tuviera otro
+        # hilo quedarían cerrados para siempre, así que se crean de nuevo.
+        mcls._lock_locks = threading.Lock()
+        mcls._locks.clear()
+        mcls._creando.clear()
+        mcls._tareas.clear()                   # pertenecen al bucle del padre
+        for clave in list(mcls._instancias):
+            cls = clave if isinstance(clave, type) else clave[0]
+            if cls in mcls._por_proceso:
+                del mcls._instancias[clave]
+
+
+class SingletonMeta(CacheInstanciasMeta):
+    """Una instancia por clase; los argumentos de llamadas posteriores se ignoran.
+
+    class Config(metaclass=SingletonMeta): ...
+    class Conexion(metaclass=SingletonMeta, por_proceso=True): ...   # una por proceso
+    """
+
+    def _clave(cls, args: tuple, kwargs: dict) -> Hashable:
+        return cls
+
+    def __call__(cls, *args, **kwargs):
+        instancia = _INSTANCIAS.get(cls, _FALTA)                # sin calcular clave
+        if instancia is not _FALTA:
+            return instancia
+        return cls._crear(cls, args, kwargs)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=CacheInstanciasMeta._despues_de_fork)
+
+
+# ------------------------------------------------------------
+# Benchmark: carrera, contención y fork
+# ------------------------------------------------------------
+def benchmark(hilos: int, llamadas: int) -> None:
+    import sys
+    import time
+
+    class SingletonIngenuo(type):                # el de avanzado.py, sección 33
+        _instancias: Dict[type, Any] = {}
+
+        def __call__(cls, *args, **kwargs):
+            if cls not in cls._instancias:
+                cls._instancias[cls] = super().__call__(*args, **kwargs)
+            return cls._instancias[cls]
+
+    class SingletonConLock(type):                # lock en cada llamada
+        _instancias: Dict[type, Any] = {}
+        _lock = threading.Lock()
+
+        def __call__(cls, *args, **kwargs):
+            with cls._lock:
+                if cls not in cls._instancias:
+                    cls._instancias[cls] = super().__call__(*args, **kwargs)
+                return cls._instancias[cls]
+
+    def clase_lenta(meta):
+        class Config(metaclass=meta):
+            def __init__(self):
+                time.sleep(0.01)                 # p. ej. leer un archivo
+                self.debug = True
+        return Config
+
+    def en_hilos(funcion) -> float:
+        barrera = threading.Barrier(hilos)
+
+        def trabajar():
+            barrera.wait()
+            funcion()
+
+        ts = [threading.Thread(target=trabajar) for _ in range(hilos)]
+        t0 = time.perf_counter()
+        for t in ts:
+            t.start()
+        for t in ts:
+            t.join()
+        return time.perf_counter() - t0
+
+    # 1. Carrera: todos los hilos piden la instancia a la vez
+    intervalo = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)                  # cambios de hilo frecuentes: la carrera aflora
+    try:
+        for meta in (SingletonIngenuo, SingletonMeta):
+            Config = clase_lenta(meta)
+            vistas = set()
+            en_hilos(lambda: vistas.add(id(Config())))
+            print(f"  {meta.__name__:<18} {hilos} hilos a la vez → {len(vistas)} instancia(s) distinta(s)")
+            if meta is SingletonMeta:
+                assert len(vistas) == 1
+    finally:
+        sys.setswitchinterval(intervalo)
+
+    # 2. Contención en el camino caliente (instancia ya creada)
+    print(f"  {hilos} hilos × {llamadas:,} llamadas con la instancia ya creada:")
+    for meta in (SingletonIngenuo, SingletonConLock, SingletonMeta):
+        class Rapida(metaclass=meta):
+            pass
+        Rapida()
+
+        def martillar(cls=Rapida):
+            for _ in range(llamadas):
+                cls()
+
+        t = en_hilos(martillar)
+        print(f"    {meta.__name__:<18} {t:6.3f}s  {t / (hilos * llamadas) * 1e9:6.0f} ns/llamada")
+
+    # 3. Fork con un lock tomado por otro hilo (construcción a medias)
+    if hasattr(os, "fork"):
+        class Conexion(metaclass=SingletonMeta, por_proceso=True):
+            def __init__(self):
+                time.sleep(0.3)
+                self.pid = os.getpid()
+
+        constructor = threading.Thread(target=Conexion)
+        constructor.start()
+        time.sleep(0.05)                         # el hilo tiene el lock de Conexion
+        pid = os.fork()
+        if pid == 0:                             # hijo: sin reinicio, esto se bloquearía
+            import signal
+            signal.alarm(5)
+            os._exit(0 if Conexion().pid == os.getpid() else 1)
+        _, estado = os.waitpid(pid, 0)
+        constructor.join()
+        assert os.waitstatus_to_exitcode(estado) == 0, "el hijo no pudo crear su Conexion"
+        assert Conexion().pid == os.getpid()
+        print("  ✓ fork con el lock tomado: el hijo crea su propia Conexion")
+
+    # 4. Arranque async compartido
+    import asyncio
+
+    arranques = []
+
+    class Cliente(metaclass=SingletonMeta):
+        async def iniciar(self):
+            arranques.append(1)
+            await asyncio.sleep(0.05)
+            self.listo = True
+
+    async def pedir_muchos():
+        return await asyncio.gather(*(Cliente.instancia_async() for _ in range(100)))
+
+    clientes = asyncio.run(pedir_muchos())
+    assert len({id(c) for c in clientes}) == 1 and len(arranques) == 1 and Cliente().listo
+    print("  ✓ 100 corrutinas → un solo iniciar(); después Cliente() es el camino rápido")
+
+    # 5. Arranque cancelado o fallido: la siguiente llamada lo reintenta
+    intentos = []
+
+    class Lento(metaclass=SingletonMeta):
+        async def iniciar(self):
+            intentos.append(1)
+            if len(intentos) == 1:
+                await asyncio.sleep(10)          # el primero no llega a terminar
+            elif len(intentos) == 2:
+                raise ConnectionError("caído")
+
+    async def con_plazo():
+        return await asyncio.wait_for(Lento.instancia_async(), 0.05)
+
+    for esperado in (asyncio.TimeoutError, ConnectionError):
+        try:
+            asyncio.run(con_plazo())             # al salir, asyncio.run cancela el arranque
+            raise AssertionError("arranque sin error")
+        except esperado:
+            pass
+    assert asyncio.run(con_plazo()) is Lento() and len(intentos) == 3
+    print("  ✓ arranque cancelado al cerrar el bucle y arranque fallido: se reintentan")
+
+    # 6. Multiton: los locks por clave no se acumulan
+    class PorClave(metaclass=CacheInstanciasMeta):
+        def __init__(self, clave):
+            self.clave = clave
+
+    antes = len(CacheInstanciasMeta._locks)
+    assert all(PorClave(i).clave == i for i in range(10_000))
+    assert len(CacheInstanciasMeta._locks) == antes
+    print(f"  ✓ 10,000 claves de multiton: {len(CacheInstanciasMeta._locks) - antes} locks retenidos")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Singleton seguro frente al ingenuo")
+    parser.add_argument("--hilos", type=int, default=32)
+    parser.add_argument("--llamadas", type=int, default=50_000)
+    args = parser.parse_args()
+    benchmark(args.hilos, args.llamadas)
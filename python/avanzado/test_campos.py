@@ -0,0 +1,80 @@
+# Pruebas de campos.py
+# Ejecutar:  python -m unittest test_campos   (o pytest)
+import unittest
+
+from campos import Modelo, Positivo, Rango
+
+
+class Producto(Modelo):
+    precio = Positivo()
+    stock = Rango(0, 100, defecto=0)
+
+
+class TestHerencia(unittest.TestCase):
+    def test_init_a_mano_del_padre_se_hereda(self):
+        class Base(Modelo):
+            precio = Positivo()
+
+            def __init__(self, precio, extra="x"):
+                self.precio = precio
+                self.extra = extra
+
+        class Hijo(Base):
+            pass
+
+        h = Hijo(5, "y")
+        self.assertEqual((h.precio, h.extra), (5, "y"))
+        with self.assertRaises(ValueError):
+            Hijo(-1)                              # el __setattr__ generado sigue validando
+
+    def test_setattr_a_mano_del_padre_se_hereda(self):
+        class Base(Modelo):
+            precio = Positivo()
+
+            def __setattr__(self, nombre, valor):
+                object.__setattr__(self, nombre, valor * 2 if nombre == "precio" else valor)
+
+        class Hijo(Base):
+            pass
+
+        h = Hijo(3)
+        h.precio = 4
+        self.assertEqual(h.precio, 8)
+
+    def test_hijo_de_generado_regenera_con_sus_campos(self):
+        class Hijo(Producto):
+            peso = Positivo(defecto=1.0)
+
+        h = Hijo(2, 5, 0.5)
+        self.assertEqual((h.precio, h.stock, h.peso), (2, 5, 0.5))
+        with self.assertRaises(ValueError):
+            Hijo(2, peso=-1)
+        with self.assertRaises(ValueError):
+            h.peso = 0
+        with self.assertRaises(ValueError):
+            h.stock = 101                         # campo heredado, también validado
+
+    def test_init_propio_del_hijo_no_se_pisa(self):
+        class Hijo(Producto):
+            def __init__(self, precio):
+                super().__init__(precio, 7)
+
+        self.assertEqual(Hijo(9).stock, 7)
+
+
+class TestMensajes(unittest.TestCase):
+    def test_rango_de_un_lado(self):
+        class Medida(Modelo):
+            minimo = Rango(minimo=0, defecto=0)
+            maximo = Rango(maximo=10, defecto=0)
+
+        with self.assertRaisesRegex(ValueError, r"minimo debe ser >= 0$"):
+            Medida(minimo=-1)
+        with self.assertRaisesRegex(ValueError, r"maximo debe ser <= 10$"):
+            Medida(maximo=11)
+        self.assertEqual(Producto.validar_muchos({"precio": [1], "stock": [200]}),
+                         [(0, "stock", "stock debe estar en [0, 100]")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+# Pruebas de perfilador_muestreo.py
+# Ejecutar:  python -m unittest test_perfilador_muestreo   (o pytest)
+import faulthandler
+import signal
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from perfilador_muestreo import PerfiladorMuestreo, instalar_conmutador, medir_sobrecarga
+
+TIENE_SIGPROF = hasattr(signal, "SIGPROF") and hasattr(signal, "setitimer")
+TIENE_SIGUSR2 = hasattr(signal, "SIGUSR2")
+
+
+def cpu_bound(n):
+    return sum(i * i for i in range(n))
+
+
+def trabajo():
+    for _ in range(40):
+        cpu_bound(50_000)
+
+
+class TestPerfiladorMuestreo(unittest.TestCase):
+    def setUp(self):
+        # Si vuelve el interbloqueo, fallar con la pila en vez de colgarse
+        faulthandler.dump_traceback_later(30, exit=True)
+
+    def tearDown(self):
+        faulthandler.cancel_dump_traceback_later()
+
+    def test_colapsado_y_top(self):
+        with PerfiladorMuestreo(intervalo=0.005) as perfil:
+            trabajo()
+        self.assertGreater(perfil.total, 0)
+        self.assertEqual(sum(perfil.muestras.values()), perfil.total)
+        pila, n = perfil.colapsado().splitlines()[0].rsplit(" ", 1)
+        self.assertTrue(pila.startswith("MainThread;"))
+        self.assertGreater(int(n), 0)
+        self.assertTrue(any("cpu_bound" in f or "genexpr" in f for f, _ in perfil.top(3)))
+
+    def test_senal_con_el_lock_tomado_no_bloquea(self):
+        # Lo que pasa si SIGPROF llega mientras el hilo principal está en colapsado()
+        perfil = PerfiladorMuestreo(modo="senal")
+        with perfil._lock:
+            for _ in range(2000):                          # también cruza el umbral de agregado
+                perfil._al_recibir_senal(signal.SIGINT, sys._getframe())
+        self.assertEqual(perfil.total, 2000)
+
+    def conmutar_con_el_lock_tomado(self, modo):
+        # Lo que pasa si SIGUSR2 llega mientras el hilo principal está en colapsado()
+        previo = signal.getsignal(signal.SIGUSR2)
+        try:
+            with tempfile.TemporaryDirectory() as tmp:
+                perfil = instalar_conmutador(PerfiladorMuestreo(intervalo=0.001, modo=modo), directorio=tmp)
+                conmutar = signal.getsignal(signal.SIGUSR2)
+                conmutar(signal.SIGUSR2, sys._getframe())          # encender
+                limite = time.monotonic() + 5
+                while not perfil.activo and time.monotonic() < limite:
+                    time.sleep(0.01)
+                cpu_bound(200_000)
+                with perfil._lock:
+                    conmutar(signal.SIGUSR2, sys._getframe())      # apagar: no debe esperar al lock
+                while not list(Path(tmp).glob("perfil-*.txt")) and time.monotonic() < limite:
+                    time.sleep(0.01)
+                archivos = list(Path(tmp).glob("perfil-*.txt"))
+                self.assertEqual(len(archivos), 1)
+                self.assertIn("MainThread;", archivos[0].read_text(encoding="utf-8"))
+                self.assertFalse(perfil.activo)
+        finally:
+            signal.signal(signal.SIGUSR2, previo)
+
+    @unittest.skipUnless(TIENE_SIGUSR2, "SIGUSR2 solo en Unix")
+    def test_conmutador_hilo_con_el_lock_tomado(self):
+        self.conmutar_con_el_lock_tomado("hilo")
+
+    @unittest.skipUnless(TIENE_SIGUSR2 and TIENE_SIGPROF, "SIGUSR2/SIGPROF solo en Unix")
+    def test_conmutador_senal_con_el_lock_tomado(self):
+        self.conmutar_con_el_lock_tomado("senal")
+
+    @unittest.skipUnless(TIENE_SIGPROF, "SIGPROF/setitimer solo en Unix")
+    def test_senal_durante_lecturas(self):
+        with PerfiladorMuestreo(intervalo=0.0005, modo="senal") as perfil:
+            for _ in range(300):
+                perfil.colapsado()
+                perfil.top()
+                cpu_bound(2_000)
+        self.assertGreater(perfil.total, 0)
+
+    def test_sobrecarga_hilo(self):
+        extra = medir_sobrecarga(trabajo, intervalo=0.01, modo="hilo")
+        self.assertLess(extra, 0.10, f"sobrecarga en modo hilo: {extra:.1%}")
+
+    @unittest.skipUnless(TIENE_SIGPROF, "SIGPROF/setitimer solo en Unix")
+    def test_sobrecarga_senal(self):
+        extra = medir_sobrecarga(trabajo, intervalo=0.01, modo="senal")
+        self.assertLess(extra, 0.10, f"sobrecarga en modo señal: {extra:.1%}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,26 +1,30 @@
-import requests
+import sys
+from pathlib import Path
+
+from almacen_tasas import AlmacenTasas
+from motor_tasas import MotorTasas
+
+if len(sys.argv) > 1:
+    # Modo NO interactivo: python 1.Conversor_divisa.py libro.csv salida.csv
+    from conversion_masiva import main
+    sys.exit(main())
 
 print("🧪 Conversor universal sin clave (Frankfurter API)")
 
+# Una sola tabla por moneda base, cacheada en memoria (ver motor_tasas.py)
+# y guardada en disco: sin red se usa la última instantánea.
+motor = MotorTasas(almacen=AlmacenTasas(Path(__file__).with_name("tasas.sqlite")))
+
 try:
     monto = float(input("Monto a convertir: "))
     moneda_origen = input("Moneda origen (ej: USD, EUR, DOP): ").upper()
     moneda_destino = input("Moneda destino (ej: USD, EUR, DOP): ").upper()
 
-    url = f"https://api.frankfurter.app/latest?amount={monto}&from={moneda_origen}&to={moneda_destino}"
-    resp = requests.get(url)
-    datos = resp.json()
-
-    if "error" in datos:
-        raise Exception(datos["error"])
-
-    tasa = datos["rates"].get(moneda_destino)
-    if tasa is None:
-        raise Exception("Moneda destino no válida o no soportada.")
+    tasa = motor.tasa(moneda_origen, moneda_destino)
 
-    resultado = tasa
+    resultado = monto * tasa
     print(f"\n💱 {monto} {moneda_origen} = {resultado:.2f} {moneda_destino}")
-    print(f"🔁 1 {moneda_origen} ≈ {resultado / monto:.4f} {moneda_destino}")
+    print(f"🔁 1 {moneda_origen} ≈ {tasa:.4f} {moneda_destino}")
 
 except ValueError:
     print("❌ Debes ingresar un número válido.")
@@ -0,0 +1,161 @@
+# ================================================================
+# Almacén de tasas en disco (SQLite) – conversiones sin red
+# ¿QUÉ?  Guarda instantáneas de tasas por FECHA en un archivo SQLite
+#        compacto (una fila por fecha × moneda, base EUR canónica).
+# ¿PARA QUÉ?  Arrancar en milisegundos, convertir sin conexión y
+#        consultar históricos sin ir a la API; los refrescos solo
+#        descargan los días que faltan (ver MotorTasas.refrescar).
+# ================================================================
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+BASE_CANONICA = "EUR"
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS tasas (
+    fecha  TEXT NOT NULL,
+    moneda TEXT NOT NULL,
+    tasa   REAL NOT NULL,
+    PRIMARY KEY (fecha, moneda)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS dias (
+    fecha TEXT PRIMARY KEY          -- días de calendario ya consultados
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    clave TEXT PRIMARY KEY,
+    valor TEXT NOT NULL
+) WITHOUT ROWID;
+"""
+
+Fecha = Union[str, date]
+
+
+def _iso(fecha: Fecha) -> str:
+    return fecha if isinstance(fecha, str) else fecha.isoformat()
+
+
+def a_base(tasas: Dict[str, float], desde: str, hacia: str) -> Dict[str, float]:
+    """Reexpresa una tabla {moneda: tasa} de base `desde` en base `hacia`."""
+    if desde == hacia:
+        return dict(tasas)
+    unidad = tasas[hacia]
+    return {moneda: valor / unidad for moneda, valor in tasas.items()}
+
+
+class AlmacenTasas:
+    """Instantáneas de tasas por fecha; no hace peticiones de red."""
+
+    def __init__(self, ruta: Union[str, Path] = ":memory:"):
+        self.ruta = str(ruta)
+        self._con = sqlite3.connect(self.ruta, check_same_thread=False)
+        self._con.executescript(_ESQUEMA)
+        self._lock = threading.Lock()
+
+    def cerrar(self) -> None:
+        self._con.close()
+
+    def __enter__(self) -> "AlmacenTasas":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+    # ------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------
+    def guardar(self, fecha: Fecha, tasas: Dict[str, float], base: str = BASE_CANONICA) -> None:
+        """Guarda la publicación MÁS RECIENTE (cualquier base; se pasa a EUR)."""
+        self.guardar_serie({_iso(fecha): tasas}, base)
+        with self._lock, self._con:
+            self._con.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('guardado', ?)", (repr(time.time()),)
+            )
+
+    def guardar_serie(self, serie: Dict[str, Dict[str, float]], base: str = BASE_CANONICA) -> None:
+        filas: List[Tuple[str, str, float]] = []
+        for fecha, tasas in serie.items():
+            tasas = dict(tasas)
+            tasas[base] = 1.0
+            for moneda, valor in a_base(tasas, base, BASE_CANONICA).items():
+                filas.append((_iso(fecha), moneda, valor))
+        with self._lock, self._con:
+            self._con.executemany("INSERT OR REPLACE INTO tasas VALUES (?, ?, ?)", filas)
+
+    def marcar_dias(self, dias: Iterable[Fecha]) -> None:
+        with self._lock, self._con:
+            self._con.executemany(
+                "INSERT OR IGNORE INTO dias VALUES (?)", ((_iso(d),) for d in dias)
+            )
+
+    # ------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------
+    def ultima_fecha(self, hasta: Optional[Fecha] = None) -> Optional[str]:
+        """Última publicación disponible (opcionalmente ≤ `hasta`)."""
+        with self._lock:
+            if hasta is None:
+                fila = self._con.execute("SELECT MAX(fecha) FROM tasas").fetchone()
+            else:
+                fila = self._con.execute(
+                    "SELECT MAX(fecha) FROM tasas WHERE fecha <= ?", (_iso(hasta),)
+                ).fetchone()
+        return fila[0]
+
+    def guardado_hace(self) -> Optional[float]:
+        """Segundos desde el último guardar() de /latest (None si nunca)."""
+        with self._lock:
+            fila = self._con.execute("SELECT valor FROM meta WHERE clave = 'guardado'").fetchone()
+        return None if fila is None else time.time() - float(fila[0])
+
+    def tabla(self, base: str = BASE_CANONICA, fecha: Optional[Fecha] = None) -> Optional[Dict[str, float]]:
+        """Tabla vigente en `fecha` (la última si es None) para 1 unidad de `base`."""
+        publicada = self.ultima_fecha(fecha)
+        if publicada is None:
+            return None
+        with self._lock:
+            filas = self._con.execute(
+                "SELECT moneda, tasa FROM tasas WHERE fecha = ?", (publicada,)
+            ).fetchall()
+        tasas = dict(filas)
+        if base not in tasas:
+            return None
+        return a_base(tasas, BASE_CANONICA, base)
+
+    def tasa(self, origen: str, destino: str, fecha: Optional[Fecha] = None) -> Optional[float]:
+        publicada = self.ultima_fecha(fecha)
+        if publicada is None:
+            return None
+        with self._lock:
+            filas = dict(self._con.execute(
+                "SELECT moneda, tasa FROM tasas WHERE fecha = ? AND moneda IN (?, ?)",
+                (publicada, origen, destino),
+            ).fetchall())
+        if origen not in filas or destino not in filas:
+            return None
+        return filas[destino] / filas[origen]
+
+    def dias_faltantes(self, desde: Fecha, hasta: Fecha) -> List[Tuple[date, date]]:
+        """Huecos [inicio, fin] de días de calendario aún no consultados."""
+        inicio = date.fromisoformat(_iso(desde))
+        fin = date.fromisoformat(_iso(hasta))
+        with self._lock:
+            hechos = {f for (f,) in self._con.execute(
+                "SELECT fecha FROM dias WHERE fecha BETWEEN ? AND ?",
+                (inicio.isoformat(), fin.isoformat()),
+            )}
+        huecos: List[Tuple[date, date]] = []
+        dia = inicio
+        while dia <= fin:
+            if dia.isoformat() not in hechos:
+                if huecos and huecos[-1][1] == dia - timedelta(days=1):
+                    huecos[-1] = (huecos[-1][0], dia)
+                else:
+                    huecos.append((dia, dia))
+            dia += timedelta(days=1)
+        return huecos
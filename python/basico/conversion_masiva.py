@@ -0,0 +1,215 @@
+# ================================================================
+# Conversión MASIVA – libros CSV/JSONL por bloques
+# ¿QUÉ?  Lee un archivo enorme de filas (monto, origen, destino) en
+#        bloques, resuelve cada par de monedas UNA vez y convierte el
+#        bloque entero con una sola multiplicación NumPy.
+# ¿PARA QUÉ?  El conversor interactivo procesa un input() a la vez;
+#        aquí la memoria es constante (un bloque) sin importar el tamaño.
+#
+# Uso:
+#   python conversion_masiva.py entrada.csv salida.csv [--bloque 50000]
+#   python conversion_masiva.py entrada.jsonl salida.jsonl
+#   python conversion_masiva.py --bench 200000      # filas/s vs HTTP por fila
+# ================================================================
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:          # sin NumPy: misma lógica en Python puro
+    np = None
+
+import requests
+
+from almacen_tasas import AlmacenTasas
+from motor_tasas import URL_FRANKFURTER, ErrorTasas, MotorTasas
+
+# Nombres de columna aceptados (español o los de la API)
+COLUMNAS = {
+    "monto": ("monto", "amount"),
+    "origen": ("origen", "from"),
+    "destino": ("destino", "to"),
+}
+
+
+def _formato(ruta: Path) -> str:
+    return "jsonl" if ruta.suffix.lower() in (".jsonl", ".ndjson") else "csv"
+
+
+def _columna(nombres: Sequence[str], campo: str) -> str:
+    for alias in COLUMNAS[campo]:
+        if alias in nombres:
+            return alias
+    raise ValueError(f"Falta la columna '{campo}' (acepta: {', '.join(COLUMNAS[campo])}).")
+
+
+def _columnas(fila: Dict[str, Any]) -> Tuple[str, str, str]:
+    return _columna(fila, "monto"), _columna(fila, "origen"), _columna(fila, "destino")
+
+
+def _campos(bloque: List[Dict[str, Any]]) -> List[Tuple[Any, str, str]]:
+    """(monto, origen, destino) de cada fila.
+
+    En CSV todas las filas comparten columnas: se resuelven una vez. En
+    JSONL cada línea puede usar otros nombres ("amount" aquí, "monto"
+    allá): si la resolución de la primera fila no vale, fila a fila.
+    """
+    c_monto, c_origen, c_destino = _columnas(bloque[0])
+    try:
+        return [(fila[c_monto], fila[c_origen], fila[c_destino]) for fila in bloque]
+    except KeyError:
+        pass
+    campos = []
+    for numero, fila in enumerate(bloque, 1):
+        try:
+            c_monto, c_origen, c_destino = _columnas(fila)
+        except ValueError as e:
+            raise ValueError(f"Fila {numero} del bloque: {e}") from None
+        campos.append((fila[c_monto], fila[c_origen], fila[c_destino]))
+    return campos
+
+
+# ------------------------------------------------------------
+# Lectura / escritura en streaming
+# ------------------------------------------------------------
+def leer_bloques(archivo, formato: str, tamano: int) -> Iterator[List[Dict[str, Any]]]:
+    """Genera listas de hasta `tamano` filas (dict); nunca carga el archivo entero."""
+    if formato == "csv":
+        filas: Iterator[Dict[str, Any]] = csv.DictReader(archivo)
+    else:
+        filas = (json.loads(linea) for linea in archivo if linea.strip())
+    bloque: List[Dict[str, Any]] = []
+    for fila in filas:
+        bloque.append(fila)
+        if len(bloque) >= tamano:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+
+
+def convertir_bloque(bloque: List[Dict[str, Any]], motor: MotorTasas) -> List[float]:
+    """Agrupa por par, busca cada tasa una vez y multiplica todo el bloque."""
+    campos = _campos(bloque)
+    pares: Dict[Tuple[str, str], int] = {}
+    indices = [
+        pares.setdefault((origen.upper(), destino.upper()), len(pares))
+        for _, origen, destino in campos
+    ]
+    tasas = [motor.tasa(origen, destino) for origen, destino in pares]
+    try:
+        montos = [float(monto) for monto, _, _ in campos]
+    except ValueError as e:
+        raise ValueError(f"Monto inválido en el bloque: {e}") from None
+
+    if np is None:
+        return [m * tasas[i] for m, i in zip(montos, indices)]
+    # Vector de tasas por fila (gather) × montos: una sola multiplicación
+    return (np.asarray(montos) * np.asarray(tasas)[np.asarray(indices)]).tolist()
+
+
+def convertir_archivo(entrada: Path, salida: Path, motor: MotorTasas, tamano: int = 50_000) -> int:
+    """Convierte `entrada` → `salida` bloque a bloque; devuelve filas procesadas."""
+    formato = _formato(entrada)
+    total = 0
+    with open(entrada, newline="", encoding="utf-8") as f_in, \
+            open(salida, "w", newline="", encoding="utf-8") as f_out:
+        escritor = None
+        for bloque in leer_bloques(f_in, formato, tamano):
+            resultados = convertir_bloque(bloque, motor)
+            if formato == "csv":
+                if escritor is None:
+                    # Celdas de más (clave None de DictReader) no tienen columna: se descartan
+                    columnas = [c for c in bloque[0] if c is not None]
+                    escritor = csv.DictWriter(f_out, fieldnames=[*columnas, "resultado"],
+                                              extrasaction="ignore")
+                    escritor.writeheader()
+                for fila, valor in zip(bloque, resultados):
+                    fila["resultado"] = f"{valor:.2f}"
+                escritor.writerows(bloque)
+            else:
+                f_out.writelines(
+                    json.dumps({**fila, "resultado": round(valor, 2)}) + "\n"
+                    for fila, valor in zip(bloque, resultados)
+                )
+            total += len(bloque)
+    return total
+
+
+# ------------------------------------------------------------
+# Benchmark: filas/s frente al camino original (1 HTTP por fila)
+# ------------------------------------------------------------
+def benchmark(filas: int, muestra_http: int = 300) -> None:
+    import random
+    import tempfile
+
+    from stub_frankfurter import TASAS_EUR, ServidorStub
+
+    monedas = list(TASAS_EUR)
+    rd = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp, ServidorStub() as stub:
+        entrada, salida = Path(tmp, "libro.csv"), Path(tmp, "salida.csv")
+        with open(entrada, "w", newline="") as f:
+            w = csv.writer(f)
+            w.writerow(["monto", "origen", "destino"])
+            for _ in range(filas):
+                w.writerow([round(rd.uniform(1, 1000), 2), rd.choice(monedas), rd.choice(monedas)])
+
+        # Camino original: un requests.get por conversión (se extrapola de una muestra)
+        t0 = time.perf_counter()
+        for _ in range(muestra_http):
+            o, d = rd.sample(monedas, 2)
+            requests.get(f"{stub.url}/latest?amount=10&from={o}&to={d}").json()
+        por_fila = muestra_http / (time.perf_counter() - t0)
+
+        motor = MotorTasas(url_base=stub.url)
+        t0 = time.perf_counter()
+        convertir_archivo(entrada, salida, motor)
+        masiva = filas / (time.perf_counter() - t0)
+
+    print(f"  NumPy: {'sí' if np is not None else 'no (Python puro)'}")
+    print(f"  HTTP por fila : {por_fila:12,.0f} filas/s (muestra de {muestra_http})")
+    print(f"  Masiva        : {masiva:12,.0f} filas/s ({filas:,} filas)")
+    print(f"  Aceleración   : ×{masiva / por_fila:,.0f}")
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Conversión masiva de divisas (CSV/JSONL).")
+    parser.add_argument("entrada", nargs="?", type=Path)
+    parser.add_argument("salida", nargs="?", type=Path)
+    parser.add_argument("--bloque", type=int, default=50_000, help="filas por bloque")
+    parser.add_argument("--url", default=URL_FRANKFURTER, help="URL de la API de tasas")
+    parser.add_argument("--almacen", type=Path, help="archivo SQLite de instantáneas")
+    parser.add_argument("--bench", type=int, metavar="FILAS", help="ejecuta el benchmark")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        benchmark(args.bench)
+        return 0
+    if args.entrada is None or args.salida is None:
+        parser.error("indica entrada y salida (o --bench FILAS)")
+
+    almacen = AlmacenTasas(args.almacen) if args.almacen else None
+    motor = MotorTasas(url_base=args.url, almacen=almacen)
+    t0 = time.perf_counter()
+    try:
+        total = convertir_archivo(args.entrada, args.salida, motor, args.bloque)
+    except (ErrorTasas, requests.RequestException) as e:
+        print(f"❌ No se pudieron obtener las tasas: {e}", file=sys.stderr)
+        return 1
+    except (ValueError, KeyError, OSError) as e:    # monto/columna inválidos, archivo ilegible
+        print(f"❌ No se pudo convertir {args.entrada}: {e}", file=sys.stderr)
+        return 1
+    print(f"✅ {total:,} filas convertidas en {time.perf_counter() - t0:.2f}s → {args.salida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,241 @@
+# ================================================================
+# Motor de tasas – caché TTL + LRU para el conversor de divisas
+# ¿QUÉ?  Descarga la tabla COMPLETA de una moneda base una sola vez
+#        y responde cualquier par (incluidas tasas cruzadas) desde RAM.
+# ¿PARA QUÉ?  1.Conversor_divisa.py hacía un requests.get por cada
+#        conversión; con miles de conversiones por minuto eso no escala.
+# ================================================================
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import requests
+
+from almacen_tasas import BASE_CANONICA, AlmacenTasas
+from singleflight import SingleFlight
+
+URL_FRANKFURTER = "https://api.frankfurter.app"
+
+Par = Tuple[str, str]
+
+
+class ErrorTasas(Exception):
+    """Moneda no soportada o respuesta inválida de la API."""
+
+
+class MotorTasas:
+    """Tablas de tasas por moneda base con expiración (TTL) y desalojo LRU."""
+
+    def __init__(
+        self,
+        url_base: str = URL_FRANKFURTER,
+        base: str = "EUR",
+        ttl: float = 3600.0,
+        max_tablas: int = 8,
+        timeout: float = 10.0,
+        sesion: Optional[requests.Session] = None,
+        almacen: Optional[AlmacenTasas] = None,
+    ):
+        self.url_base = url_base.rstrip("/")
+        self.base = base.upper()          # base usada para tasas cruzadas
+        self.ttl = ttl
+        self.max_tablas = max_tablas
+        self.timeout = timeout
+        self.sesion = sesion or requests.Session()   # reutiliza conexiones
+        self.almacen = almacen            # instantáneas en disco (opcional)
+        # base -> (instante de descarga, {moneda: tasa})
+        self._tablas: OrderedDict[str, Tuple[float, Dict[str, float]]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Hilos que piden a la vez la misma base comparten UNA descarga
+        self.vuelos = SingleFlight()
+
+    # ------------------------------------------------------------
+    # Caché
+    # ------------------------------------------------------------
+    def _en_cache(self, base: str) -> Optional[Dict[str, float]]:
+        with self._lock:
+            entrada = self._tablas.get(base)
+            if entrada is None:
+                return None
+            instante, tasas = entrada
+            if time.monotonic() - instante > self.ttl:
+                del self._tablas[base]           # caducada
+                return None
+            self._tablas.move_to_end(base)       # recién usada (LRU)
+            return tasas
+
+    def _guardar(self, base: str, tasas: Dict[str, float]) -> None:
+        with self._lock:
+            self._tablas[base] = (time.monotonic(), tasas)
+            self._tablas.move_to_end(base)
+            while len(self._tablas) > self.max_tablas:
+                self._tablas.popitem(last=False)  # la menos usada
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._tablas.clear()
+
+    # ------------------------------------------------------------
+    # Red
+    # ------------------------------------------------------------
+    def _pedir(self, ruta: str, base: str) -> dict:
+        resp = self.sesion.get(
+            f"{self.url_base}/{ruta}", params={"from": base}, timeout=self.timeout
+        )
+        datos = resp.json()
+        if "error" in datos:
+            raise ErrorTasas(datos["error"])
+        if "rates" not in datos:
+            raise ErrorTasas(datos.get("message", f"Moneda {base} no soportada."))
+        return datos
+
+    def _descargar(self, base: str) -> Dict[str, float]:
+        datos = self._pedir("latest", base)
+        tasas = {moneda: float(valor) for moneda, valor in datos["rates"].items()}
+        tasas[base] = 1.0
+        if self.almacen is not None and BASE_CANONICA in tasas:
+            self.almacen.guardar(datos["date"], tasas, base)
+        return tasas
+
+    def tabla(self, base: str) -> Dict[str, float]:
+        """Tabla {moneda: tasa} para 1 unidad de `base` (descarga si hace falta)."""
+        base = base.upper()
+        tasas = self._en_cache(base)
+        if tasas is None:
+            tasas = self.vuelos.hacer(base, self._cargar_y_guardar, base)
+        return tasas
+
+    def _cargar_y_guardar(self, base: str) -> Dict[str, float]:
+        # Otro líder pudo terminar entre el fallo de caché y este vuelo
+        tasas = self._en_cache(base)
+        if tasas is None:
+            tasas = self._cargar(base)
+            self._guardar(base, tasas)
+        return tasas
+
+    def _cargar(self, base: str) -> Dict[str, float]:
+        almacen = self.almacen
+        if almacen is None:
+            return self._descargar(base)
+        # Arranque en caliente: instantánea en disco más reciente que el TTL
+        edad = almacen.guardado_hace()
+        if edad is not None and edad <= self.ttl:
+            tasas = almacen.tabla(base)
+            if tasas is not None:
+                return tasas
+        try:
+            return self._descargar(base)
+        except (requests.RequestException, ErrorTasas) as e:
+            # Sin red o API caída (un 5xx llega como ErrorTasas): última instantánea guardada
+            tasas = almacen.tabla(base)
+            if tasas is None:
+                if isinstance(e, ErrorTasas):
+                    raise                    # p. ej. moneda no soportada: el mensaje de la API
+                raise ErrorTasas(f"Sin conexión y sin tasas guardadas para {base}.") from None
+            return tasas
+
+    # ------------------------------------------------------------
+    # Histórico (requiere almacén)
+    # ------------------------------------------------------------
+    def refrescar(self, desde: Union[str, date], hasta: Union[str, date, None] = None) -> int:
+        """Descarga SOLO los días sin consultar de [desde, hasta]; devuelve nº de peticiones."""
+        almacen = self._requiere_almacen()
+        hoy = date.today()
+        hasta = min(date.fromisoformat(str(hasta)) if hasta else hoy, hoy)
+        peticiones = 0
+        for inicio, fin in almacen.dias_faltantes(desde, hasta):
+            ruta = inicio.isoformat() if inicio == fin else f"{inicio}..{fin}"
+            datos = self._pedir(ruta, BASE_CANONICA)
+            peticiones += 1
+            if "date" in datos:                       # un solo día
+                serie = {datos["date"]: datos["rates"]}
+            else:                                     # serie temporal
+                serie = datos["rates"]
+            almacen.guardar_serie(serie, datos["base"])
+            # Hoy puede publicarse más tarde: no se da por consultado
+            dias = (inicio + timedelta(days=i) for i in range((fin - inicio).days + 1))
+            almacen.marcar_dias(d for d in dias if d < hoy)
+        return peticiones
+
+    def historico(self, fecha: Union[str, date], origen: str, destino: str) -> float:
+        """Tasa vigente en `fecha`; solo va a la red si ese día falta en disco."""
+        almacen = self._requiere_almacen()
+        origen, destino = origen.upper(), destino.upper()
+        self.refrescar(fecha, fecha)
+        tasa = almacen.tasa(origen, destino, fecha)
+        if tasa is None:
+            raise ErrorTasas(f"Sin tasa {origen}->{destino} para {fecha}.")
+        return tasa
+
+    def _requiere_almacen(self) -> AlmacenTasas:
+        if self.almacen is None:
+            raise ErrorTasas("El histórico necesita un AlmacenTasas.")
+        return self.almacen
+
+    # ------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------
+    def tasa(self, origen: str, destino: str) -> float:
+        """Cuántas unidades de `destino` vale 1 unidad de `origen`."""
+        origen, destino = origen.upper(), destino.upper()
+        # 1. Tabla directa ya en caché
+        directa = self._en_cache(origen)
+        if directa is not None:
+            return self._leer(directa, destino)
+        # 2. Tabla inversa en caché: 1 / (destino -> origen)
+        inversa = self._en_cache(destino)
+        if inversa is not None:
+            return 1.0 / self._leer(inversa, origen)
+        # 3. Tasa cruzada a través de la moneda base
+        tabla = self.tabla(self.base)
+        return self._leer(tabla, destino) / self._leer(tabla, origen)
+
+    @staticmethod
+    def _leer(tasas: Dict[str, float], moneda: str) -> float:
+        try:
+            return tasas[moneda]
+        except KeyError:
+            raise ErrorTasas(f"Moneda {moneda} no válida o no soportada.") from None
+
+    def convertir(self, monto: float, origen: str, destino: str) -> float:
+        return monto * self.tasa(origen, destino)
+
+    def tasas_para(self, pares: Iterable[Par]) -> Dict[Par, float]:
+        """Resuelve muchos pares de una vez (cada par distinto solo una vez)."""
+        resultado: Dict[Par, float] = {}
+        for origen, destino in pares:
+            par = (origen.upper(), destino.upper())
+            if par not in resultado:
+                resultado[par] = self.tasa(*par)
+        return resultado
+
+    def convertir_lote(self, filas: Iterable[Tuple[float, str, str]]) -> List[float]:
+        """Convierte filas (monto, origen, destino) reutilizando las tasas."""
+        filas = list(filas)
+        tasas = self.tasas_para((o, d) for _, o, d in filas)
+        return [monto * tasas[(o.upper(), d.upper())] for monto, o, d in filas]
+
+
+if __name__ == "__main__":
+    # Demo offline contra el servidor stub local
+    from stub_frankfurter import ServidorStub
+
+    with ServidorStub() as stub:
+        motor = MotorTasas(url_base=stub.url, almacen=AlmacenTasas())
+        print("  100 USD -> DOP:", round(motor.convertir(100, "USD", "DOP"), 2))
+        print("  Lote:", [round(v, 2) for v in motor.convertir_lote(
+            [(10, "EUR", "USD"), (20, "USD", "EUR"), (5, "GBP", "JPY")] * 1000
+        )][:3])
+        motor.refrescar("2024-01-01", "2024-01-31")
+        motor.refrescar("2024-01-01", "2024-02-10")   # solo baja 1-10 feb
+        print("  Histórico 2024-01-06 USD->GBP:", round(motor.historico("2024-01-06", "USD", "GBP"), 4))
+        print("  Peticiones HTTP realizadas:", stub.peticiones)
+
+    # API caída (503): se sirve la última instantánea del almacén
+    with ServidorStub(fallos=10) as caido:
+        motor = MotorTasas(url_base=caido.url, ttl=0, almacen=motor.almacen)
+        print("  Con la API en 503, 100 USD -> DOP:", round(motor.convertir(100, "USD", "DOP"), 2))
@@ -0,0 +1,170 @@
+# ================================================================
+# SINGLEFLIGHT – una sola descarga para peticiones simultáneas
+# ¿QUÉ?  Si N hilos (o corrutinas) piden la misma clave a la vez,
+#        solo el primero ("líder") llama a la API; el resto espera y
+#        recibe el MISMO resultado (o la misma excepción).
+# ¿PARA QUÉ?  En un ThreadPoolExecutor (avanzado.py, 27b) cada worker
+#        haría su propio requests.get para el mismo par de monedas.
+# ================================================================
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class Estadisticas:
+    aciertos: int = 0      # servidas desde un resultado reciente (ttl)
+    fallos: int = 0        # el llamador fue líder: hizo la llamada real
+    fusionadas: int = 0    # esperaron a la llamada de otro líder
+
+
+class _Llamada:
+    __slots__ = ("evento", "resultado", "error")
+
+    def __init__(self):
+        self.evento = threading.Event()
+        self.resultado: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class _Recientes:
+    """Resultados recién obtenidos que se reutilizan durante `ttl` segundos."""
+
+    def __init__(self, ttl: float, maximo: int):
+        self.ttl = ttl
+        self.maximo = maximo
+        self._datos: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def leer(self, clave: Hashable) -> Tuple[bool, Any]:
+        entrada = self._datos.get(clave)
+        if entrada is None:
+            return False, None
+        if time.monotonic() > entrada[0]:
+            del self._datos[clave]
+            return False, None
+        return True, entrada[1]
+
+    def guardar(self, clave: Hashable, valor: Any) -> None:
+        if self.ttl <= 0:
+            return
+        self._datos.pop(clave, None)
+        self._datos[clave] = (time.monotonic() + self.ttl, valor)
+        if len(self._datos) > self.maximo:
+            del self._datos[next(iter(self._datos))]   # la más antigua
+
+    def olvidar(self, clave: Hashable) -> None:
+        self._datos.pop(clave, None)
+
+
+class SingleFlight:
+    """Versión para hilos (ThreadPoolExecutor)."""
+
+    def __init__(self, ttl: float = 0.0, max_recientes: int = 1024):
+        self.stats = Estadisticas()
+        self._en_vuelo: Dict[Hashable, _Llamada] = {}
+        self._recientes = _Recientes(ttl, max_recientes)
+        self._lock = threading.Lock()
+
+    def hacer(self, clave: Hashable, funcion: Callable[..., T], *args, **kwargs) -> T:
+        with self._lock:
+            hay, valor = self._recientes.leer(clave)
+            if hay:
+                self.stats.aciertos += 1
+                return valor
+            llamada = self._en_vuelo.get(clave)
+            lider = llamada is None
+            if lider:
+                llamada = self._en_vuelo[clave] = _Llamada()
+                self.stats.fallos += 1
+            else:
+                self.stats.fusionadas += 1
+
+        if not lider:
+            llamada.evento.wait()
+            if llamada.error is not None:
+                raise llamada.error
+            return llamada.resultado
+
+        try:
+            llamada.resultado = funcion(*args, **kwargs)
+            return llamada.resultado
+        except BaseException as e:
+            llamada.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._en_vuelo[clave]
+                if llamada.error is None:
+                    self._recientes.guardar(clave, llamada.resultado)
+            llamada.evento.set()
+
+    def olvidar(self, clave: Hashable) -> None:
+        with self._lock:
+            self._recientes.olvidar(clave)
+
+
+class SingleFlightAsync:
+    """Versión asyncio: el líder corre como Task y los demás la esperan."""
+
+    def __init__(self, ttl: float = 0.0, max_recientes: int = 1024):
+        self.stats = Estadisticas()
+        self._en_vuelo: Dict[Hashable, asyncio.Task] = {}
+        self._recientes = _Recientes(ttl, max_recientes)
+
+    async def hacer(self, clave: Hashable, funcion: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        hay, valor = self._recientes.leer(clave)
+        if hay:
+            self.stats.aciertos += 1
+            return valor
+        tarea = self._en_vuelo.get(clave)
+        if tarea is None:
+            self.stats.fallos += 1
+            tarea = asyncio.ensure_future(funcion(*args, **kwargs))
+            self._en_vuelo[clave] = tarea
+            tarea.add_done_callback(lambda t: self._terminar(clave, t))
+        else:
+            self.stats.fusionadas += 1
+        # shield: si UN llamador se cancela, la llamada compartida sigue
+        return await asyncio.shield(tarea)
+
+    def _terminar(self, clave: Hashable, tarea: asyncio.Task) -> None:
+        self._en_vuelo.pop(clave, None)
+        if not tarea.cancelled() and tarea.exception() is None:
+            self._recientes.guardar(clave, tarea.result())
+
+    def olvidar(self, clave: Hashable) -> None:
+        self._recientes.olvidar(clave)
+
+
+if __name__ == "__main__":
+    import concurrent.futures as cf
+
+    from motor_tasas import MotorTasas
+    from stub_frankfurter import ServidorStub
+
+    with ServidorStub() as stub:
+        motor = MotorTasas(url_base=stub.url)
+        with cf.ThreadPoolExecutor(max_workers=32) as ex:
+            futuros = [ex.submit(motor.tasa, "USD", "DOP") for _ in range(200)]
+            print("  Threading:", {round(f.result(), 4) for f in futuros})
+        print("  Peticiones HTTP:", stub.peticiones, "|", motor.vuelos.stats)
+
+        async def demo() -> None:
+            vuelos = SingleFlightAsync(ttl=1.0)
+
+            async def lenta(par):
+                await asyncio.sleep(0.05)
+                return motor.tasa(*par)
+
+            claves = [("EUR", "USD")] * 50
+            resultados = await asyncio.gather(*(vuelos.hacer(c, lenta, c) for c in claves))
+            await vuelos.hacer(("EUR", "USD"), lenta, ("EUR", "USD"))
+            print("  Asyncio:", set(resultados), "|", vuelos.stats)
+
+        asyncio.run(demo())
@@ -0,0 +1,158 @@
+# ================================================================
+# Servidor STUB de Frankfurter – pruebas offline del conversor
+# ¿QUÉ?  Un http.server local que imita /latest, /AAAA-MM-DD y
+#        /AAAA-MM-DD..AAAA-MM-DD de api.frankfurter.app con tasas
+#        fijas (base EUR) y deterministas por fecha.
+# ¿PARA QUÉ?  Probar motor_tasas.py sin red y contar peticiones HTTP.
+# ================================================================
+from __future__ import annotations
+
+import json
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlparse
+
+FECHA_STUB = "2024-01-02"
+
+TASAS_EUR: Dict[str, float] = {
+    "EUR": 1.0,
+    "USD": 1.0956,
+    "GBP": 0.8651,
+    "JPY": 155.72,
+    "CHF": 0.9305,
+    "MXN": 18.72,
+    "DOP": 63.85,   # Frankfurter no publica DOP; aquí sí para las demos
+}
+
+
+def tabla_desde(base: str, tasas_eur: Dict[str, float] = TASAS_EUR) -> Dict[str, float]:
+    """Tasas para 1 unidad de `base`, sin incluir la propia base (como la API)."""
+    unidad = tasas_eur[base]
+    return {m: round(v / unidad, 6) for m, v in tasas_eur.items() if m != base}
+
+
+def publicacion(dia: date) -> date:
+    """Último día hábil ≤ `dia` (el BCE no publica en fin de semana)."""
+    while dia.weekday() >= 5:
+        dia -= timedelta(days=1)
+    return dia
+
+
+def tasas_del_dia(dia: date, tasas_eur: Dict[str, float] = TASAS_EUR) -> Dict[str, float]:
+    """Tabla EUR de una fecha: la fija con una variación pequeña y determinista."""
+    factor = 1 + (dia.toordinal() % 30) / 1000
+    return {m: (v if m == "EUR" else round(v * factor, 6)) for m, v in tasas_eur.items()}
+
+
+class _Manejador(BaseHTTPRequestHandler):
+    server: "_Servidor"
+
+    def log_message(self, *args):       # silencia el log por petición
+        pass
+
+    def _responder(self, codigo: int, cuerpo: dict) -> None:
+        datos = json.dumps(cuerpo).encode()
+        self.send_response(codigo)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(datos)))
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def do_GET(self):
+        if self.server.contar():
+            return self._responder(503, {"message": "service unavailable"})
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        base = params.get("from", "EUR").upper()
+        monto = float(params.get("amount", 1))
+        if base not in self.server.tasas:
+            return self._responder(404, {"message": "not found"})
+        ruta = url.path.lstrip("/")
+        try:
+            if ruta == "latest":
+                cuerpo = {"date": FECHA_STUB, "rates": self._tabla(self.server.tasas, base, monto, params)}
+            elif ".." in ruta:
+                inicio, fin = (date.fromisoformat(p) for p in ruta.split(".."))
+                dia, serie = publicacion(inicio), {}
+                while dia <= fin:
+                    if dia.weekday() < 5:
+                        serie[dia.isoformat()] = self._tabla(
+                            tasas_del_dia(dia, self.server.tasas), base, monto, params
+                        )
+                    dia += timedelta(days=1)
+                cuerpo = {"start_date": min(serie), "end_date": max(serie), "rates": serie}
+            else:
+                dia = publicacion(date.fromisoformat(ruta))
+                cuerpo = {
+                    "date": dia.isoformat(),
+                    "rates": self._tabla(tasas_del_dia(dia, self.server.tasas), base, monto, params),
+                }
+        except (ValueError, KeyError):
+            return self._responder(404, {"message": "not found"})
+        self._responder(200, {"amount": monto, "base": base, **cuerpo})
+
+    @staticmethod
+    def _tabla(tasas_eur: Dict[str, float], base: str, monto: float, params: dict) -> Dict[str, float]:
+        tasas = tabla_desde(base, tasas_eur)
+        if "to" in params:
+            tasas = {d: tasas[d] for d in params["to"].upper().split(",")}
+        return {m: round(v * monto, 6) for m, v in tasas.items()}
+
+
+class _Servidor(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, direccion, tasas: Dict[str, float], fallos: int):
+        super().__init__(direccion, _Manejador)
+        self.tasas = tasas
+        self.fallos = fallos
+        self.peticiones = 0
+        self._lock = threading.Lock()
+
+    def contar(self) -> bool:
+        """Cuenta la petición; True si debe fallar con 503 (simula caídas)."""
+        with self._lock:
+            self.peticiones += 1
+            if self.fallos > 0:
+                self.fallos -= 1
+                return True
+            return False
+
+
+class ServidorStub:
+    """Context manager: levanta el stub en 127.0.0.1 en un puerto libre.
+
+    `fallos` = nº de primeras peticiones que responden 503 (para reintentos).
+    """
+
+    def __init__(self, tasas: Optional[Dict[str, float]] = None, puerto: int = 0, fallos: int = 0):
+        self._servidor = _Servidor(("127.0.0.1", puerto), dict(tasas or TASAS_EUR), fallos)
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, puerto = self._servidor.server_address[:2]
+        return f"http://{host}:{puerto}"
+
+    @property
+    def peticiones(self) -> int:
+        return self._servidor.peticiones
+
+    def __enter__(self) -> "ServidorStub":
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+
+if __name__ == "__main__":
+    with ServidorStub(puerto=8080) as stub:
+        print(f"  Stub Frankfurter escuchando en {stub.url} (Ctrl+C para salir)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,190 @@
+# ================================================================
+# Descarga ASÍNCRONA y concurrente de tasas (asyncio.gather)
+# ¿QUÉ?  Cliente async que pide muchas bases/fechas a la vez:
+#        pool de conexiones, semáforo de peticiones en vuelo,
+#        fusión de peticiones duplicadas y reintentos con backoff.
+# ¿PARA QUÉ?  Con requests.get bloqueante (1.Conversor_divisa.py)
+#        N bases = N esperas en serie; aquí se solapan (sección 26
+#        de avanzado.py: asyncio.gather).
+# ================================================================
+from __future__ import annotations
+
+import asyncio
+import random
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import requests
+
+from motor_tasas import URL_FRANKFURTER, ErrorTasas
+from singleflight import SingleFlightAsync
+
+try:
+    import aiohttp
+except ImportError:          # sin aiohttp: requests.Session en hilos (también reutiliza conexiones)
+    aiohttp = None
+
+Clave = Tuple[str, str]      # (ruta, base)
+
+
+class _Reintentable(Exception):
+    """Fallo transitorio (red, timeout, 429/5xx): se vuelve a intentar."""
+
+
+class ClienteTasasAsync:
+    """Uso:
+        async with ClienteTasasAsync() as cliente:
+            tablas = await cliente.tablas(["USD", "EUR", "GBP"])
+
+    Sin `async with` también funciona (sesión y semáforo se crean en la
+    primera petición); entonces hay que llamar a `await cliente.cerrar()`.
+    """
+
+    def __init__(
+        self,
+        url_base: str = URL_FRANKFURTER,
+        max_en_vuelo: int = 10,
+        reintentos: int = 3,
+        espera_base: float = 0.2,
+        timeout: float = 10.0,
+    ):
+        self.url_base = url_base.rstrip("/")
+        self.max_en_vuelo = max_en_vuelo
+        self.reintentos = reintentos
+        self.espera_base = espera_base
+        self.timeout = timeout
+        self.peticiones = 0                     # peticiones HTTP reales (incl. reintentos)
+        self.vuelos = SingleFlightAsync()      # fusiona peticiones idénticas en vuelo
+        self._semaforo: Optional[asyncio.Semaphore] = None
+        self._sesion: Any = None
+
+    # ------------------------------------------------------------
+    # Ciclo de vida: una sola sesión = un solo pool de conexiones
+    # ------------------------------------------------------------
+    async def __aenter__(self) -> "ClienteTasasAsync":
+        self._abrir()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.cerrar()
+
+    def _abrir(self) -> None:
+        """Crea semáforo y sesión en la primera petición si no se usó `async with`."""
+        if self._semaforo is None:
+            self._semaforo = asyncio.Semaphore(self.max_en_vuelo)
+        if self._sesion is not None:
+            return
+        if aiohttp is not None:
+            self._sesion = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_en_vuelo),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        else:
+            self._sesion = requests.Session()
+            adaptador = requests.adapters.HTTPAdapter(pool_maxsize=self.max_en_vuelo)
+            self._sesion.mount("http://", adaptador)
+            self._sesion.mount("https://", adaptador)
+
+    async def cerrar(self) -> None:
+        if self._sesion is None:
+            return
+        sesion, self._sesion = self._sesion, None
+        if aiohttp is not None:
+            await sesion.close()
+        else:
+            sesion.close()
+
+    # ------------------------------------------------------------
+    # Una petición
+    # ------------------------------------------------------------
+    @staticmethod
+    def _transitorio(estado: int) -> bool:
+        return estado == 429 or estado >= 500
+
+    async def _pedir(self, ruta: str, base: str) -> dict:
+        url = f"{self.url_base}/{ruta}"
+        self.peticiones += 1
+        # El estado se mira ANTES de leer el JSON: un 502/503 de un proxy
+        # suele traer HTML y debe reintentarse, no fallar al decodificar.
+        estado, datos = 0, None
+        try:
+            if aiohttp is not None:
+                async with self._sesion.get(url, params={"from": base}) as resp:
+                    estado = resp.status
+                    if not self._transitorio(estado):
+                        datos = await resp.json(content_type=None)
+            else:
+                resp = await asyncio.to_thread(
+                    self._sesion.get, url, params={"from": base}, timeout=self.timeout
+                )
+                estado = resp.status_code
+                if not self._transitorio(estado):
+                    datos = resp.json()
+        except ValueError as e:                 # cuerpo no JSON con estado definitivo
+            raise ErrorTasas(f"{ruta} ({base}): respuesta inválida (HTTP {estado}): {e}") from e
+        except (asyncio.TimeoutError, OSError, requests.RequestException) as e:
+            raise _Reintentable(str(e)) from e
+        except Exception as e:
+            if aiohttp is not None and isinstance(e, aiohttp.ClientError):
+                raise _Reintentable(str(e)) from e
+            raise
+        if self._transitorio(estado):
+            raise _Reintentable(f"HTTP {estado}")
+        if "rates" not in datos:
+            raise ErrorTasas(datos.get("error") or datos.get("message", f"Moneda {base} no soportada."))
+        return datos
+
+    async def _pedir_con_reintentos(self, ruta: str, base: str) -> dict:
+        for intento in range(self.reintentos + 1):
+            try:
+                async with self._semaforo:       # tope de peticiones en vuelo
+                    return await self._pedir(ruta, base)
+            except _Reintentable as e:
+                if intento == self.reintentos:
+                    raise ErrorTasas(f"{ruta} ({base}): {e} tras {intento + 1} intentos") from e
+                # backoff exponencial con jitter, FUERA del semáforo
+                await asyncio.sleep(self.espera_base * 2 ** intento * random.uniform(0.5, 1.5))
+        raise AssertionError("inalcanzable")
+
+    async def obtener(self, ruta: str, base: str = "EUR") -> dict:
+        """JSON de /ruta?from=base; peticiones idénticas simultáneas se fusionan."""
+        self._abrir()
+        clave: Clave = (ruta, base.upper())
+        return await self.vuelos.hacer(clave, self._pedir_con_reintentos, *clave)
+
+    # ------------------------------------------------------------
+    # Muchas a la vez (asyncio.gather)
+    # ------------------------------------------------------------
+    async def tabla(self, base: str, fecha: str = "latest") -> Dict[str, float]:
+        datos = await self.obtener(fecha, base)
+        tasas = {moneda: float(valor) for moneda, valor in datos["rates"].items()}
+        tasas[datos["base"]] = 1.0
+        return tasas
+
+    async def tablas(self, bases: Iterable[str], fecha: str = "latest") -> Dict[str, Dict[str, float]]:
+        bases = [b.upper() for b in bases]
+        resultados = await asyncio.gather(*(self.tabla(b, fecha) for b in bases))
+        return dict(zip(bases, resultados))
+
+    async def historicos(self, fechas: Iterable[str], base: str = "EUR") -> Dict[str, Dict[str, float]]:
+        fechas = list(fechas)
+        resultados = await asyncio.gather(*(self.tabla(base, f) for f in fechas))
+        return dict(zip(fechas, resultados))
+
+
+if __name__ == "__main__":
+    # Demo offline: 3 primeras peticiones fallan (503) y se reintentan
+    from stub_frankfurter import ServidorStub
+
+    async def demo(url: str) -> None:
+        async with ClienteTasasAsync(url, max_en_vuelo=4, espera_base=0.01) as cliente:
+            bases = ["USD", "EUR", "GBP", "USD", "JPY", "USD"]   # USD duplicado
+            tablas = await cliente.tablas(bases)
+            print("  1 USD -> EUR:", tablas["USD"]["EUR"])
+            fechas = [f"2024-01-{d:02d}" for d in range(1, 11)]
+            hist = await cliente.historicos(fechas)
+            print("  Histórico EUR->USD:", [hist[f]["USD"] for f in fechas[:3]], "...")
+            print("  Peticiones HTTP (con reintentos):", cliente.peticiones, "|", cliente.vuelos.stats)
+
+    with ServidorStub(fallos=3) as stub:
+        asyncio.run(demo(stub.url))
+        print("  Peticiones recibidas por el stub:", stub.peticiones)
@@ -0,0 +1,360 @@
+# ================================================================
+# BENCHMARK – secciones "calientes" de los scripts del tutorial
+# ¿QUÉ?  Un solo comando que mide cpu_bound, heavy, fib, serializar,
+#        procesar, el registro de Mascota y el conversor de divisas:
+#          · calentamiento + repeticiones (número de llamadas autoajustado)
+#          · mediana / media / desviación / mínimo por llamada
+#          · pico de memoria (tracemalloc) en una ejecución aparte
+#          · comparación con una línea base JSON (Mann-Whitney U)
+# ¿PARA QUÉ?  Saber si un cambio en estos módulos los hace más rápidos
+#        o más lentos sin fiarse de una única medición.
+#
+# Uso:
+#   python benchmark.py --guardar            # mide y guarda la base LOCAL
+#   python benchmark.py                      # mide y compara con la base
+#   python benchmark.py --solo fib,procesar --repeticiones 30
+# La base (benchmark_base.json) no se versiona: los tiempos absolutos
+# solo valen en la máquina y el intérprete que los midieron, así que se
+# guarda su huella y no se compara si no coincide.
+# Código de salida 1 si algún caso es significativamente más lento.
+# ================================================================
+from __future__ import annotations
+
+import __future__
+import argparse
+import ast
+import importlib
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+RAIZ = Path(__file__).resolve().parent
+BASE_POR_DEFECTO = RAIZ / "benchmark_base.json"
+
+
+# ------------------------------------------------------------
+# Carga de los módulos medidos
+# ------------------------------------------------------------
+def importar(directorio: Path, nombre: str) -> ModuleType:
+    """Import normal: avanzado.py y extra.py no ejecutan nada al importarse."""
+    if str(directorio) not in sys.path:
+        sys.path.insert(0, str(directorio))
+    return importlib.import_module(nombre)
+
+
+def cargar(ruta: Path) -> ModuleType:
+    """Ejecuta solo imports, funciones y clases de nivel superior de `ruta`.
+
+    Para los scripts que todavía imprimen o piden datos al importarse
+    (intermedio.py): se toma únicamente lo que define nombres.
+    """
+    fuente = ruta.read_text(encoding="utf-8")
+    arbol = ast.parse(fuente, str(ruta))
+    flags = 0
+    if "from __future__ import annotations" in fuente:
+        flags = __future__.annotations.compiler_flag
+    if str(ruta.parent) not in sys.path:
+        sys.path.insert(0, str(ruta.parent))       # imports entre hermanos
+    nombre = f"bench_{ruta.stem}"
+    if nombre in sys.modules:
+        return sys.modules[nombre]
+    modulo = sys.modules[nombre] = ModuleType(nombre)     # dataclasses lo busca aquí
+    modulo.__file__ = str(ruta)
+    tipos = (ast.Import, ast.ImportFrom, ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+    for nodo in arbol.body:
+        if not isinstance(nodo, tipos):
+            continue
+        if isinstance(nodo, ast.ImportFrom) and nodo.module == "__future__":
+            continue
+        codigo = compile(ast.Module(body=[nodo], type_ignores=[]), str(ruta), "exec", flags=flags)
+        try:
+            exec(codigo, modulo.__dict__)
+        except ImportError:
+            pass          # dependencia opcional ausente: el caso que la use fallará solo
+    return modulo
+
+
+# ------------------------------------------------------------
+# Casos
+# ------------------------------------------------------------
+@dataclass
+class Caso:
+    nombre: str
+    preparar: Callable[[ExitStack], Callable[[], Any]]   # devuelve la función a medir
+    descripcion: str = ""
+
+
+def _casos() -> List[Caso]:
+    avanzado = partial(importar, RAIZ / "avanzado", "avanzado")
+    extra = partial(importar, RAIZ / "extra", "extra")
+    intermedio = RAIZ / "intermedio" / "intermedio.py"
+
+    def cpu_bound(_):
+        f = avanzado().cpu_bound
+        return lambda: f(20_000)
+
+    def heavy(_):
+        f = extra().heavy
+        return lambda: f(100_000)
+
+    def fib(_):
+        f = avanzado().fib
+
+        def correr():
+            f.cache_clear()
+            return f(200)
+        return correr
+
+    def serializar(_):
+        f = avanzado().serializar
+        datos = ["abc", {"z": 1, "a": 2}, {3, 1, 2}, [1, 2, 3], 42] * 200
+        return lambda: [f(x) for x in datos]
+
+    def serializadores(_):
+        Serializador = importar(RAIZ / "avanzado", "serializadores").Serializador
+        f = Serializador("json").serializar_muchos
+        datos = ["abc", {"z": 1, "a": 2}, {3, 1, 2}, [1, 2, 3], 42] * 200
+        return lambda: f(datos)
+
+    def procesar(_):
+        f = extra().procesar
+        datos = [{"type": "point", "x": 1, "y": 2}, [10, 20, 30], "Hi", "largo", 7] * 200
+        return lambda: [f(x) for x in datos]
+
+    def mascota(_):
+        Mascota = cargar(intermedio).Mascota
+
+        def correr():
+            Mascota._registro.limpiar()
+            # el registro es débil: hay que retener las instancias para contarlas
+            vivas = [Mascota(f"m{i}", "perro") for i in range(10_000)]
+            return Mascota.cantidad(), len(vivas)
+        return correr
+
+    def conversor(pila: ExitStack):
+        sys.path.insert(0, str(RAIZ / "basico"))
+        from motor_tasas import MotorTasas
+        from stub_frankfurter import ServidorStub
+
+        stub = pila.enter_context(ServidorStub())
+        motor = MotorTasas(stub.url)
+        filas = [(100.0, "USD", "DOP"), (5.5, "EUR", "JPY"), (1.0, "GBP", "USD")] * 1_000
+        return lambda: motor.convertir_lote(filas)
+
+    def conversor_frio(pila: ExitStack):
+        sys.path.insert(0, str(RAIZ / "basico"))
+        from motor_tasas import MotorTasas
+        from stub_frankfurter import ServidorStub
+
+        stub = pila.enter_context(ServidorStub())
+        return lambda: MotorTasas(stub.url).tasa("USD", "DOP")
+
+    return [
+        Caso("cpu_bound", cpu_bound, "avanzado 27: Σi², n=20k"),
+        Caso("heavy", heavy, "extra 50: Σi², n=100k"),
+        Caso("fib", fib, "avanzado 31: fib(200) con caché vacía"),
+        Caso("serializar", serializar, "avanzado 24: 1000 objetos"),
+        Caso("serializadores", serializadores, "avanzado/serializadores: mismos 1000 en lote"),
+        Caso("procesar", procesar, "extra 52: 1000 match-case"),
+        Caso("mascota", mascota, "intermedio 11: 10k instancias registradas"),
+        Caso("conversor", conversor, "basico: 3000 conversiones (tabla en caché)"),
+        Caso("conversor_frio", conversor_frio, "basico: tasa con descarga (stub local)"),
+    ]
+
+
+# ------------------------------------------------------------
+# Medición
+# ------------------------------------------------------------
+@dataclass
+class Resultado:
+    nombre: str
+    numero: int                                         # llamadas por repetición
+    muestras: List[float] = field(default_factory=list)  # s por llamada
+    pico_memoria: int = 0                               # bytes
+
+    @property
+    def mediana(self) -> float:
+        return statistics.median(self.muestras)
+
+    def resumen(self) -> Dict[str, float]:
+        return {
+            "mediana": self.mediana,
+            "media": statistics.fmean(self.muestras),
+            "desviacion": statistics.stdev(self.muestras) if len(self.muestras) > 1 else 0.0,
+            "minimo": min(self.muestras),
+        }
+
+
+def _autoajustar(fn: Callable[[], Any], objetivo: float) -> int:
+    """Llamadas por repetición para que cada una dure ≥ objetivo (como timeit)."""
+    numero = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(numero):
+            fn()
+        if time.perf_counter() - t0 >= objetivo or numero >= 1 << 20:
+            return numero
+        numero *= 2
+
+
+def medir(caso: Caso, repeticiones: int, calentamiento: int, objetivo: float) -> Resultado:
+    with ExitStack() as pila:
+        fn = caso.preparar(pila)
+        numero = _autoajustar(fn, objetivo)
+        resultado = Resultado(caso.nombre, numero)
+        for i in range(calentamiento + repeticiones):
+            t0 = time.perf_counter()
+            for _ in range(numero):
+                fn()
+            if i >= calentamiento:
+                resultado.muestras.append((time.perf_counter() - t0) / numero)
+
+        # Memoria en una pasada aparte: tracemalloc distorsiona los tiempos
+        tracemalloc.start()
+        try:
+            fn()
+            resultado.pico_memoria = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return resultado
+
+
+# ------------------------------------------------------------
+# Comparación estadística
+# ------------------------------------------------------------
+def mann_whitney(a: Sequence[float], b: Sequence[float]) -> float:
+    """p-valor bilateral de Mann-Whitney U (aproximación normal, sin SciPy)."""
+    n1, n2 = len(a), len(b)
+    if n1 < 2 or n2 < 2:
+        return 1.0
+    todos = sorted([(x, 0) for x in a] + [(x, 1) for x in b])
+    rangos = [0.0] * len(todos)
+    i = 0
+    while i < len(todos):
+        j = i
+        while j + 1 < len(todos) and todos[j + 1][0] == todos[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            rangos[k] = (i + j) / 2 + 1                     # empates: rango medio
+        i = j + 1
+    r1 = sum(r for r, (_, grupo) in zip(rangos, todos) if grupo == 0)
+    u = r1 - n1 * (n1 + 1) / 2
+    sigma = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
+    z = (u - n1 * n2 / 2) / sigma
+    return 2 * (1 - statistics.NormalDist().cdf(abs(z)))
+
+
+def comparar(actual: Resultado, base: Dict[str, Any], alfa: float, umbral: float) -> str:
+    ratio = actual.mediana / base["mediana"]
+    p = mann_whitney(actual.muestras, base["muestras"])
+    if p < alfa and ratio > 1 + umbral:
+        veredicto = "MÁS LENTO"
+    elif p < alfa and ratio < 1 - umbral:
+        veredicto = "más rápido"
+    else:
+        veredicto = "sin cambio"
+    return f"×{ratio:5.2f}  p={p:.3f}  {veredicto}"
+
+
+def _formato_tiempo(s: float) -> str:
+    for unidad, escala in (("s", 1), ("ms", 1e-3), ("µs", 1e-6)):
+        if s >= escala:
+            return f"{s / escala:7.2f} {unidad}"
+    return f"{s / 1e-9:7.2f} ns"
+
+
+def huella() -> Dict[str, Any]:
+    """Lo que tiene que coincidir para que dos tiempos sean comparables."""
+    return {
+        "python": sys.version,
+        "implementacion": platform.python_implementation(),
+        "plataforma": platform.platform(),
+        "maquina": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark de las secciones calientes")
+    parser.add_argument("--solo", help="casos separados por comas (por defecto, todos)")
+    parser.add_argument("--repeticiones", type=int, default=15)
+    parser.add_argument("--calentamiento", type=int, default=3)
+    parser.add_argument("--objetivo", type=float, default=0.02, help="s mínimos por repetición")
+    parser.add_argument("--base", type=Path, default=BASE_POR_DEFECTO)
+    parser.add_argument("--guardar", action="store_true", help="sobrescribe la línea base")
+    parser.add_argument("--alfa", type=float, default=0.01, help="nivel de significación")
+    parser.add_argument("--umbral", type=float, default=0.15,
+                        help="cambio relativo mínimo (entre sesiones distintas el ruido supera el 5 %%)")
+    parser.add_argument("--listar", action="store_true")
+    args = parser.parse_args(argv)
+
+    casos = _casos()
+    if args.listar:
+        for caso in casos:
+            print(f"  {caso.nombre:<16} {caso.descripcion}")
+        return 0
+    if args.solo:
+        elegidos = set(args.solo.split(","))
+        desconocidos = elegidos - {c.nombre for c in casos}
+        if desconocidos:
+            parser.error(f"casos desconocidos: {', '.join(sorted(desconocidos))}")
+        casos = [c for c in casos if c.nombre in elegidos]
+
+    base: Dict[str, Any] = {}
+    comparable = False
+    if args.base.exists():
+        guardado = json.loads(args.base.read_text(encoding="utf-8"))
+        base = guardado.get("casos", {})
+        anterior = guardado.get("huella")
+        distinto = {k: (anterior.get(k), v) for k, v in huella().items()
+                    if anterior.get(k) != v} if anterior else {}
+        comparable = anterior is not None and not distinto
+        if not comparable and not args.guardar:
+            print(f"  La base {args.base.name} se midió en otro entorno; no se compara "
+                  f"(vuelve a crearla con --guardar):")
+            for clave, (antes, ahora) in distinto.items():
+                print(f"    {clave}: {antes!r} ≠ {ahora!r}")
+            if anterior is None:
+                print("    sin huella del entorno (formato antiguo)")
+    elif not args.guardar:
+        print("  Sin línea base: crea una en esta máquina con --guardar")
+
+    resultados: List[Resultado] = []
+    lentos = 0
+    for caso in casos:
+        r = medir(caso, args.repeticiones, args.calentamiento, args.objetivo)
+        resultados.append(r)
+        res = r.resumen()
+        linea = (f"  {caso.nombre:<16} {_formato_tiempo(res['mediana'])} "
+                 f"±{res['desviacion'] / res['mediana']:5.1%}  "
+                 f"mem {r.pico_memoria / 1024:9.1f} KiB")
+        if comparable and caso.nombre in base and not args.guardar:
+            comparacion = comparar(r, base[caso.nombre], args.alfa, args.umbral)
+            lentos += "MÁS LENTO" in comparacion
+            linea += "  " + comparacion
+        print(linea)
+
+    if args.guardar:
+        anteriores = base if comparable else {}           # no mezclar entornos
+        datos = {
+            "huella": huella(),
+            "casos": {**anteriores, **{r.nombre: {**r.resumen(), **asdict(r)} for r in resultados}},
+        }
+        args.base.write_text(json.dumps(datos, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"  Línea base guardada en {args.base}")
+    return 1 if lentos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,279 @@
+# ================================================================
+# ARREGLO DE PUNTOS – Punto3D por columnas con NumPy
+# ¿QUÉ?  ArregloPuntos guarda x, y, z de N puntos en un único bloque
+#        float64 de forma (3, N): cada coordenada es una fila contigua.
+#        Normas, distancias y vecino más cercano se calculan vectorizados;
+#        arr[i] devuelve una VistaPunto (no copia), arr[a:b] otro arreglo
+#        que comparte memoria. Se convierte desde/hacia listas de Punto3D.
+# ¿PARA QUÉ?  Punto3D (extra.py, 41) es un objeto por punto (~100 B con
+#        cabecera y 4 floats en caja) y calcula `norma` uno a uno en
+#        __post_init__. Con 10⁷ puntos eso son GB y segundos; aquí 24 B
+#        por punto y la velocidad de NumPy.
+#
+# Benchmark:  python arreglo_puntos.py [--n 10000000] [--muestra 1000000]
+# ================================================================
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+Coordenadas = Union[Sequence[float], "VistaPunto", Any]
+ELEMENTOS = 1 << 22        # tope de la matriz temporal de mas_cercano (32 MB en float64)
+
+
+class VistaPunto:
+    """Un punto dentro de un ArregloPuntos: lee del bloque compartido, sin copiar."""
+
+    __slots__ = ("_datos", "_i")
+
+    def __init__(self, datos: np.ndarray, i: int):
+        self._datos = datos
+        self._i = i
+
+    @property
+    def x(self) -> float:
+        return float(self._datos[0, self._i])
+
+    @property
+    def y(self) -> float:
+        return float(self._datos[1, self._i])
+
+    @property
+    def z(self) -> float:
+        return float(self._datos[2, self._i])
+
+    @property
+    def norma(self) -> float:
+        x, y, z = self._datos[:, self._i]
+        return float((x * x + y * y + z * z) ** 0.5)
+
+    def a_punto(self):
+        from extra import Punto3D
+        return Punto3D(self.x, self.y, self.z)
+
+    def __iter__(self) -> Iterator[float]:
+        return iter(self._datos[:, self._i].tolist())
+
+    def __repr__(self) -> str:
+        return f"VistaPunto(x={self.x!r}, y={self.y!r}, z={self.z!r})"
+
+
+def _como_xyz(punto: Coordenadas) -> np.ndarray:
+    """Punto3D, VistaPunto o secuencia (x, y[, z]) → vector float64 de 3."""
+    if hasattr(punto, "x"):
+        return np.array([punto.x, punto.y, getattr(punto, "z", 0.0)], dtype=np.float64)
+    xyz = np.asarray(punto, dtype=np.float64).ravel()
+    if xyz.size == 2:
+        xyz = np.append(xyz, 0.0)
+    if xyz.size != 3:
+        raise ValueError(f"se esperaban 2 o 3 coordenadas, no {xyz.size}")
+    return xyz
+
+
+class ArregloPuntos:
+    """N puntos 3D en un bloque float64 (3, N).
+
+    arr = ArregloPuntos.desde_puntos(lista_de_punto3d)
+    arr.normas()                    → ndarray (N,)
+    arr.distancias((1, 2, 3))       → distancia de cada punto a uno dado
+    arr.mas_cercano(consultas)      → (índices, distancias) del vecino en arr
+    arr[i] / arr[a:b] / arr[mask]   → VistaPunto / vista / copia (índices fancy)
+    """
+
+    __slots__ = ("_datos",)
+
+    def __init__(self, x: Iterable[float], y: Iterable[float], z: Optional[Iterable[float]] = None):
+        x = np.asarray(x, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        z = np.zeros_like(x) if z is None else np.asarray(z, dtype=np.float64)
+        if not (x.shape == y.shape == z.shape) or x.ndim != 1:
+            raise ValueError("x, y y z deben ser vectores de la misma longitud")
+        datos = np.empty((3, x.size), dtype=np.float64)
+        datos[0], datos[1], datos[2] = x, y, z
+        self._datos = datos
+
+    @classmethod
+    def _envolver(cls, datos: np.ndarray) -> "ArregloPuntos":
+        arr = cls.__new__(cls)
+        arr._datos = datos
+        return arr
+
+    @classmethod
+    def vacio(cls, n: int) -> "ArregloPuntos":
+        return cls._envolver(np.zeros((3, n), dtype=np.float64))
+
+    @classmethod
+    def desde_puntos(cls, puntos: Iterable[Any]) -> "ArregloPuntos":
+        """Lista de Punto3D (o cualquier cosa con .x .y .z) → arreglo."""
+        puntos = puntos if isinstance(puntos, Sequence) else list(puntos)
+        plano = np.fromiter((c for p in puntos for c in (p.x, p.y, p.z)),
+                            dtype=np.float64, count=3 * len(puntos))
+        return cls._envolver(np.ascontiguousarray(plano.reshape(-1, 3).T))
+
+    def a_puntos(self) -> List[Any]:
+        from extra import Punto3D
+        return [Punto3D(x, y, z) for x, y, z in zip(*self._datos.tolist())]
+
+    # --- acceso ------------------------------------------------
+    @property
+    def x(self) -> np.ndarray:
+        return self._datos[0]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._datos[1]
+
+    @property
+    def z(self) -> np.ndarray:
+        return self._datos[2]
+
+    @property
+    def nbytes(self) -> int:
+        return self._datos.nbytes
+
+    def __len__(self) -> int:
+        return self._datos.shape[1]
+
+    def __getitem__(self, indice):
+        if isinstance(indice, (int, np.integer)):
+            n = len(self)
+            if not -n <= indice < n:
+                raise IndexError("índice fuera de rango")
+            return VistaPunto(self._datos, int(indice) % n)
+        return ArregloPuntos._envolver(self._datos[:, indice])
+
+    def __iter__(self) -> Iterator[VistaPunto]:
+        datos = self._datos
+        return (VistaPunto(datos, i) for i in range(datos.shape[1]))
+
+    def __repr__(self) -> str:
+        return f"ArregloPuntos(n={len(self)}, {self.nbytes / 1e6:.1f} MB)"
+
+    # --- cálculo vectorizado ----------------------------------
+    def normas(self) -> np.ndarray:
+        d = self._datos
+        return np.sqrt(np.einsum("ij,ij->j", d, d))
+
+    def distancias(self, otro: Union["ArregloPuntos", Coordenadas]) -> np.ndarray:
+        """A un punto (Punto3D/tupla) o, elemento a elemento, a otro arreglo de igual N."""
+        if isinstance(otro, ArregloPuntos):
+            if len(otro) != len(self):
+                raise ValueError("los arreglos deben tener la misma longitud")
+            diff = self._datos - otro._datos
+        else:
+            diff = self._datos - _como_xyz(otro)[:, None]
+        return np.sqrt(np.einsum("ij,ij->j", diff, diff))
+
+    def mas_cercano(self, consultas: Union["ArregloPuntos", Coordenadas]) -> Tuple[Any, Any]:
+        """Vecino más cercano en self de cada consulta (fuerza bruta por bloques).
+
+        Un punto → (índice, distancia); un ArregloPuntos → (índices, distancias).
+        Usa |a-b|² = |a|² + |b|² - 2·a·b para que el bloque sea una sola matmul,
+        con todo centrado en la media de self: lejos del origen (coordenadas
+        ~1e7) |a|² y 2·a·b se cancelan y float64 pierde casi todos los dígitos.
+        La distancia devuelta se recalcula exacta desde el vecino elegido.
+        """
+        if len(self) == 0:
+            raise ValueError("arreglo vacío")
+        if not isinstance(consultas, ArregloPuntos):
+            d = self.distancias(consultas)
+            i = int(np.argmin(d))
+            return i, float(d[i])
+        centro = self._datos.mean(axis=1, keepdims=True)
+        base = self._datos - centro
+        base_sq = np.einsum("ij,ij->j", base, base)
+        n_base = base.shape[1]
+        bloque_q = max(1, ELEMENTOS // n_base)
+        bloque_b = max(1, ELEMENTOS // bloque_q)
+        indices = np.empty(len(consultas), dtype=np.intp)
+        for qi in range(0, len(consultas), bloque_q):
+            q = consultas._datos[:, qi:qi + bloque_q] - centro
+            filas = np.arange(q.shape[1])
+            mejor_i = np.zeros(q.shape[1], dtype=np.intp)
+            mejor_d = np.full(q.shape[1], np.inf)
+            for bi in range(0, n_base, bloque_b):
+                # falta |q|² (igual en toda la fila): no cambia el argmin
+                m = base_sq[None, bi:bi + bloque_b] - 2.0 * (q.T @ base[:, bi:bi + bloque_b])
+                j = np.argmin(m, axis=1)
+                d = m[filas, j]
+                mejora = d < mejor_d
+                mejor_i[mejora] = j[mejora] + bi
+                mejor_d[mejora] = d[mejora]
+            indices[qi:qi + q.shape[1]] = mejor_i
+        diff = self._datos[:, indices] - consultas._datos
+        return indices, np.sqrt(np.einsum("ij,ij->j", diff, diff))
+
+
+# ------------------------------------------------------------
+# Benchmark
+# ------------------------------------------------------------
+def benchmark(n: int, muestra: int) -> None:
+    import gc
+    import time
+    import tracemalloc
+
+    from extra import Punto3D
+
+    rng = np.random.default_rng(0)
+    xyz = rng.standard_normal((3, n))
+
+    # Los objetos se miden sobre una muestra y se extrapolan; la memoria
+    # en una pasada aparte (tracemalloc ralentiza cada asignación)
+    xs, ys, zs = (c.tolist() for c in xyz[:, :muestra])
+    t0 = time.perf_counter()
+    objetos = [Punto3D(a, b, c) for a, b, c in zip(xs, ys, zs)]
+    t_objetos = time.perf_counter() - t0
+    del objetos
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    objetos = [Punto3D(a, b, c) for a, b, c in zip(xs, ys, zs)]
+    por_objeto = (tracemalloc.get_traced_memory()[0] - antes) / muestra
+    tracemalloc.stop()
+    del xs, ys, zs
+
+    t0 = time.perf_counter()
+    arr = ArregloPuntos(*xyz)
+    t_arr = time.perf_counter() - t0
+
+    print(f"  {n:,} puntos")
+    print(f"  {'':<24} {'memoria':>10} {'normas':>10}")
+    print(f"  {'list[Punto3D]':<24} {por_objeto * n / 1e9:8.2f} GB {t_objetos * n / muestra:9.2f}s"
+          f"  (extrapolado de {muestra:,}; norma en __post_init__)")
+    t0 = time.perf_counter()
+    normas = arr.normas()
+    t_normas = time.perf_counter() - t0
+    print(f"  {'ArregloPuntos':<24} {arr.nbytes / 1e9:8.2f} GB {t_normas:9.2f}s"
+          f"  (×{por_objeto * n / arr.nbytes:.0f} menos memoria; construir {t_arr:.2f}s)")
+    assert np.allclose(normas[:muestra], [p.norma for p in objetos])
+
+    # Vecino más cercano: min() de Python vs bloque vectorizado
+    k = min(muestra, 20_000)
+    consultas = ArregloPuntos(*rng.standard_normal((3, 50)))
+    t0 = time.perf_counter()
+    esperados = [min(range(k), key=lambda j, q=q: (objetos[j].x - q.x) ** 2
+                     + (objetos[j].y - q.y) ** 2 + (objetos[j].z - q.z) ** 2) for q in consultas]
+    t_py = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    indices, _ = arr[:k].mas_cercano(consultas)
+    t_np = time.perf_counter() - t0
+    assert indices.tolist() == esperados
+    print(f"  vecino más cercano ({len(consultas)} consultas sobre {k:,}): "
+          f"Python {t_py:.3f}s, NumPy {t_np:.4f}s (×{t_py / t_np:.0f})")
+
+    # Ida y vuelta
+    ida = ArregloPuntos.desde_puntos(objetos[:1000])
+    assert ida.a_puntos() == objetos[:1000]
+    assert ida[3].a_punto() == objetos[3] and isinstance(ida[1:5], ArregloPuntos)
+    print("  ✓ desde_puntos / a_puntos conservan los Punto3D")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="ArregloPuntos frente a list[Punto3D]")
+    parser.add_argument("--n", type=int, default=10_000_000)
+    parser.add_argument("--muestra", type=int, default=1_000_000, help="objetos Punto3D a medir de verdad")
+    args = parser.parse_args()
+    benchmark(args.n, min(args.muestra, args.n))
@@ -0,0 +1,408 @@
+# ================================================================
+# DESPACHO COMPILADO – tabla indexada en vez de `match` lineal
+# ¿QUÉ?  Los `case` de procesar (extra.py, 52) escritos como objetos:
+#          Mapa({"type": "point", "x": Captura("x")})   ≈ {"type": "point", "x": x}
+#          Secuencia([Captura("x"), Captura("y")], resto="_")  ≈ [x, y, *_]
+#          Tipo(str, Captura("s"))                       ≈ str(s)
+#          Captura("n", patron) / Cualquiera() / Literal(v)
+#        Despachador los compila a funciones y construye un índice por
+#        FORMA del valor: (tipo, valor del discriminador) para mapas,
+#        (tipo, longitud) para secuencias, (tipo,) para el resto. Cada
+#        forma guarda, en orden de prioridad, solo los casos que pueden
+#        coincidir → mismo resultado que `match`, coste ~O(1).
+# ¿PARA QUÉ?  Enrutar millones de mensajes por "type" con 100 reglas
+#        no debería probar 99 `case` antes de acertar.
+#
+# Benchmark:  python despacho.py      (punto de cruce vs match)
+# ================================================================
+from __future__ import annotations
+
+import time
+from collections import Counter
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Comparador = Callable[[Any, Dict[str, Any]], bool]      # (valor, capturas) → ¿coincide?
+
+_FALTA = object()          # clave ausente en el mapa
+_OTRO = object()           # valor del discriminador que ningún caso menciona
+_LARGO = object()          # secuencia más larga que cualquier patrón de longitud fija
+
+
+# ------------------------------------------------------------
+# Clasificación de tipos (mismas reglas que `match`), cacheada por tipo
+# ------------------------------------------------------------
+_FORMAS: Dict[type, str] = {}
+
+
+def _forma(tipo: type) -> str:
+    forma = _FORMAS.get(tipo)
+    if forma is None:
+        if issubclass(tipo, Mapping):
+            forma = "mapa"
+        elif issubclass(tipo, Sequence) and not issubclass(tipo, (str, bytes, bytearray)):
+            forma = "secuencia"
+        else:
+            forma = "otro"
+        _FORMAS[tipo] = forma
+    return forma
+
+
+# ------------------------------------------------------------
+# Patrones
+# ------------------------------------------------------------
+class Patron:
+    def compilar(self) -> Comparador:
+        raise NotImplementedError
+
+
+@dataclass(frozen=True)
+class Cualquiera(Patron):
+    """`case _`"""
+
+    def compilar(self) -> Comparador:
+        return lambda valor, capturas: True
+
+
+@dataclass(frozen=True)
+class Literal(Patron):
+    """`case 42` / `case "point"`; None, True y False se comparan con `is`."""
+    valor: Any
+
+    def compilar(self) -> Comparador:
+        esperado = self.valor
+        if esperado is None or isinstance(esperado, bool):
+            return lambda valor, capturas: valor is esperado
+        return lambda valor, capturas: valor == esperado
+
+
+@dataclass(frozen=True)
+class Condicion(Patron):
+    """Predicado arbitrario (no existe en `match`; útil para reglas de datos)."""
+    funcion: Callable[[Any], bool]
+
+    def compilar(self) -> Comparador:
+        funcion = self.funcion
+        return lambda valor, capturas: bool(funcion(valor))
+
+
+@dataclass(frozen=True)
+class Captura(Patron):
+    """`case x` o `case <patron> as x`."""
+    nombre: str
+    patron: Any = field(default_factory=Cualquiera)
+
+    def compilar(self) -> Comparador:
+        nombre, sub = self.nombre, como_patron(self.patron).compilar()
+
+        def capturar(valor, capturas):
+            if sub(valor, capturas):
+                capturas[nombre] = valor
+                return True
+            return False
+        return capturar
+
+
+@dataclass(frozen=True)
+class Tipo(Patron):
+    """`case str(s)` → Tipo(str, Captura("s")); `case P(x=0)` → Tipo(P, atributos={"x": 0}).
+
+    `patron` se aplica al valor completo (como el posicional de los tipos
+    nativos: bool, bytes, dict, float, int, list, str, tuple…).
+    """
+    tipo: type
+    patron: Any = None
+    atributos: Dict[str, Any] = field(default_factory=dict)
+
+    def compilar(self) -> Comparador:
+        tipo = self.tipo
+        sub = como_patron(self.patron).compilar() if self.patron is not None else None
+        atributos = [(nombre, como_patron(p).compilar()) for nombre, p in self.atributos.items()]
+
+        def comparar(valor, capturas):
+            if not isinstance(valor, tipo):
+                return False
+            if sub is not None and not sub(valor, capturas):
+                return False
+            for nombre, coincide in atributos:
+                x = getattr(valor, nombre, _FALTA)
+                if x is _FALTA or not coincide(x, capturas):
+                    return False
+            return True
+        return comparar
+
+
+@dataclass(frozen=True)
+class Mapa(Patron):
+    """`case {"type": "point", "x": x, **resto}`"""
+    claves: Dict[Any, Any]
+    resto: Optional[str] = None
+
+    def compilar(self) -> Comparador:
+        claves = [(clave, como_patron(p).compilar()) for clave, p in self.claves.items()]
+        resto, nombres = self.resto, set(self.claves)
+
+        def comparar(valor, capturas):
+            if _forma(type(valor)) != "mapa":
+                return False
+            for clave, coincide in claves:
+                x = valor.get(clave, _FALTA)
+                if x is _FALTA or not coincide(x, capturas):
+                    return False
+            if resto is not None:
+                capturas[resto] = {k: v for k, v in valor.items() if k not in nombres}
+            return True
+        return comparar
+
+
+@dataclass(frozen=True)
+class Secuencia(Patron):
+    """`case [x, y]` → Secuencia([...]); `case [x, y, *_]` → Secuencia([...], resto="_");
+    `case [*medio, z]` → Secuencia([], resto="medio", sufijo=[Captura("z")])."""
+    prefijo: List[Any]
+    resto: Optional[str] = None
+    sufijo: List[Any] = field(default_factory=list)
+
+    @property
+    def minimo(self) -> int:
+        return len(self.prefijo) + len(self.sufijo)
+
+    def compilar(self) -> Comparador:
+        prefijo = [como_patron(p).compilar() for p in self.prefijo]
+        sufijo = [como_patron(p).compilar() for p in self.sufijo]
+        resto, minimo = self.resto, self.minimo
+
+        def comparar(valor, capturas):
+            if _forma(type(valor)) != "secuencia":
+                return False
+            n = len(valor)
+            if n != minimo if resto is None else n < minimo:
+                return False
+            for i, coincide in enumerate(prefijo):
+                if not coincide(valor[i], capturas):
+                    return False
+            inicio_sufijo = n - len(sufijo)
+            for j, coincide in enumerate(sufijo):
+                if not coincide(valor[inicio_sufijo + j], capturas):
+                    return False
+            if resto is not None and resto != "_":
+                capturas[resto] = list(valor[len(prefijo):inicio_sufijo])
+            return True
+        return comparar
+
+
+def como_patron(x: Any) -> Patron:
+    """Atajos: ... → Cualquiera, dict → Mapa, list → Secuencia, tipo → Tipo,
+    función → Condicion, cualquier otro valor → Literal."""
+    if isinstance(x, Patron):
+        return x
+    if x is ...:
+        return Cualquiera()
+    if isinstance(x, dict):
+        return Mapa(x)
+    if isinstance(x, list):
+        return Secuencia(x)
+    if isinstance(x, type):
+        return Tipo(x)
+    if callable(x):
+        return Condicion(x)
+    return Literal(x)
+
+
+def _sin_capturas(patron: Patron) -> Patron:
+    while isinstance(patron, Captura):
+        patron = como_patron(patron.patron)
+    return patron
+
+
+# ------------------------------------------------------------
+# Despachador
+# ------------------------------------------------------------
+@dataclass
+class Caso:
+    patron: Any
+    accion: Callable[..., Any]                  # recibe las capturas como kwargs
+    guarda: Optional[Callable[..., bool]] = None
+    nombre: str = ""
+
+
+Candidato = Tuple[Caso, Comparador, Optional[Callable[..., bool]]]
+
+
+class Despachador:
+    """Uso:
+        d = Despachador([Caso(Mapa({"type": "a", "x": Captura("x")}), lambda x: x), ...])
+        d(valor)              # resultado de la acción del primer caso que coincide
+        d.buscar(valor)       # (caso, capturas) o None
+    """
+
+    def __init__(self, casos: List[Caso], discriminador: Any = _FALTA):
+        self.casos = list(casos)
+        self._compilados: List[Candidato] = [
+            (caso, como_patron(caso.patron).compilar(), caso.guarda) for caso in self.casos
+        ]
+        self._raices = [_sin_capturas(como_patron(caso.patron)) for caso in self.casos]
+        self.discriminador = self._elegir_discriminador() if discriminador is _FALTA else discriminador
+        # valores literales del discriminador que aparecen en algún caso
+        self._valores: set = set()
+        for raiz in self._raices:
+            literal = self._literal_discriminador(raiz)
+            if literal is not _FALTA:
+                self._valores.add(literal)
+        fijas = [r.minimo for r in self._raices if isinstance(r, Secuencia)]
+        self._max_largo = max(fijas, default=0)
+        self._indice: Dict[tuple, List[Candidato]] = {}
+
+    # --- construcción del índice ----------------------------------
+    def _elegir_discriminador(self) -> Any:
+        """La clave con valor literal que más casos Mapa usan (p. ej. "type")."""
+        votos: Counter = Counter()
+        for raiz in self._raices:
+            if isinstance(raiz, Mapa):
+                for clave, sub in raiz.claves.items():
+                    if isinstance(_sin_capturas(como_patron(sub)), Literal):
+                        votos[clave] += 1
+        return votos.most_common(1)[0][0] if votos else None
+
+    def _literal_discriminador(self, raiz: Patron) -> Any:
+        if not isinstance(raiz, Mapa) or self.discriminador not in raiz.claves:
+            return _FALTA
+        sub = _sin_capturas(como_patron(raiz.claves[self.discriminador]))
+        if isinstance(sub, Literal):
+            try:
+                hash(sub.valor)
+                return sub.valor
+            except TypeError:
+                pass
+        return _FALTA
+
+    def _puede(self, raiz: Patron, tipo: type, detalle: Any) -> bool:
+        """¿Puede `raiz` coincidir con algún valor de esta forma? (conservador)"""
+        forma = _forma(tipo)
+        if isinstance(raiz, Mapa):
+            if forma != "mapa":
+                return False
+            literal = self._literal_discriminador(raiz)
+            return literal is _FALTA or (detalle is not _OTRO and detalle is not _FALTA and literal == detalle)
+        if isinstance(raiz, Secuencia):
+            if forma != "secuencia":
+                return False
+            if detalle is _LARGO:
+                return raiz.resto is not None
+            return detalle == raiz.minimo if raiz.resto is None else detalle >= raiz.minimo
+        if isinstance(raiz, Tipo):
+            return issubclass(tipo, raiz.tipo)
+        return True                                  # Cualquiera, Literal, Condicion
+
+    def _candidatos(self, tipo: type, detalle: Any) -> List[Candidato]:
+        return [c for c, raiz in zip(self._compilados, self._raices) if self._puede(raiz, tipo, detalle)]
+
+    # --- despacho ----------------------------------------------------
+    def buscar(self, valor: Any) -> Optional[Tuple[Caso, Dict[str, Any]]]:
+        tipo = type(valor)
+        forma = _FORMAS.get(tipo) or _forma(tipo)
+        if forma == "mapa" and self.discriminador is not None:
+            detalle = valor.get(self.discriminador, _FALTA)
+            if detalle is not _FALTA:
+                try:
+                    if detalle not in self._valores:
+                        detalle = _OTRO
+                except TypeError:                      # valor no hashable
+                    detalle = _OTRO
+        elif forma == "secuencia":
+            detalle = len(valor)
+            if detalle > self._max_largo:
+                detalle = _LARGO
+        else:
+            detalle = None
+        clave = (tipo, detalle)
+        candidatos = self._indice.get(clave)
+        if candidatos is None:
+            candidatos = self._indice[clave] = self._candidatos(tipo, detalle)
+        for caso, coincide, guarda in candidatos:
+            capturas: Dict[str, Any] = {}
+            if coincide(valor, capturas) and (guarda is None or guarda(**capturas)):
+                return caso, capturas
+        return None
+
+    def __call__(self, valor: Any) -> Any:
+        encontrado = self.buscar(valor)
+        if encontrado is None:
+            return None                               # como un match sin `case _`
+        caso, capturas = encontrado
+        return caso.accion(**capturas)
+
+
+# ------------------------------------------------------------
+# procesar() de la sección 52 como tabla
+# ------------------------------------------------------------
+PROCESAR = Despachador([
+    Caso(Mapa({"type": "point", "x": Captura("x"), "y": Captura("y")}),
+         lambda x, y: f"Punto({x},{y})", nombre="punto"),
+    Caso(Secuencia([Captura("x"), Captura("y")], resto="_"),
+         lambda x, y: f"Lista empieza por {x},{y}", nombre="lista"),
+    Caso(Tipo(str, Captura("s")), lambda s: f"String corto: {s}",
+         guarda=lambda s: len(s) < 5, nombre="texto_corto"),
+    Caso(Cualquiera(), lambda: "Sin coincidencia", nombre="sin_coincidencia"),
+])
+
+
+# ------------------------------------------------------------
+# Benchmark: punto de cruce frente a `match` generado
+# ------------------------------------------------------------
+def _match_generado(n: int) -> Callable[[Any], Any]:
+    brazos = "".join(
+        f'        case {{"type": "t{i}", "x": x}}:\n            return {i} + x\n' for i in range(n)
+    )
+    codigo = f"def enrutar(msg):\n    match msg:\n{brazos}        case _:\n            return None\n"
+    espacio: Dict[str, Any] = {}
+    exec(codigo, espacio)
+    return espacio["enrutar"]
+
+
+def _despachador_generado(n: int) -> Despachador:
+    casos = [Caso(Mapa({"type": f"t{i}", "x": Captura("x")}), lambda x, i=i: i + x) for i in range(n)]
+    return Despachador(casos + [Caso(Cualquiera(), lambda: None)])
+
+
+def benchmark(mensajes: int = 200_000) -> None:
+    import random
+
+    rng = random.Random(0)
+    print(f"  {'reglas':>6} {'match (µs)':>11} {'despacho (µs)':>14} {'ratio':>7}")
+    cruce = None
+    for n in (1, 2, 4, 8, 16, 32, 64, 128, 256):
+        msgs = [{"type": f"t{rng.randrange(n)}", "x": i} for i in range(mensajes)]
+        msgs.append({"type": "desconocido", "x": 0})
+        enrutar, despachar = _match_generado(n), _despachador_generado(n)
+        tiempos = []
+        for funcion in (enrutar, despachar):
+            t0 = time.perf_counter()
+            resultados = [funcion(m) for m in msgs]
+            tiempos.append((time.perf_counter() - t0) / len(msgs) * 1e6)
+            if funcion is enrutar:
+                esperado = resultados
+        assert resultados == esperado
+        ratio = tiempos[0] / tiempos[1]
+        if cruce is None and ratio > 1:
+            cruce = n
+        print(f"  {n:>6} {tiempos[0]:>11.3f} {tiempos[1]:>14.3f} {ratio:>6.1f}×")
+    print(f"  Punto de cruce: despacho gana desde ~{cruce} reglas" if cruce else "  match gana en todo el rango")
+
+
+if __name__ == "__main__":
+    from collections import OrderedDict
+
+    from extra import procesar
+
+    # Mismos resultados que `match`, incluidos los casos límite
+    entradas = [
+        {"type": "point", "x": 1, "y": 2}, {"type": "point", "x": 1}, {"type": "point", "x": 1, "y": 2, "z": 3},
+        OrderedDict(type="point", x=0, y=0), {"type": "otro"}, {"x": 1, "y": 2}, {"type": ["no", "hash"]},
+        [10, 20, 30], [1, 2], [1], (5, 6), range(3), "Hi", "largo", "abcd", b"ab", 7, None, 2.5, {},
+    ]
+    for entrada in entradas:
+        assert PROCESAR(entrada) == procesar(entrada), entrada
+    print(f"  ✓ {len(entradas)} entradas: mismos resultados que procesar()")
+    benchmark()
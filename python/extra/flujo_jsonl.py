@@ -0,0 +1,272 @@
+# ================================================================
+# FLUJO JSONL – registros de GB en streaming hacia reglas tipo `procesar`
+# ¿QUÉ?  Lee un .jsonl línea a línea (buffer grande o mmap), decodifica
+#        cada línea por separado y la envía a la PRIMERA regla que
+#        coincide (como los `case` de procesar, extra.py 52; índice de
+#        despacho.py), contando
+#        cuántos registros atrapó cada regla. El archivo se puede
+#        repartir entre procesos por rangos de bytes alineados a '\n'.
+# ¿PARA QUÉ?  procesar() trabaja con un objeto en memoria; un log de
+#        eventos de varios GB no cabe (ni hace falta que quepa).
+#
+# Uso:  python flujo_jsonl.py eventos.jsonl [--workers 4] [--mmap]
+#       python flujo_jsonl.py --generar 500000      # demo + benchmark
+# ================================================================
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from despacho import Captura, Caso, Despachador, como_patron
+
+Ruta = Union[str, Path]
+SIN_COINCIDENCIA = "sin_coincidencia"      # equivalente a `case _`
+
+
+# ------------------------------------------------------------
+# Reglas
+# ------------------------------------------------------------
+@dataclass(frozen=True)
+class Regla:
+    """`patron` puede ser:
+        dict  → el registro es un dict con esas claves; cada valor es un
+                literal (==), un tipo (isinstance), ... (basta con que exista),
+                un dict anidado o una función predicado
+        tipo  → isinstance(registro, tipo)
+        función → predicado(registro)
+        o cualquier Patron de despacho.py (Mapa, Secuencia, Tipo…)
+    `guarda` es un `if` extra; `accion(registro)` se llama si coincide.
+    Para repartir entre procesos, guarda/accion deben ser de nivel de módulo.
+    """
+    nombre: str
+    patron: Any
+    guarda: Optional[Callable[[Any], bool]] = None
+    accion: Optional[Callable[[Any], Any]] = None
+
+
+def compilar(reglas: Sequence[Regla]) -> Callable[[Any], Tuple[str, Any]]:
+    """Despachador indexado (despacho.py): registro → (nombre de la regla, resultado)."""
+    casos = [
+        Caso(
+            Captura("registro", como_patron(r.patron)),
+            accion=(lambda registro, f=r.accion: f(registro)) if r.accion else (lambda registro: None),
+            guarda=(lambda registro, g=r.guarda: g(registro)) if r.guarda else None,
+            nombre=r.nombre,
+        )
+        for r in reglas
+    ]
+    buscar = Despachador(casos).buscar
+
+    def despachar(registro: Any) -> Tuple[str, Any]:
+        encontrado = buscar(registro)
+        if encontrado is None:
+            return SIN_COINCIDENCIA, None
+        caso, capturas = encontrado
+        return caso.nombre, caso.accion(**capturas)
+    return despachar
+
+
+# Los mismos casos que procesar() (extra.py, sección 52)
+def _al_menos_dos(xs: list) -> bool:
+    return len(xs) >= 2
+
+
+def _corto(s: str) -> bool:
+    return len(s) < 5
+
+
+REGLAS_PROCESAR: List[Regla] = [
+    Regla("punto", {"type": "point", "x": ..., "y": ...}),
+    Regla("lista", list, guarda=_al_menos_dos),
+    Regla("texto_corto", str, guarda=_corto),
+]
+
+
+# ------------------------------------------------------------
+# Lectura por rangos de bytes
+# ------------------------------------------------------------
+def leer_lineas(ruta: Ruta, inicio: int = 0, fin: Optional[int] = None,
+                usar_mmap: bool = False, buffer: int = 1 << 20) -> Iterator[bytes]:
+    """Líneas (bytes) que EMPIEZAN en [inicio, fin).
+
+    Con esa regla, rangos contiguos leen cada línea exactamente una vez
+    aunque los cortes caigan en mitad de una línea.
+    """
+    with open(ruta, "rb", buffering=buffer) as f:
+        tamano = os.fstat(f.fileno()).st_size
+        fin = tamano if fin is None else min(fin, tamano)
+        if inicio >= fin:
+            return
+        if usar_mmap:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                pos = inicio
+                if inicio > 0:                              # saltar la línea a medias
+                    salto = m.find(b"\n", inicio - 1)
+                    pos = tamano if salto == -1 else salto + 1
+                while pos < fin:
+                    salto = m.find(b"\n", pos)
+                    if salto == -1:
+                        salto = tamano
+                    yield m[pos:salto]
+                    pos = salto + 1
+            return
+        pos = inicio
+        if inicio > 0:
+            f.seek(inicio - 1)
+            pos = inicio - 1 + len(f.readline())
+        if pos >= fin:
+            return
+        for linea in f:
+            yield linea
+            pos += len(linea)
+            if pos >= fin:
+                break
+
+
+def rangos(ruta: Ruta, partes: int) -> List[Tuple[int, int]]:
+    tamano = os.path.getsize(ruta)
+    cortes = [tamano * i // partes for i in range(partes + 1)]
+    return [(a, b) for a, b in zip(cortes, cortes[1:]) if b > a]
+
+
+# ------------------------------------------------------------
+# Pipeline
+# ------------------------------------------------------------
+@dataclass
+class Resumen:
+    lineas: int = 0
+    errores: int = 0                                  # líneas que no son JSON
+    por_regla: Counter = field(default_factory=Counter)
+    resultados: List[Tuple[str, Any]] = field(default_factory=list)
+
+    def __add__(self, otro: "Resumen") -> "Resumen":
+        return Resumen(self.lineas + otro.lineas, self.errores + otro.errores,
+                       self.por_regla + otro.por_regla, self.resultados + otro.resultados)
+
+
+def procesar_rango(ruta: Ruta, reglas: Sequence[Regla], inicio: int = 0, fin: Optional[int] = None,
+                   usar_mmap: bool = False, recoger: bool = False) -> Resumen:
+    """Decodifica y despacha las líneas de un rango (se ejecuta en cada worker)."""
+    despachar = compilar(reglas)
+    resumen = Resumen()
+    contador = resumen.por_regla
+    # Un solo JSONDecoder: json.loads(bytes) detecta la codificación en cada línea
+    decodificar = json.JSONDecoder().decode
+    for linea in leer_lineas(ruta, inicio, fin, usar_mmap):
+        if not linea.strip():
+            continue
+        resumen.lineas += 1
+        try:
+            registro = decodificar(str(linea, "utf-8"))
+        except ValueError:                            # incluye UnicodeDecodeError
+            resumen.errores += 1
+            continue
+        nombre, resultado = despachar(registro)
+        contador[nombre] += 1
+        if recoger:
+            resumen.resultados.append((nombre, resultado))
+    return resumen
+
+
+def procesar_archivo(ruta: Ruta, reglas: Sequence[Regla] = REGLAS_PROCESAR, workers: int = 1,
+                     usar_mmap: bool = False, recoger: bool = False) -> Resumen:
+    """Todo el archivo; con workers > 1, un rango de bytes por tarea en procesos."""
+    if workers <= 1:
+        return procesar_rango(ruta, reglas, usar_mmap=usar_mmap, recoger=recoger)
+    from concurrent.futures import ProcessPoolExecutor
+
+    total = Resumen()
+    with ProcessPoolExecutor(workers) as ex:
+        futuros = [ex.submit(procesar_rango, ruta, reglas, a, b, usar_mmap, recoger)
+                   for a, b in rangos(ruta, workers * 4)]
+        for futuro in futuros:                # en orden: resultados en orden de archivo
+            total = total + futuro.result()
+    return total
+
+
+# ------------------------------------------------------------
+# Demo / benchmark
+# ------------------------------------------------------------
+def generar(ruta: Ruta, n: int) -> Path:
+    """JSONL sintético con los tipos de registro que entiende procesar()."""
+    ejemplos = [
+        {"type": "point", "x": 1, "y": 2},
+        {"type": "click", "boton": "izq", "ts": 1700000000},
+        [10, 20, 30],
+        "Hi",
+        "mensaje largo",
+        {"type": "point", "x": 5},
+    ]
+    with open(ruta, "w", encoding="utf-8") as f:
+        for i in range(n):
+            f.write(json.dumps(ejemplos[i % len(ejemplos)]) + "\n")
+        f.write("{esto no es json\n")
+    return Path(ruta)
+
+
+def benchmark(ruta: Ruta, workers: int) -> None:
+    from extra import procesar
+
+    tamano = os.path.getsize(ruta)
+    print(f"  {ruta}: {tamano / 1e6:.1f} MB")
+
+    t0 = time.perf_counter()
+    esperado: Counter = Counter()
+    with open(ruta, "rb") as f:                      # enfoque ingenuo: procesar() por línea
+        for linea in f:
+            try:
+                esperado[procesar(json.loads(linea))] += 1
+            except ValueError:
+                pass
+    base = time.perf_counter() - t0
+    print(f"  {'bucle + procesar()':<26} {base:8.3f}s")
+
+    for etiqueta, opciones in (
+        ("buffer, 1 proceso", dict(workers=1)),
+        ("mmap, 1 proceso", dict(workers=1, usar_mmap=True)),
+        (f"buffer, {workers} procesos", dict(workers=workers)),
+        (f"mmap, {workers} procesos", dict(workers=workers, usar_mmap=True)),
+    ):
+        t0 = time.perf_counter()
+        resumen = procesar_archivo(ruta, **opciones)
+        t = time.perf_counter() - t0
+        print(f"  {etiqueta:<26} {t:8.3f}s  (×{base / t:.1f})  {dict(resumen.por_regla)}")
+        assert resumen.lineas == sum(esperado.values()) + resumen.errores
+
+    # Mismas decisiones que procesar() registro a registro
+    acciones = [Regla(r.nombre, r.patron, r.guarda, procesar) for r in REGLAS_PROCESAR]
+    resumen = procesar_archivo(ruta, acciones, workers=workers, recoger=True)
+    obtenido = Counter(r for nombre, r in resumen.resultados if nombre != SIN_COINCIDENCIA)
+    obtenido["Sin coincidencia"] += resumen.por_regla[SIN_COINCIDENCIA]
+    assert obtenido == esperado, (obtenido, esperado)
+    print("  ✓ Mismos resultados que procesar()")
+
+
+if __name__ == "__main__":
+    import argparse
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Procesa un JSONL grande con reglas tipo procesar()")
+    parser.add_argument("archivo", nargs="?")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--mmap", action="store_true")
+    parser.add_argument("--generar", type=int, metavar="N", help="genera N registros y ejecuta el benchmark")
+    args = parser.parse_args()
+
+    if args.generar:
+        with tempfile.TemporaryDirectory() as tmp:
+            benchmark(generar(Path(tmp) / "eventos.jsonl", args.generar), args.workers)
+    elif args.archivo:
+        t0 = time.perf_counter()
+        resumen = procesar_archivo(args.archivo, workers=args.workers, usar_mmap=args.mmap)
+        print(f"  {resumen.lineas:,} líneas ({resumen.errores} inválidas) en {time.perf_counter() - t0:.2f}s")
+        for nombre, n in resumen.por_regla.most_common():
+            print(f"    {nombre:<20} {n:>10,}")
+    else:
+        parser.error("indica un archivo o --generar N")
@@ -0,0 +1,294 @@
+# ================================================================
+# ÍNDICE ESPACIAL – tienda más cercana sobre millones de Coord
+# ¿QUÉ?  Un KD-tree sobre los Coord (extra.py, 42) pasados a vectores
+#        unitarios (x, y, z) de la esfera. La cuerda entre dos puntos
+#        crece igual que la distancia haversine, así que podar por caja
+#        en 3D es exacto; las distancias se devuelven en km (haversine).
+#          · carga masiva (mediana por eje, hojas de 32 puntos)
+#          · k vecinos más cercanos (búsqueda best-first)
+#          · puntos dentro de un radio
+#          · inserción incremental (buffer + reconstrucción periódica)
+# ¿PARA QUÉ?  Recorrer todos los Coord por consulta es O(N); con el
+#        árbol cada consulta toca unas pocas hojas.
+#
+# Benchmark:  python indice_espacial.py [--n 1000000] [--consultas 500]
+# ================================================================
+from __future__ import annotations
+
+import math
+from heapq import heappop, heappush, heapreplace
+from typing import Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+RADIO_TIERRA_KM = 6371.0088             # radio medio (IUGG)
+HOJA = 32
+
+Punto = Tuple[float, float]             # Coord o cualquier (lat, lon) en grados
+
+
+def haversine(a: Punto, b: Punto) -> float:
+    """Distancia de círculo máximo en km entre dos (lat, lon)."""
+    lat1, lon1, lat2, lon2 = map(math.radians, (a[0], a[1], b[0], b[1]))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * RADIO_TIERRA_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+def haversine_np(lat: np.ndarray, lon: np.ndarray, punto: Punto) -> np.ndarray:
+    """Distancia en km de cada (lat[i], lon[i]) a `punto` (fuerza bruta vectorizada)."""
+    lat, lon = np.radians(lat), np.radians(lon)
+    lat0, lon0 = math.radians(punto[0]), math.radians(punto[1])
+    h = np.sin((lat - lat0) / 2) ** 2 + np.cos(lat) * math.cos(lat0) * np.sin((lon - lon0) / 2) ** 2
+    return 2 * RADIO_TIERRA_KM * np.arcsin(np.minimum(1.0, np.sqrt(h)))
+
+
+def _a_xyz(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    lat, lon = np.radians(lat), np.radians(lon)
+    cos_lat = np.cos(lat)
+    return np.column_stack((cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)))
+
+
+def _cuerda_a_km(cuerda2: float) -> float:
+    return 2 * RADIO_TIERRA_KM * math.asin(min(1.0, math.sqrt(max(cuerda2, 0.0)) / 2))
+
+
+def _km_a_cuerda2(km: float) -> float:
+    angulo = min(km / RADIO_TIERRA_KM, math.pi)
+    return (2 * math.sin(angulo / 2)) ** 2
+
+
+class IndiceEspacial:
+    """KD-tree de Coord con distancias haversine.
+
+    indice = IndiceEspacial(tiendas)
+    indice.k_cercanos(Coord(40.4, -3.7), k=5)   → [(Coord, km), …] de menor a mayor
+    indice.en_radio(Coord(40.4, -3.7), 10)      → [(Coord, km), …] a ≤ 10 km
+    indice.insertar(Coord(41.4, 2.2))           → visible al instante
+    """
+
+    def __init__(self, coords: Iterable[Punto] = (), hoja: int = HOJA, reconstruir: float = 0.05):
+        self.hoja = hoja
+        self.reconstruir = reconstruir          # fracción de pendientes que fuerza reconstruir
+        self._coords: List[Punto] = []
+        self._pendientes: List[int] = []        # insertados después de la última carga
+        self._xyz_pendientes = np.empty((HOJA, 3))
+        self.cargar(coords)
+
+    # --- construcción -------------------------------------------
+    def cargar(self, coords: Iterable[Punto]) -> None:
+        """Carga masiva: añade `coords` y reconstruye el árbol completo."""
+        self._coords.extend(coords)
+        self._construir()
+
+    def _construir(self) -> None:
+        n = len(self._coords)
+        self._pendientes = []
+        self._inicio: List[int] = []
+        self._fin: List[int] = []
+        self._hijos: List[Tuple[int, int]] = []
+        self._cajas: List[Tuple[Tuple[float, ...], Tuple[float, ...]]] = []
+        if n == 0:
+            self._xyz = np.empty((0, 3))
+            self._ids = np.empty(0, dtype=np.intp)
+            return
+        # fromiter: np.array(lista de tuplas) es ~8× más lento
+        latlon = np.fromiter((v for c in self._coords for v in (c[0], c[1])),
+                             dtype=np.float64, count=2 * n).reshape(n, 2)
+        xyz = _a_xyz(latlon[:, 0], latlon[:, 1])
+        orden = np.arange(n)
+
+        def nodo(a: int, b: int) -> int:
+            # xyz se permuta junto con orden: cada nodo es un tramo contiguo
+            puntos = xyz[a:b]
+            lo, hi = puntos.min(axis=0), puntos.max(axis=0)
+            yo = len(self._inicio)
+            self._inicio.append(a)
+            self._fin.append(b)
+            self._hijos.append((-1, -1))
+            self._cajas.append((tuple(lo.tolist()), tuple(hi.tolist())))
+            if b - a > self.hoja:
+                eje = int(np.argmax(hi - lo))
+                medio = (a + b) // 2
+                parte = np.argpartition(puntos[:, eje], medio - a)
+                orden[a:b] = orden[a:b][parte]
+                xyz[a:b] = puntos[parte]
+                self._hijos[yo] = (nodo(a, medio), nodo(medio, b))
+            return yo
+
+        nodo(0, n)
+        self._xyz = xyz
+        self._ids = orden
+
+    def insertar(self, coord: Punto) -> None:
+        """Queda en un buffer que las consultas recorren por fuerza bruta;
+        al superar `reconstruir` × tamaño del árbol se reconstruye todo."""
+        p = len(self._pendientes)
+        if p == len(self._xyz_pendientes):                  # crecer ×2, como list
+            self._xyz_pendientes = np.resize(self._xyz_pendientes, (2 * p, 3))
+        lat, lon = math.radians(coord[0]), math.radians(coord[1])
+        self._xyz_pendientes[p] = (math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat))
+        self._coords.append(coord)
+        self._pendientes.append(len(self._coords) - 1)
+        if len(self._pendientes) > max(self.hoja, self.reconstruir * len(self._ids)):
+            self._construir()
+
+    def __len__(self) -> int:
+        return len(self._coords)
+
+    # --- consultas ------------------------------------------------
+    @staticmethod
+    def _dist2_caja(caja, q: Tuple[float, float, float]) -> float:
+        lo, hi = caja
+        total = 0.0
+        for l, h, c in zip(lo, hi, q):
+            if c < l:
+                total += (l - c) ** 2
+            elif c > h:
+                total += (c - h) ** 2
+        return total
+
+    def _pendientes_d2(self, q: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        ids = np.array(self._pendientes, dtype=np.intp)
+        diff = self._xyz_pendientes[:len(ids)] - q
+        return ids, np.einsum("ij,ij->i", diff, diff)
+
+    def k_cercanos(self, punto: Punto, k: int = 1) -> List[Tuple[Punto, float]]:
+        if k <= 0 or not self._coords:
+            return []
+        q = _a_xyz(np.array([punto[0]]), np.array([punto[1]]))[0]
+        qt = tuple(q.tolist())
+        mejores: List[Tuple[float, int]] = []          # montículo de máximos: (-d², id)
+
+        def ofrecer(d2: Sequence[float], ids: Sequence[int]) -> None:
+            for d, i in zip(d2, ids):
+                if len(mejores) < k:
+                    heappush(mejores, (-d, i))
+                elif d < -mejores[0][0]:
+                    heapreplace(mejores, (-d, i))
+
+        if self._pendientes:
+            ids, d2 = self._pendientes_d2(q)
+            ofrecer(d2.tolist(), ids.tolist())
+        if self._inicio:
+            frontera = [(0.0, 0)]
+            while frontera:
+                d_caja, n = heappop(frontera)
+                if len(mejores) == k and d_caja >= -mejores[0][0]:
+                    break
+                izq, der = self._hijos[n]
+                if izq < 0:
+                    a, b = self._inicio[n], self._fin[n]
+                    diff = self._xyz[a:b] - q
+                    ofrecer(np.einsum("ij,ij->i", diff, diff).tolist(), self._ids[a:b].tolist())
+                else:
+                    heappush(frontera, (self._dist2_caja(self._cajas[izq], qt), izq))
+                    heappush(frontera, (self._dist2_caja(self._cajas[der], qt), der))
+        return [(self._coords[i], _cuerda_a_km(-d)) for d, i in sorted(mejores, reverse=True)]
+
+    def en_radio(self, punto: Punto, km: float, ordenar: bool = True) -> List[Tuple[Punto, float]]:
+        if km < 0 or not self._coords:
+            return []
+        q = _a_xyz(np.array([punto[0]]), np.array([punto[1]]))[0]
+        qt = tuple(q.tolist())
+        limite = _km_a_cuerda2(km)
+        ids_enc: List[np.ndarray] = []
+        d2_enc: List[np.ndarray] = []
+        if self._pendientes:
+            ids, d2 = self._pendientes_d2(q)
+            dentro = d2 <= limite
+            ids_enc.append(ids[dentro])
+            d2_enc.append(d2[dentro])
+        pila = [0] if self._inicio else []
+        while pila:
+            n = pila.pop()
+            if self._dist2_caja(self._cajas[n], qt) > limite:
+                continue
+            izq, der = self._hijos[n]
+            if izq >= 0:
+                pila += (izq, der)
+                continue
+            a, b = self._inicio[n], self._fin[n]
+            diff = self._xyz[a:b] - q
+            d2 = np.einsum("ij,ij->i", diff, diff)
+            dentro = d2 <= limite
+            ids_enc.append(self._ids[a:b][dentro])
+            d2_enc.append(d2[dentro])
+        if not ids_enc:
+            return []
+        ids = np.concatenate(ids_enc)
+        d2 = np.concatenate(d2_enc)
+        if ordenar:
+            orden = np.argsort(d2, kind="stable")
+            ids, d2 = ids[orden], d2[orden]
+        return [(self._coords[i], _cuerda_a_km(d)) for i, d in zip(ids.tolist(), d2.tolist())]
+
+
+# ------------------------------------------------------------
+# Benchmark frente a fuerza bruta
+# ------------------------------------------------------------
+def benchmark(n: int, consultas: int, k: int, radio: float) -> None:
+    import time
+
+    from extra import Coord
+
+    rng = np.random.default_rng(0)
+    lat = rng.uniform(36.0, 43.8, n)              # península ibérica, aprox.
+    lon = rng.uniform(-9.3, 3.3, n)
+    coords = [Coord(a, b) for a, b in zip(lat.tolist(), lon.tolist())]
+    preguntas = [Coord(a, b) for a, b in zip(rng.uniform(36.0, 43.8, consultas).tolist(),
+                                               rng.uniform(-9.3, 3.3, consultas).tolist())]
+
+    t0 = time.perf_counter()
+    indice = IndiceEspacial(coords)
+    print(f"  {n:,} Coord; carga masiva {time.perf_counter() - t0:.2f}s ({len(indice._inicio):,} nodos)")
+
+    def cronometrar(funcion) -> Tuple[float, list]:
+        t0 = time.perf_counter()
+        resultado = [funcion(p) for p in preguntas]
+        return (time.perf_counter() - t0) / consultas, resultado
+
+    def bruta_k(p):
+        d = haversine_np(lat, lon, p)
+        cerca = np.argpartition(d, k)[:k]
+        return cerca[np.argsort(d[cerca])].tolist()
+
+    def bruta_radio(p):
+        return set(np.flatnonzero(haversine_np(lat, lon, p) <= radio).tolist())
+
+    posicion = {id(c): i for i, c in enumerate(coords)}
+    for etiqueta, bruta, arbol, igual in (
+        (f"{k} más cercanos", bruta_k, lambda p: indice.k_cercanos(p, k),
+         lambda esperado, obtenido: [posicion[id(c)] for c, _ in obtenido] == esperado),
+        (f"radio {radio:g} km", bruta_radio, lambda p: indice.en_radio(p, radio, ordenar=False),
+         lambda esperado, obtenido: {posicion[id(c)] for c, _ in obtenido} == esperado),
+    ):
+        t_bruta, esperados = cronometrar(bruta)
+        t_arbol, obtenidos = cronometrar(arbol)
+        assert all(igual(e, o) for e, o in zip(esperados, obtenidos)), etiqueta
+        print(f"  {etiqueta:<18} fuerza bruta (NumPy) {t_bruta * 1e3:8.2f} ms   KD-tree {t_arbol * 1e3:7.3f} ms"
+              f"   (×{t_bruta / t_arbol:.0f})")
+
+    # Distancias en km coherentes con haversine()
+    c, km = indice.k_cercanos(preguntas[0], 1)[0]
+    assert abs(km - haversine(c, preguntas[0])) < 1e-6
+
+    # Inserción incremental: visible sin esperar a la reconstrucción
+    t0 = time.perf_counter()
+    nuevos = [Coord(40.0 + i * 1e-3, -3.0) for i in range(1000)]
+    for c in nuevos:
+        indice.insertar(c)
+    t_ins = (time.perf_counter() - t0) / len(nuevos)
+    assert indice.k_cercanos(Coord(40.5, -3.0), 1)[0][0] == nuevos[500]
+    print(f"  insertar: {t_ins * 1e6:.1f} µs por Coord ({len(indice._pendientes)} pendientes de reconstruir)")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="KD-tree de Coord frente a fuerza bruta")
+    parser.add_argument("--n", type=int, default=1_000_000)
+    parser.add_argument("--consultas", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--radio", type=float, default=5.0, help="km")
+    args = parser.parse_args()
+    benchmark(args.n, args.consultas, args.k, args.radio)
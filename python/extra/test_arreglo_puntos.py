@@ -0,0 +1,57 @@
+# Pruebas de arreglo_puntos.py
+# Ejecutar:  python -m unittest test_arreglo_puntos   (o pytest)
+import unittest
+
+import numpy as np
+
+from arreglo_puntos import ELEMENTOS, ArregloPuntos
+
+
+def fuerza_bruta(base, consultas):
+    """Vecino más cercano restando coordenadas (sin el truco de la matmul)."""
+    indices, distancias = [], []
+    for q in consultas:
+        d = base.distancias(tuple(q))
+        i = int(np.argmin(d))
+        indices.append(i)
+        distancias.append(float(d[i]))
+    return indices, distancias
+
+
+class TestMasCercano(unittest.TestCase):
+    def comprobar(self, base, consultas):
+        indices, distancias = base.mas_cercano(consultas)
+        esperados, d_esperadas = fuerza_bruta(base, consultas)
+        self.assertEqual(indices.tolist(), esperados)
+        np.testing.assert_allclose(distancias, d_esperadas, rtol=1e-12)
+
+    def test_cerca_del_origen(self):
+        rng = np.random.default_rng(1)
+        self.comprobar(ArregloPuntos(*rng.standard_normal((3, 5_000))),
+                       ArregloPuntos(*rng.standard_normal((3, 50))))
+
+    def test_coordenadas_grandes(self):
+        # Puntos en torno a 1e7: |a|² ~ 1e14 y las diferencias ~1 se perdían
+        rng = np.random.default_rng(2)
+        lejos = np.array([[1e7], [-2e7], [3e7]])
+        base = ArregloPuntos(*(rng.standard_normal((3, 5_000)) + lejos))
+        consultas = ArregloPuntos(*(rng.standard_normal((3, 50)) + lejos))
+        self.comprobar(base, consultas)
+        _, distancias = base.mas_cercano(consultas)
+        self.assertTrue((distancias > 0).all())
+
+    def test_varios_bloques(self):
+        # Más consultas y base de las que caben en un bloque temporal
+        rng = np.random.default_rng(3)
+        n = ELEMENTOS // 64 + 7
+        base = ArregloPuntos(*(rng.standard_normal((3, n)) + 5e6))
+        consultas = ArregloPuntos(*(rng.standard_normal((3, 80)) + 5e6))
+        self.comprobar(base, consultas)
+
+    def test_una_consulta(self):
+        base = ArregloPuntos([0.0, 1e7, 1e7 + 1], [0.0, 0.0, 0.0])
+        self.assertEqual(base.mas_cercano((1e7 + 0.9, 0.0)), (2, base.distancias((1e7 + 0.9, 0.0))[2]))
+
+
+if __name__ == "__main__":
+    unittest.main()
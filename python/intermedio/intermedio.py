@@ -52,25 +52,35 @@ print("\n=== 11. CLASES Y OBJETOS ===")
 # self     : referencia al objeto actual
 # @classmethod : método que recibe la clase, no la instancia
 
+from registro_debil import RegistroDebil
+
 class Mascota:
-    _registro = []                 # variable de clase compartida
+    # variable de clase compartida: referencias débiles (no impide que se
+    # liberen) + índices por especie y nombre (registro_debil.py)
+    _registro = RegistroDebil("especie", "nombre")
 
     def __init__(self, nombre, especie):
         self.nombre = nombre
         self.especie = especie
-        Mascota._registro.append(self)
+        Mascota._registro.registrar(self)
 
     def __str__(self):             # representación legible
         return f"{self.nombre} ({self.especie})"
 
     @classmethod
     def cantidad(cls):
-        return len(cls._registro)  # accede a la var. de clase
+        return len(cls._registro)  # solo las que siguen vivas
+
+    @classmethod
+    def de_especie(cls, especie):
+        return cls._registro.buscar("especie", especie)   # O(1), sin recorrer todas
 
 perro = Mascota("Toby", "perro")
 gato  = Mascota("Michi", "gato")
-print("  Mascotas creadas:", Mascota.cantidad())
+Mascota("Nemo", "pez")             # nadie la guarda → desaparece del registro
+print("  Mascotas vivas:", Mascota.cantidad())
 print("  Lista:", [str(m) for m in Mascota._registro])
+print("  Gatos:", [str(m) for m in Mascota.de_especie("gato")])
 
 # ----------------------------------------------------------
 # 12. HERENCIA Y POLIMORFISMO
@@ -0,0 +1,313 @@
+# ================================================================
+# REGISTRO DÉBIL – instancias vivas con índices por atributo
+# ¿QUÉ?  Un registro de objetos que NO los mantiene vivos (weakref) y
+#        que guarda índices secundarios (p. ej. por `especie` o
+#        `nombre`): valor → claves de los objetos que lo tienen.
+#        Registrar, buscar por atributo y contar son O(1) (o O(k) para
+#        devolver k objetos); al recolectarse un objeto se quita solo.
+# ¿PARA QUÉ?  Mascota._registro (intermedio.py, 11) era una lista: crece
+#        para siempre y cada búsqueda la recorre entera.
+#
+# Benchmark:  python registro_debil.py [--max 1000000]
+# ================================================================
+from __future__ import annotations
+
+import itertools
+import threading
+import weakref
+from collections import deque
+from operator import attrgetter
+from typing import Any, Dict, Generic, Hashable, Iterable, Iterator, List, Optional, Tuple, TypeVar, Union
+
+T = TypeVar("T")
+Cubo = Union[int, Dict[int, None]]        # una sola clave (lo habitual en `nombre`) o varias
+
+
+class _Ref(weakref.ref):
+    """weakref que recuerda su clave y los valores con que se indexó."""
+
+    __slots__ = ("clave", "valores")
+
+
+class RegistroDebil(Generic[T]):
+    """registro = RegistroDebil("especie", "nombre")
+    registro.registrar(obj)               → obj
+    len(registro), list(registro)         → vivos, en orden de registro
+    registro.buscar("especie", "gato")    → [objetos]
+    registro.contar("especie", "gato")    → int, O(1)
+    registro.reindexar(obj)               → tras cambiar un atributo indexado
+
+    Los callbacks de weakref pueden llegar en cualquier hilo y en mitad de
+    cualquier operación: solo encolan la clave; la limpieza real se hace
+    bajo el RLock al principio de cada operación pública.
+    """
+
+    def __init__(self, *atributos: str):
+        self.atributos: Tuple[str, ...] = atributos
+        self._leer = attrgetter(*atributos) if len(atributos) > 1 else (
+            (lambda obj, a=attrgetter(*atributos): (a(obj),)) if atributos else (lambda obj: ()))
+        self._lock = threading.RLock()
+        self._claves = itertools.count()
+        self._vivos: Dict[int, _Ref] = {}                 # clave → ref (orden de registro)
+        self._indices: Dict[str, Dict[Hashable, Cubo]] = {a: {} for a in atributos}
+        self._muertos: deque = deque()                    # claves de objetos recolectados
+        self._pico = 0                                    # máximo de vivos desde la última compactación
+        self._callback = self._al_morir                   # un solo método ligado para todas las refs
+
+    # --- alta / baja ---------------------------------------------
+    def registrar(self, obj: T) -> T:
+        ref = _Ref(obj, self._callback)
+        ref.valores = self._valores(obj)
+        with self._lock:
+            if self._muertos:
+                self._purgar()
+            ref.clave = next(self._claves)
+            vivos = self._vivos
+            vivos[ref.clave] = ref
+            self._indexar(ref)
+            if len(vivos) > self._pico:
+                self._pico = len(vivos)
+        return obj
+
+    def _valores(self, obj: T) -> Tuple[Hashable, ...]:
+        """Lee los atributos indexados y los hashea ANTES de tocar el estado:
+        un valor no hashable no puede dejar un alta a medias."""
+        valores = self._leer(obj)
+        for atributo, valor in zip(self.atributos, valores):
+            try:
+                hash(valor)
+            except TypeError:
+                raise TypeError(f"{atributo}={valor!r} no es hashable: no se puede indexar") from None
+        return valores
+
+    def _al_morir(self, ref: _Ref) -> None:
+        self._muertos.append(ref.clave)                   # deque.append es atómico
+
+    def _indexar(self, ref: _Ref) -> None:
+        clave = ref.clave
+        for indice, valor in zip(self._indices.values(), ref.valores):
+            cubo = indice.get(valor)
+            if cubo is None:
+                indice[valor] = clave
+            elif type(cubo) is int:
+                indice[valor] = {cubo: None, clave: None}
+            else:
+                cubo[clave] = None
+
+    def _quitar(self, ref: _Ref) -> None:
+        if self._vivos.pop(ref.clave, None) is not None:
+            self._desindexar(ref)
+
+    def _desindexar(self, ref: _Ref) -> None:
+        for indice, valor in zip(self._indices.values(), ref.valores):
+            cubo = indice[valor]
+            if type(cubo) is int:
+                del indice[valor]
+            else:
+                del cubo[ref.clave]
+                if len(cubo) == 1:
+                    indice[valor] = next(iter(cubo))
+
+    def _purgar(self) -> None:
+        muertos = self._muertos
+        if not muertos:
+            return
+        while muertos:
+            ref = self._vivos.get(muertos.popleft())
+            if ref is not None:
+                self._quitar(ref)
+        # los dict no encogen al borrar: copiarlos tras una baja masiva
+        if len(self._vivos) < self._pico // 4:
+            self._vivos = dict(self._vivos)
+            self._indices = {a: dict(indice) for a, indice in self._indices.items()}
+            self._pico = len(self._vivos)
+
+    def _ref_de(self, obj: T) -> Optional[_Ref]:
+        for ref in weakref.getweakrefs(obj):              # casi siempre solo la nuestra
+            if type(ref) is _Ref and self._vivos.get(ref.clave) is ref:
+                return ref
+        return None
+
+    def _claves_de(self, atributo: str, valor: Hashable) -> Iterable[int]:
+        cubo = self._indices[atributo].get(valor)
+        if cubo is None:
+            return ()
+        return (cubo,) if type(cubo) is int else cubo      # el dict ya va en orden de alta
+
+    def olvidar(self, obj: T) -> None:
+        with self._lock:
+            self._purgar()
+            ref = self._ref_de(obj)
+            if ref is not None:
+                self._quitar(ref)
+
+    def reindexar(self, obj: T) -> None:
+        """Vuelve a leer los atributos indexados de `obj` (si cambiaron)."""
+        with self._lock:
+            self._purgar()
+            ref = self._ref_de(obj)
+            if ref is None:
+                raise KeyError(f"{obj!r} no está registrado")
+            valores = self._valores(obj)
+            self._desindexar(ref)
+            ref.valores = valores
+            self._indexar(ref)
+
+    def limpiar(self) -> None:
+        with self._lock:
+            self._vivos.clear()
+            self._muertos.clear()
+            self._pico = 0
+            for indice in self._indices.values():
+                indice.clear()
+
+    # --- consultas ----------------------------------------------
+    def __len__(self) -> int:
+        with self._lock:
+            self._purgar()
+            return len(self._vivos)
+
+    def __iter__(self) -> Iterator[T]:
+        with self._lock:
+            self._purgar()
+            refs = list(self._vivos.values())             # instantánea: iterar sin el lock
+        return (obj for obj in (r() for r in refs) if obj is not None)
+
+    def __contains__(self, obj: Any) -> bool:
+        with self._lock:
+            return self._ref_de(obj) is not None
+
+    def buscar(self, atributo: str, valor: Hashable) -> List[T]:
+        with self._lock:
+            self._purgar()
+            refs = [self._vivos[c] for c in self._claves_de(atributo, valor)]
+        return [obj for obj in (r() for r in refs) if obj is not None]
+
+    def uno(self, atributo: str, valor: Hashable) -> Optional[T]:
+        """El primero registrado con ese valor, o None."""
+        with self._lock:
+            self._purgar()
+            for clave in self._claves_de(atributo, valor):
+                obj = self._vivos[clave]()
+                if obj is not None:
+                    return obj
+        return None
+
+    def contar(self, atributo: str, valor: Hashable) -> int:
+        with self._lock:
+            self._purgar()
+            cubo = self._indices[atributo].get(valor)
+            return 0 if cubo is None else 1 if type(cubo) is int else len(cubo)
+
+    def conteo(self, atributo: str) -> Dict[Hashable, int]:
+        """valor → nº de vivos, para todo el índice."""
+        with self._lock:
+            self._purgar()
+            return {valor: 1 if type(cubo) is int else len(cubo)
+                    for valor, cubo in self._indices[atributo].items()}
+
+    def __repr__(self) -> str:
+        return f"RegistroDebil({len(self)} vivos, índices={list(self.atributos)})"
+
+
+# ------------------------------------------------------------
+# Benchmark: lista fuerte frente a registro débil indexado
+# ------------------------------------------------------------
+def benchmark(maximo: int) -> None:
+    import gc
+    import time
+    import tracemalloc
+
+    especies = ["perro", "gato", "loro", "pez", "hámster"]
+
+    class ConLista:                       # como la Mascota original
+        _registro: List[Any] = []
+
+        def __init__(self, nombre, especie):
+            self.nombre, self.especie = nombre, especie
+            ConLista._registro.append(self)
+
+    class ConRegistro:
+        _registro: RegistroDebil = RegistroDebil("especie", "nombre")
+
+        def __init__(self, nombre, especie):
+            self.nombre, self.especie = nombre, especie
+            ConRegistro._registro.registrar(self)
+
+    def medir(funcion, repeticiones: int = 1) -> float:
+        t0 = time.perf_counter()
+        for _ in range(repeticiones):
+            funcion()
+        return (time.perf_counter() - t0) / repeticiones
+
+    print(f"  {'N':>9} {'registro':<10} {'crear':>8} {'MB vivos':>9} {'MB tras del':>12}"
+          f" {'buscar nombre':>14} {'contar especie':>15}")
+    n = 10_000
+    while n <= maximo:
+        for clase, buscar, contar in (
+            (ConLista,
+             lambda: [m for m in ConLista._registro if m.nombre == "m777"],
+             lambda: sum(1 for m in ConLista._registro if m.especie == "gato")),
+            (ConRegistro,
+             lambda: ConRegistro._registro.buscar("nombre", "m777"),
+             lambda: ConRegistro._registro.contar("especie", "gato")),
+        ):
+            registro = clase._registro
+            registro.clear() if isinstance(registro, list) else registro.limpiar()
+            gc.collect()
+            tracemalloc.start()
+            base = tracemalloc.get_traced_memory()[0]
+            t0 = time.perf_counter()
+            vivas = [clase(f"m{i}", especies[i % len(especies)]) for i in range(n)]
+            t_crear = time.perf_counter() - t0
+            mb_vivos = (tracemalloc.get_traced_memory()[0] - base) / 1e6
+            repeticiones = max(1, 100_000 // n)
+            t_buscar = medir(buscar, repeticiones)
+            t_contar = medir(contar, repeticiones)
+            assert len(buscar()) == 1 and contar() == len(range(1, n, len(especies)))
+            del vivas
+            gc.collect()
+            len(registro)                             # el registro débil purga aquí
+            mb_tras = (tracemalloc.get_traced_memory()[0] - base) / 1e6
+            tracemalloc.stop()
+            print(f"  {n:>9,} {clase.__name__:<10} {t_crear:7.3f}s {mb_vivos:9.1f} {mb_tras:12.1f}"
+                  f" {t_buscar * 1e6:12.1f}µs {t_contar * 1e6:13.1f}µs")
+        assert len(ConRegistro._registro) == 0 and len(ConLista._registro) == n
+        n *= 10
+
+    # Registro concurrente: 16 hilos creando a la vez, sin perder ninguno
+    ConRegistro._registro.limpiar()
+    guardadas: List[Any] = []
+
+    def trabajador(h: int) -> None:
+        guardadas.extend(ConRegistro(f"h{h}-{i}", especies[i % 5]) for i in range(5_000))
+
+    hilos = [threading.Thread(target=trabajador, args=(h,)) for h in range(16)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert len(ConRegistro._registro) == 16 * 5_000
+    assert sum(ConRegistro._registro.conteo("especie").values()) == 16 * 5_000
+    del guardadas[::2]
+    assert len(ConRegistro._registro) == 8 * 5_000
+    print("  ✓ 16 hilos × 5000 altas; las bajas por GC actualizan los índices")
+
+    # Un atributo indexado no hashable se rechaza sin dejar el alta a medias
+    vivas = len(ConRegistro._registro)
+    try:
+        ConRegistro(["no", "hashable"], "gato")
+        raise AssertionError("un nombre no hashable debería fallar")
+    except TypeError:
+        pass
+    assert len(ConRegistro._registro) == vivas
+    assert ConRegistro._registro.contar("especie", "gato") == ConRegistro._registro.conteo("especie")["gato"]
+    print("  ✓ valor no hashable: TypeError y el registro sigue consistente")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Registro débil indexado frente a lista")
+    parser.add_argument("--max", type=int, default=1_000_000, help="N máximo (potencias de 10 desde 10⁴)")
+    benchmark(parser.parse_args().max)
@@ -0,0 +1,76 @@
+# ================================================================
+# PRESUPUESTO DE IMPORTACIÓN – arranque rápido y sin efectos
+# ¿QUÉ?  Importa cada módulo en un intérprete limpio con -X importtime,
+#        toma el tiempo acumulado del módulo (mínimo de varias rondas)
+#        y lo compara con su presupuesto. Además exige que importar
+#        no imprima nada (las demos solo corren desde main()).
+# ¿PARA QUÉ?  Que nadie vuelva a meter asyncio/multiprocessing/... a
+#        nivel de módulo o una demo fuera de su función sin enterarse.
+#
+# Uso:  python presupuesto_importacion.py [--rondas 5] [--detalle 8]
+# Código de salida 1 si algún módulo se pasa o tiene efectos al importar.
+# ================================================================
+from __future__ import annotations
+
+import argparse
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+RAIZ = Path(__file__).resolve().parent
+
+# módulo → (directorio, presupuesto en ms). Medido con holgura ~1.5×.
+PRESUPUESTOS: Dict[str, Tuple[Path, float]] = {
+    "avanzado": (RAIZ / "avanzado", 40.0),
+    "extra": (RAIZ / "extra", 35.0),
+}
+
+_LINEA = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+
+def medir(modulo: str, directorio: Path) -> Tuple[float, List[Tuple[float, str]], str]:
+    """(ms acumulados del módulo, [(ms propios, dependencia)], stdout de la importación)."""
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+        cwd=directorio, capture_output=True, text=True, check=True,
+    )
+    total = 0.0
+    propios: List[Tuple[float, str]] = []
+    for linea in proceso.stderr.splitlines():
+        m = _LINEA.match(linea)
+        if not m:
+            continue
+        propio, acumulado, sangria, nombre = m.groups()
+        if nombre == modulo and not sangria:
+            total = int(acumulado) / 1000
+        propios.append((int(propio) / 1000, nombre))
+    # Lo que ya importó `site` también sale en el informe: nos quedamos con
+    # lo que cuelga de este módulo (las líneas tras la última de `site`).
+    ultimo_site = max((i for i, (_, n) in enumerate(propios) if n == "site"), default=-1)
+    return total, sorted(propios[ultimo_site + 1:], reverse=True), proceso.stdout
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Comprueba el tiempo de importación de los módulos")
+    parser.add_argument("--rondas", type=int, default=5, help="se toma el mínimo de N arranques")
+    parser.add_argument("--detalle", type=int, default=5, help="importaciones más caras a mostrar")
+    args = parser.parse_args(argv)
+
+    fallos = 0
+    for modulo, (directorio, presupuesto) in PRESUPUESTOS.items():
+        rondas = [medir(modulo, directorio) for _ in range(args.rondas)]
+        total, propios, salida = min(rondas, key=lambda r: r[0])
+        ok = total <= presupuesto and not salida
+        fallos += not ok
+        print(f"  {'✓' if ok else '✗'} {modulo:<10} {total:7.1f} ms  (presupuesto {presupuesto:.0f} ms)")
+        if salida:
+            print(f"    ✗ importar imprime {len(salida.splitlines())} líneas: tiene efectos secundarios")
+        for ms, nombre in propios[: args.detalle]:
+            print(f"      {ms:6.1f} ms  {nombre}")
+    return 1 if fallos else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())